@@ -0,0 +1,9 @@
+"""
+Offline micro-benchmarks for the bot's hot pure-Python paths.
+
+Run them from the project root with `python -m benchmarks`. No connection to Discord or the site
+is needed, messages and members are faked by `benchmarks.fakes`.
+
+The first run with `--save` stores the results as a baseline, and later runs compare against it
+and flag every benchmark that got slower than the tolerance allows. See `python -m benchmarks --help`.
+"""
@@ -0,0 +1,99 @@
+import argparse
+import importlib
+import logging
+import os
+import sys
+
+from benchmarks import runner
+
+# Importing the bot's modules loads the config, which insists on a token. It's never used here.
+os.environ.setdefault("BOT_TOKEN", "benchmarks")
+
+BENCHMARK_MODULES = (
+    "benchmarks.bench_rules",
+    "benchmarks.bench_filtering",
+    "benchmarks.bench_tokens",
+    "benchmarks.bench_codeblocks",
+    "benchmarks.bench_pagination",
+    "benchmarks.bench_time",
+    "benchmarks.bench_perlin",
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Runs the micro-benchmarks, and compares the results with a saved baseline."
+    )
+    parser.add_argument(
+        "-k", dest="keyword", default="",
+        help="only run the benchmarks with this in their name"
+    )
+    parser.add_argument(
+        "--save", action="store_true",
+        help="save the results as the new baseline"
+    )
+    parser.add_argument(
+        "--baseline", default=runner.BASELINE_PATH,
+        help="the baseline file to compare with, and to save to (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=runner.DEFAULT_TOLERANCE,
+        help="how much slower than the baseline a benchmark may get, as a fraction (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=runner.DEFAULT_REPEAT,
+        help="the number of timed repetitions per benchmark (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--list", action="store_true",
+        help="list the benchmarks without running them"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+
+    # Measure the code the way it runs in production, without the trace logging of debug mode
+    logging.getLogger().setLevel(logging.WARNING)
+
+    selected = [bench for bench in runner.BENCHMARKS.values() if args.keyword in bench.name]
+
+    if args.list:
+        print("\n".join(bench.name for bench in selected))
+        return 0
+
+    baseline = runner.load_baseline(args.baseline)
+
+    print(f"{'benchmark':<56} {'time':>10} {'baseline':>10} {'change':>8}")
+    results = runner.run(
+        selected, baseline, args.repeat,
+        report=lambda result: print(runner.format_result(result, args.tolerance), flush=True)
+    )
+
+    regressions = [result for result in results if result.ratio and result.ratio > 1 + args.tolerance]
+
+    if args.save:
+        # Keep the baselines of the benchmarks that weren't selected this time
+        baseline.update((result.name, result.seconds) for result in results)
+        runner.save_baseline(args.baseline, baseline)
+        print(f"\nSaved {len(results)} results to {args.baseline}.")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks regressed by more than {args.tolerance:.0%}:")
+
+        for result in regressions:
+            print(f"  {result.name}: {runner.format_time(result.baseline)} -> {runner.format_time(result.seconds)}")
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
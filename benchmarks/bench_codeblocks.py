@@ -0,0 +1,61 @@
+from benchmarks.runner import benchmark
+
+from bot.cogs.bot import Bot
+
+FUNCTION = (
+    "def fibonacci(n):\n"
+    "    a, b = 0, 1\n"
+    "    for _ in range(n):\n"
+    "        a, b = b, a + b\n"
+    "    return a\n"
+)
+
+# An unformatted message with a couple of hundred lines of over-indented code, like a pasted class
+LARGE_CODE = "python\n" + "".join(
+    "    " + line + "\n"
+    for _ in range(40)
+    for line in FUNCTION.splitlines()
+)
+
+SMALL_CODE = "```\nimport os\n\nfor name in os.listdir('.'):\n    print(name)\n```"
+BAD_TICKS_CODE = "'''py\nimport os\n\nfor name in os.listdir('.'):\n    print(name)\n'''"
+
+REPL_SESSION = "\n".join(
+    f">>> x = {i}\n>>> for i in range(x):\n...     print(i)\n...\n0"
+    for i in range(50)
+)
+
+
+def _cog() -> Bot:
+    return Bot(None)
+
+
+@benchmark("codeblocks.codeblock_stripping[small]")
+def codeblock_stripping_small():
+    cog = _cog()
+    return lambda: cog.codeblock_stripping(SMALL_CODE, False)
+
+
+@benchmark("codeblocks.codeblock_stripping[bad ticks]")
+def codeblock_stripping_bad_ticks():
+    cog = _cog()
+    return lambda: cog.codeblock_stripping(BAD_TICKS_CODE, True)
+
+
+@benchmark("codeblocks.codeblock_stripping[200 lines]")
+def codeblock_stripping_large():
+    cog = _cog()
+    return lambda: cog.codeblock_stripping(LARGE_CODE, False)
+
+
+@benchmark("codeblocks.fix_indentation[200 lines]")
+def fix_indentation():
+    cog = _cog()
+    code = LARGE_CODE[len("python\n"):]
+    return lambda: cog.fix_indentation(code)
+
+
+@benchmark("codeblocks.repl_stripping[250 lines]")
+def repl_stripping():
+    cog = _cog()
+    return lambda: cog.repl_stripping(REPL_SESSION)
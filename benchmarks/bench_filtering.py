@@ -0,0 +1,64 @@
+from benchmarks.fakes import message_stream
+from benchmarks.runner import benchmark, register, run_coroutine
+
+from bot.cogs.filtering import Filtering
+from bot.constants import get_config
+
+# Messages the watchlists and filters should trigger on, mixed into the ordinary chatter
+TRIGGERING_CONTENT = (
+    "you're such a fag lol",
+    "check out https://www.liveleak.com/view?t=abc123",
+    "z̵̢a̴l̸g̷o̶ ̵t̴e̸x̷t̶",
+    "I'm just retarded, don't mind me",
+    "sorry for all the retarded questions",
+    "stop being such a tard",
+)
+
+CHECKS = ("_has_watchlist_words", "_has_watchlist_tokens", "_has_urls", "_has_zalgo", "_has_invites")
+
+
+def _corpus():
+    corpus = [message.content for message in message_stream(200)]
+
+    # One in every 20 messages is one the filters care about
+    for i, content in enumerate(TRIGGERING_CONTENT):
+        corpus[i * 20] = content
+
+    return corpus
+
+
+def _setup(check_name: str):
+    def setup():
+        # No invites in the corpus means `_has_invites` never reaches its API call, so no bot is needed
+        check = getattr(Filtering(None), check_name)
+        corpus = _corpus()
+
+        def run():
+            for text in corpus:
+                run_coroutine(check(text))
+
+        return run
+
+    return setup
+
+
+for name in CHECKS:
+    register(f"filtering.{name.lstrip('_')}[200 messages]", _setup(name))
+
+
+@benchmark("filtering.enabled_filters[200 messages]")
+def enabled_filters():
+    filters = [
+        _filter["function"] for name, _filter in Filtering(None).filters.items()
+        if name in get_config().filter.enabled
+    ]
+    corpus = _corpus()
+
+    def run():
+        # The same order, and early exit, as `Filtering._filter_message`
+        for text in corpus:
+            for function in filters:
+                if run_coroutine(function(text)):
+                    break
+
+    return run
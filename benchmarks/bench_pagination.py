@@ -0,0 +1,30 @@
+from benchmarks.fakes import message_stream
+from benchmarks.runner import register
+
+from bot.pagination import LinePaginator
+
+LINE_COUNTS = (1_000, 10_000)
+
+
+def _setup(count: int, max_lines: int):
+    def setup():
+        contents = [message.content.replace("\n", " ")[:100] for message in message_stream(200)]
+        lines = [contents[i % len(contents)] for i in range(count)]
+
+        def run():
+            paginator = LinePaginator(prefix="", suffix="", max_size=500, max_lines=max_lines)
+
+            for line in lines:
+                paginator.add_line(line)
+
+            paginator.close_page()
+            return paginator
+
+        return run
+
+    return setup
+
+
+for lines in LINE_COUNTS:
+    register(f"pagination.add_line[{lines} lines]", _setup(lines, None))
+    register(f"pagination.add_line[{lines} lines, max_lines=15]", _setup(lines, 15))
@@ -0,0 +1,45 @@
+import random
+
+from benchmarks.runner import register
+
+from bot.utils.snakes import perlin
+
+# Every benchmark samples the noise at this many points
+POINT_COUNT = 1000
+
+
+def _points(dimension: int):
+    rng = random.Random(0)
+    return [tuple(rng.uniform(0, 10) for _ in range(dimension)) for _ in range(POINT_COUNT)]
+
+
+def _pointwise(factory_class, dimension: int, octaves: int):
+    def setup():
+        factory = factory_class(dimension, octaves=octaves)
+        points = _points(dimension)
+
+        def run():
+            for point in points:
+                factory(*point)
+
+        return run
+
+    return setup
+
+
+def _batch(factory_class, dimension: int):
+    def setup():
+        factory = factory_class(dimension)
+        points = _points(dimension)
+        return lambda: factory.plain_noise_batch(points)
+
+    return setup
+
+
+for dimension, octaves in ((1, 1), (2, 1), (2, 4), (3, 1)):
+    register(
+        f"perlin.PerlinNoiseFactory[{dimension}d, {octaves} octaves]",
+        _pointwise(perlin.PerlinNoiseFactory, dimension, octaves)
+    )
+
+register("perlin.PerlinNoiseFactory.plain_noise_batch[2d]", _batch(perlin.PerlinNoiseFactory, 2))
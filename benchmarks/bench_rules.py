@@ -0,0 +1,27 @@
+from benchmarks.fakes import message_stream
+from benchmarks.runner import register, run_coroutine
+
+from bot import rules
+from bot.constants import get_config
+
+# The number of recent messages handed to the rules, from a quiet channel to a raid
+WINDOW_SIZES = (10, 100, 1000)
+
+RULES = dict(get_config().anti_spam.rules)
+
+
+def _setup(rule_name: str, window: int):
+    def setup():
+        apply = getattr(rules, f"apply_{rule_name}")
+        config = RULES[rule_name]
+        messages = message_stream(window, authors=max(window // 10, 2))
+        last_message = messages[-1]
+
+        return lambda: run_coroutine(apply(last_message, messages, config))
+
+    return setup
+
+
+for name in RULES:
+    for size in WINDOW_SIZES:
+        register(f"rules.{name}[{size}]", _setup(name, size))
@@ -0,0 +1,40 @@
+import random
+
+from benchmarks.runner import benchmark
+from dateutil.relativedelta import relativedelta
+
+from bot.utils.time import humanize_delta
+
+
+def _deltas():
+    rng = random.Random(0)
+
+    return [
+        relativedelta(
+            years=rng.choice((0, 0, 1)), months=rng.randint(0, 11), days=rng.randint(0, 30),
+            hours=rng.randint(0, 23), minutes=rng.randint(0, 59), seconds=rng.randint(0, 59)
+        )
+        for _ in range(100)
+    ]
+
+
+@benchmark("time.humanize_delta[100 deltas]")
+def humanize_delta_full():
+    deltas = _deltas()
+
+    def run():
+        for delta in deltas:
+            humanize_delta(delta)
+
+    return run
+
+
+@benchmark("time.humanize_delta[100 deltas, max_units=2]")
+def humanize_delta_short():
+    deltas = _deltas()
+
+    def run():
+        for delta in deltas:
+            humanize_delta(delta, max_units=2)
+
+    return run
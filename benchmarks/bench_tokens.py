@@ -0,0 +1,51 @@
+import base64
+import struct
+
+from benchmarks.fakes import message_stream
+from benchmarks.runner import benchmark
+
+from bot.cogs.token_remover import TOKEN_RE, TokenRemover
+
+USER_ID = base64.b64encode(b"467781294224883712").decode().rstrip("=")
+TIMESTAMP = base64.urlsafe_b64encode(struct.pack("i", 12_345_678)).decode().rstrip("=")
+HMAC = "Jgm8RmU3v_8VCkM5lt8Yp4lpRzw"
+TOKEN = f"{USER_ID}.{TIMESTAMP}.{HMAC}"
+
+
+def _corpus():
+    corpus = [message.content for message in message_stream(200)]
+
+    # A few messages with pasted code, only some of which contain a token
+    for i in range(0, 200, 25):
+        corpus[i] = f'bot.run("{TOKEN}")'
+        corpus[i + 1] = 'print("some.dotted.string")'
+
+    return corpus
+
+
+@benchmark("tokens.token_re_search[200 messages]")
+def token_re_search():
+    corpus = _corpus()
+
+    def run():
+        for text in corpus:
+            TOKEN_RE.search(text)
+
+    return run
+
+
+@benchmark("tokens.validate_token")
+def validate_token():
+    def run():
+        user_id, creation_timestamp, _ = TOKEN.split(".")
+        return TokenRemover.is_valid_user_id(user_id) and TokenRemover.is_valid_timestamp(creation_timestamp)
+
+    return run
+
+
+@benchmark("tokens.validate_non_token")
+def validate_non_token():
+    def run():
+        return TokenRemover.is_valid_user_id("some") and TokenRemover.is_valid_timestamp("dotted")
+
+    return run
@@ -0,0 +1,152 @@
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+# Words used to build the content of fake messages, with a few things the filters and rules look for
+WORDS = (
+    "python", "import", "def", "class", "return", "async", "await", "list", "dict", "the", "a", "is",
+    "how", "do", "I", "help", "error", "traceback", "pip", "install", "works", "thanks", "why", "not",
+    "lambda", "yield", "generator", "decorator", "asyncio", "discord.py", "bot", "cog", "snake", ":)",
+)
+LINKS = (
+    "https://docs.python.org/3/library/asyncio.html",
+    "https://pythondiscord.com/pages/resources/",
+    "https://github.com/python-discord/bot",
+)
+EMOJIS = ("<:ducky:475397584935354368>", "<a:partyducky:475397585095917568>")
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str = "role"):
+        self.id = role_id
+        self.name = name
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, name: str = "channel"):
+        self.id = channel_id
+        self.name = name
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+
+class FakeMember:
+    """
+    Stands in for a `discord.Member`, with the attributes the cogs and rules read.
+    """
+
+    def __init__(self, member_id: int, name: str = "member", roles: List[FakeRole] = (), bot: bool = False):
+        self.id = member_id
+        self.name = name
+        self.discriminator = f"{member_id % 10000:04}"
+        self.display_name = name
+        self.roles = list(roles)
+        self.bot = bot
+
+    def __str__(self):
+        return f"{self.name}#{self.discriminator}"
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+class FakeAttachment:
+    def __init__(self, filename: str = "image.png", size: int = 1024):
+        self.filename = filename
+        self.size = size
+
+
+class FakeMessage:
+    """
+    Stands in for a `discord.Message`, with the attributes the cogs and rules read.
+    """
+
+    def __init__(
+            self, message_id: int, author: FakeMember, content: str, channel: FakeChannel,
+            created_at: Optional[datetime] = None, mentions: List[FakeMember] = (),
+            role_mentions: List[FakeRole] = (), attachments: List[FakeAttachment] = ()
+    ):
+        self.id = message_id
+        self.author = author
+        self.content = content
+        self.channel = channel
+        self.created_at = created_at or datetime.utcnow()
+        self.mentions = list(mentions)
+        self.role_mentions = list(role_mentions)
+        self.attachments = list(attachments)
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discordapp.com/channels/267624335836053506/{self.channel.id}/{self.id}"
+
+
+def random_content(rng: random.Random, words: int) -> str:
+    """
+    Builds a chatty sentence, now and then with a link, an emoji or a line break in it.
+    """
+
+    parts = []
+
+    for _ in range(words):
+        roll = rng.random()
+
+        if roll < 0.02:
+            parts.append(rng.choice(LINKS))
+        elif roll < 0.04:
+            parts.append(rng.choice(EMOJIS))
+        elif roll < 0.07:
+            parts.append("\n")
+        else:
+            parts.append(rng.choice(WORDS))
+
+    return " ".join(parts)
+
+
+def message_stream(
+        count: int, *, authors: int = 20, seed: int = 0, channel: FakeChannel = None,
+        interval: float = 0.5
+) -> List[FakeMessage]:
+    """
+    Generates a list of messages from a handful of members, as they would be seen in a busy channel.
+
+    The output only depends on the arguments, so benchmark runs can be compared with each other.
+
+    :param count: the number of messages to generate
+    :param authors: the number of distinct members sending them
+    :param seed: the seed for the random content
+    :param channel: the channel the messages are sent in
+    :param interval: the number of seconds between two messages
+    """
+
+    rng = random.Random(seed)
+    channel = channel or FakeChannel(267659945086812160, "python-general")
+    members = [FakeMember(100_000_000_000_000_000 + i, f"member{i}") for i in range(authors)]
+    roles = [FakeRole(200_000_000_000_000_000 + i, f"role{i}") for i in range(5)]
+    start = datetime.utcnow() - timedelta(seconds=count * interval)
+
+    messages = []
+
+    for i in range(count):
+        mentions = rng.sample(members, 2) if rng.random() < 0.05 else []
+        role_mentions = [rng.choice(roles)] if rng.random() < 0.01 else []
+        attachments = [FakeAttachment()] if rng.random() < 0.03 else []
+
+        messages.append(FakeMessage(
+            message_id=300_000_000_000_000_000 + i,
+            author=rng.choice(members),
+            content=random_content(rng, rng.randint(3, 40)),
+            channel=channel,
+            created_at=start + timedelta(seconds=i * interval),
+            mentions=mentions,
+            role_mentions=role_mentions,
+            attachments=attachments
+        ))
+
+    return messages
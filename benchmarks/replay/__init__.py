@@ -0,0 +1,11 @@
+"""
+Replays a stream of gateway events through the real cogs, for load testing without a live guild.
+
+Events are fed to discord.py's own gateway parsers, so the cogs see the same models and events
+they would in production. Requests to the Discord API and the site are answered by fakes, with
+a configurable latency. Run it with `python -m benchmarks.replay`, see `--help` for the options.
+
+A stream is either generated by `benchmarks.replay.traffic`, or loaded from a JSON lines file of
+gateway dispatches, one `{"t": seconds, "op": "MESSAGE_CREATE", "d": {...}}` object per line.
+`traffic.GatewayRecorder` writes such files from a running bot.
+"""
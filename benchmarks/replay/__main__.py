@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tracemalloc
+
+# Importing the bot's modules loads the config, which insists on a token. It's never used here.
+os.environ.setdefault("BOT_TOKEN", "replay")
+
+# Outside of debug mode, so the cogs take the same paths as they do in production
+os.environ.setdefault("SITE_URL", "pythondiscord.com")
+
+from benchmarks.replay import harness, traffic  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay",
+        description="Replays gateway events through the cogs, with fake Discord and site APIs."
+    )
+    parser.add_argument(
+        "--stream",
+        help="a JSON lines file of events to replay, instead of generating them"
+    )
+    parser.add_argument(
+        "--save-stream",
+        help="save the generated events to this file, to replay them again later"
+    )
+    parser.add_argument(
+        "--events", type=int, default=5000,
+        help="the number of events to generate (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--rate", type=float,
+        help="events per second, 0 for as fast as possible. Generated streams default to 50, "
+             "recorded streams to their own timing."
+    )
+    parser.add_argument(
+        "--members", type=int, default=1000,
+        help="the number of members the guild starts with (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--raid", type=float, default=0.0,
+        help="the fraction of generated events which are part of a raid (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="the seed of the generated events (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--extensions", default=",".join(harness.DEFAULT_EXTENSIONS),
+        help="a comma separated list of the extensions to load (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--discord-latency", type=float, default=0.05,
+        help="the seconds every Discord API request takes (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--site-latency", type=float, default=0.02,
+        help="the seconds every site request takes (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="trace allocations, to show where memory grew. This slows everything down considerably."
+    )
+    return parser.parse_args()
+
+
+async def replay(args, replay_harness: harness.ReplayHarness) -> harness.ReplayReport:
+    if args.stream:
+        events = traffic.load_stream(args.stream)
+        members = []
+        rate = args.rate
+    else:
+        rate = 50 if args.rate is None else args.rate
+        generator = traffic.SyntheticTraffic(args.members, raid=args.raid, seed=args.seed)
+        events = generator.generate(args.events, rate)
+        members = generator.initial_members
+
+        if args.save_stream:
+            traffic.save_stream(args.save_stream, events)
+
+    await replay_harness.setup(members)
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    return await replay_harness.replay(events, rate)
+
+
+def main() -> int:
+    args = parse_args()
+
+    # Only warnings, like handlers failing, are interesting here
+    logging.getLogger().setLevel(logging.WARNING)
+
+    replay_harness = harness.ReplayHarness(
+        [extension.strip() for extension in args.extensions.split(",") if extension.strip()],
+        discord_latency=args.discord_latency,
+        site_latency=args.site_latency
+    )
+
+    try:
+        report = replay_harness.loop.run_until_complete(replay(args, replay_harness))
+    finally:
+        replay_harness.close()
+
+    print(report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    sys.exit(main())
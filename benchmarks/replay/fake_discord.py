@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bot.constants import Channels, Guild as GuildConfig, Roles
+
+DISCORD_EPOCH = 1_420_070_400_000
+
+BOT_USER = {
+    "id": "414020331980980224",
+    "username": "Python",
+    "discriminator": "0001",
+    "avatar": None,
+    "bot": True,
+    "verified": True,
+    "mfa_enabled": False,
+    "email": None
+}
+
+# Gives every snowflake generated within the same millisecond a different ID
+_increment = itertools.count()
+
+
+def snowflake(at: Optional[float] = None) -> str:
+    """
+    Generates a Discord ID for the given UNIX timestamp, or now.
+
+    The cogs work out when a message was sent from its ID, so IDs have to be generated when an event
+    is replayed, not when it was recorded.
+    """
+
+    millis = int((time.time() if at is None else at) * 1000)
+    return str(((millis - DISCORD_EPOCH) << 22) | (next(_increment) & 0xFFF))
+
+
+def timestamp() -> str:
+    return datetime.utcnow().isoformat() + "+00:00"
+
+
+def user_payload(user_id: int, name: str, bot: bool = False) -> Dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": name,
+        "discriminator": f"{user_id % 10000:04}",
+        "avatar": None,
+        "bot": bot
+    }
+
+
+def member_payload(user: Dict[str, Any], role_ids: List[int], nick: str = None) -> Dict[str, Any]:
+    return {
+        "user": user,
+        "roles": [str(role_id) for role_id in role_ids],
+        "joined_at": timestamp(),
+        "nick": nick,
+        "deaf": False,
+        "mute": False
+    }
+
+
+def message_payload(
+        message_id: str, channel_id: int, author: Dict[str, Any], content: str, *,
+        mentions: List[Dict[str, Any]] = (), role_mentions: List[int] = (),
+        attachments: List[Dict[str, Any]] = (), embeds: List[Dict[str, Any]] = ()
+) -> Dict[str, Any]:
+    return {
+        "id": message_id,
+        "channel_id": str(channel_id),
+        "guild_id": str(GuildConfig.id),
+        "author": author,
+        "content": content,
+        "timestamp": timestamp(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": list(mentions),
+        "mention_roles": [str(role_id) for role_id in role_mentions],
+        "attachments": list(attachments),
+        "embeds": list(embeds),
+        "reactions": [],
+        "pinned": False,
+        "type": 0,
+        "nonce": None
+    }
+
+
+def config_ids(config) -> Dict[str, int]:
+    """
+    Collects the IDs from one of the config classes, like `Channels`, by their key.
+    """
+
+    return {
+        name: getattr(config, name)
+        for name in getattr(config, "__annotations__", {})
+        if isinstance(getattr(config, name), int)
+    }
+
+
+def guild_payload(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Builds a guild with every channel and role from the config, so the cogs find what they look up.
+    """
+
+    everyone = {"id": str(GuildConfig.id), "name": "@everyone", "permissions": 104324161, "position": 0}
+    roles = [everyone] + [
+        {"id": str(role_id), "name": name, "permissions": 0, "position": position, "color": 0, "hoist": False}
+        for position, (name, role_id) in enumerate(sorted(config_ids(Roles).items()), start=1)
+    ]
+
+    channels = [
+        {
+            "id": str(channel_id), "type": 0, "name": name.replace("_", "-"), "position": position,
+            "permission_overwrites": [], "topic": None, "nsfw": False, "parent_id": None
+        }
+        for position, (name, channel_id) in enumerate(sorted(config_ids(Channels).items()))
+    ]
+
+    return {
+        "id": str(GuildConfig.id),
+        "name": "Python Discord",
+        "icon": None,
+        "splash": None,
+        "owner_id": BOT_USER["id"],
+        "region": "us-east",
+        "afk_channel_id": None,
+        "afk_timeout": 300,
+        "verification_level": 2,
+        "default_message_notifications": 1,
+        "explicit_content_filter": 2,
+        "mfa_level": 1,
+        "features": [],
+        "emojis": [],
+        "roles": roles,
+        "channels": channels,
+        "members": members,
+        "member_count": len(members),
+        "presences": [],
+        "voice_states": [],
+        "large": True,
+        "unavailable": False,
+        "system_channel_id": None
+    }
+
+
+def _route_pattern(path: str):
+    parts = re.split(r"\{(\w+)\}", path)
+    pattern = "".join(
+        re.escape(part) if i % 2 == 0 else f"(?P<{part}>[^/]+)"
+        for i, part in enumerate(parts)
+    )
+    return re.compile(pattern + "$")
+
+
+class FakeDiscordHTTP:
+    """
+    Answers the requests the cogs make to the Discord API, in place of `bot.http.request`.
+
+    Every request is counted by its method and route template, and takes `latency` seconds.
+    Messages the bot sends or fetches are made up on the spot, every other request succeeds
+    with an empty response.
+    """
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.requests = Counter()
+
+        self._patterns = {}
+
+    def install(self, bot):
+        bot.http.request = self.request
+
+    def _parameters(self, route) -> Dict[str, str]:
+        pattern = self._patterns.get(route.path)
+
+        if pattern is None:
+            pattern = self._patterns[route.path] = _route_pattern(route.path)
+
+        match = pattern.search(route.url)
+        return match.groupdict() if match else {}
+
+    async def request(self, route, *, files=None, header_bypass_delay=None, **kwargs):
+        self.requests[(route.method, route.path)] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        parameters = self._parameters(route)
+        payload = kwargs.get("json") or {}
+
+        if route.path == "/channels/{channel_id}/messages":
+            if route.method == "GET":
+                return []
+
+            if route.method == "POST":
+                return message_payload(
+                    snowflake(), int(parameters["channel_id"]), BOT_USER, payload.get("content") or "",
+                    embeds=[payload["embed"]] if payload.get("embed") else []
+                )
+
+        if route.path == "/channels/{channel_id}/messages/{message_id}" and route.method in ("GET", "PATCH"):
+            return message_payload(
+                parameters["message_id"], int(parameters["channel_id"]), BOT_USER, payload.get("content") or "",
+                embeds=[payload["embed"]] if payload.get("embed") else []
+            )
+
+        if route.path == "/users/{user_id}":
+            return user_payload(int(parameters["user_id"]), "user")
+
+        return None
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import urlsplit
+
+from bot.constants import Guild as GuildConfig, URLs
+from bot.utils.metrics import normalize_path
+
+
+def _path(url: str) -> str:
+    return urlsplit(url).path
+
+
+# What the site answers per method and path prefix. The longest matching prefix wins,
+# and anything else gets an empty object.
+RESPONSES: Dict[Tuple[str, str], Callable[[], Any]] = {
+    ("GET", _path(URLs.site_user_api)): lambda: {"data": []},
+    ("POST", _path(URLs.site_user_complete_api)): lambda: {"success": True},
+    ("POST", _path(URLs.site_logs_api)): lambda: {"log_id": "replay"},
+    ("GET", _path(URLs.site_infractions)): lambda: [],
+    ("GET", _path(URLs.site_reminders_api)): lambda: [],
+    ("GET", _path(URLs.site_tags_api)): lambda: [],
+
+    # Invites are looked up on Discord's API, and all of them lead back to our own guild
+    ("GET", _path(URLs.discord_invite_api)): lambda: {"guild": {"id": str(GuildConfig.id)}},
+}
+
+
+class FakeResponse:
+    def __init__(self, method: str, url: str, body: Any, status: int = 200):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = {"Content-Type": "application/json"}
+
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        self.release()
+
+    async def json(self, **_):
+        return self._body
+
+    async def text(self, **_):
+        return json.dumps(self._body)
+
+    async def read(self):
+        return json.dumps(self._body).encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _RequestContext:
+    """
+    Like aiohttp's request context managers, this can either be awaited or used with `async with`.
+    """
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *_):
+        self._response.release()
+
+
+class FakeSiteSession:
+    """
+    Stands in for `bot.http_session`, answering requests to the site and other APIs from `RESPONSES`.
+
+    Every request is counted by its method, host and normalised path, and takes `latency` seconds.
+    """
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.requests = Counter()
+        self.closed = False
+
+    async def _request(self, method: str, url: str, **_) -> FakeResponse:
+        parts = urlsplit(str(url))
+        self.requests[(method, f"{parts.hostname}{normalize_path(parts.path)}")] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        prefixes = [
+            prefix for (route_method, prefix) in RESPONSES
+            if route_method == method and parts.path.startswith(prefix)
+        ]
+        body = RESPONSES[(method, max(prefixes, key=len))]() if prefixes else {}
+
+        return FakeResponse(method, url, body)
+
+    def request(self, method: str, url: str, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request(method.upper(), url, **kwargs))
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> _RequestContext:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.closed = True
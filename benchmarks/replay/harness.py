@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.replay.fake_discord import (
+    BOT_USER, FakeDiscordHTTP, guild_payload, member_payload, snowflake
+)
+from benchmarks.replay.fake_site import FakeSiteSession
+from benchmarks.replay.traffic import ReplayEvent, chat_channels
+from discord import ClientUser, Guild, Member
+from discord.ext.commands import Bot, when_mentioned_or
+
+from bot.constants import Bot as BotConfig, Roles
+from bot.utils.metrics import MetricsRegistry
+from bot.utils.reactions import ReactionRouter
+from bot.utils.roles import RoleCache
+
+log = logging.getLogger(__name__)
+
+# The cogs that do the most work per gateway event
+DEFAULT_EXTENSIONS = (
+    "bot.cogs.modlog",
+    "bot.cogs.antispam",
+    "bot.cogs.bot",
+    "bot.cogs.events",
+    "bot.cogs.filtering",
+    "bot.cogs.information",
+    "bot.cogs.superstarify",
+    "bot.cogs.token_remover",
+)
+
+# How long to wait for the handlers still running once every event has been dispatched
+DRAIN_TIMEOUT = 60
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class HandlerStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+
+
+class ReplayReport(NamedTuple):
+    """
+    The measurements of a replay, formatted as a table by `format`.
+    """
+
+    events: int
+    dispatched_in: float
+    duration: float
+    max_behind: float
+    drained: bool
+    handlers: Dict[str, HandlerStats]
+    discord_requests: Dict[Tuple[str, str], int]
+    site_requests: Dict[Tuple[str, str], int]
+    rss_growth: int
+    cached_messages: int
+    memory_diff: List[tracemalloc.StatisticDiff]
+
+    def format(self) -> str:
+        lines = [
+            f"Replayed {self.events} events in {self.duration:.2f}s "
+            f"({self.events / self.duration:.1f} events/s), dispatching took {self.dispatched_in:.2f}s.",
+            f"The replay fell behind schedule by up to {self.max_behind * 1000:.0f}ms.",
+        ]
+
+        if not self.drained:
+            lines.append(f"Some handlers were still running after {DRAIN_TIMEOUT}s, their results are missing.")
+
+        lines += ["", f"{'handler':<44} {'calls':>7} {'per sec':>8} {'p50':>9} {'p99':>9} {'errors':>7}"]
+
+        for name, stats in sorted(self.handlers.items(), key=lambda item: -percentile(item[1].latencies, 0.99)):
+            lines.append(
+                f"{name:<44} {len(stats.latencies):>7} {len(stats.latencies) / self.duration:>8.1f} "
+                f"{percentile(stats.latencies, 0.5) * 1000:>7.1f}ms {percentile(stats.latencies, 0.99) * 1000:>7.1f}ms "
+                f"{stats.errors:>7}"
+            )
+
+        for title, requests in (("Discord API", self.discord_requests), ("Site and other APIs", self.site_requests)):
+            lines += ["", f"{title} requests: {sum(requests.values())}"]
+
+            for (method, endpoint), count in sorted(requests.items(), key=lambda item: -item[1]):
+                lines.append(f"  {count:>7}  {method:<6} {endpoint}")
+
+        lines += [
+            "",
+            f"Peak RSS grew by {self.rss_growth / 1024:.1f}MiB, {self.cached_messages} messages are cached.",
+        ]
+
+        if self.memory_diff:
+            lines.append("Largest allocation growth:")
+            lines.extend(f"  {stat}" for stat in self.memory_diff)
+
+        return "\n".join(lines)
+
+
+class ReplayHarness:
+    """
+    Runs the real cogs on a bot that's never connected to Discord, and feeds it gateway events.
+
+    The bot gets a guild with every channel and role from the config, a fake Discord API and a fake
+    site. Every event handler is timed from the moment its event is dispatched until it's done, so
+    time spent waiting behind other handlers on a busy loop counts towards its latency.
+    """
+
+    def __init__(
+            self, extensions=DEFAULT_EXTENSIONS, *, discord_latency: float = 0.05, site_latency: float = 0.02
+    ):
+        self.bot = Bot(
+            command_prefix=when_mentioned_or(BotConfig.prefix),
+            case_insensitive=True,
+            max_messages=10_000
+        )
+        self.loop = self.bot.loop
+        self.state = self.bot._connection
+
+        self.discord = FakeDiscordHTTP(discord_latency)
+        self.discord.install(self.bot)
+
+        self.site = FakeSiteSession(site_latency)
+        self.bot.http_session = self.site
+        self.bot.metrics = MetricsRegistry()
+        self.bot.reaction_router = ReactionRouter(self.bot)
+        self.bot.role_cache = RoleCache(self.bot)
+
+        self.extensions = extensions
+        self.handlers: Dict[str, HandlerStats] = defaultdict(HandlerStats)
+        self.chat_channels = chat_channels()
+        self.guild: Optional[Guild] = None
+
+        self._message_ids: Dict[str, str] = {}
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._logged_errors = set()
+
+        self.bot._run_event = self._run_event
+
+    def _run_event(self, coro, event_name: str, *args, **kwargs):
+        # Not a coroutine function itself, so the dispatch time is taken before the handler is scheduled
+        dispatched_at = time.perf_counter()
+        self._in_flight += 1
+        self._idle.clear()
+
+        return self._run_timed(dispatched_at, coro, event_name, args, kwargs)
+
+    async def _run_timed(self, dispatched_at: float, coro, event_name: str, args, kwargs):
+        name = getattr(coro, "__qualname__", event_name)
+        stats = self.handlers[name]
+
+        try:
+            await coro(*args, **kwargs)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            stats.errors += 1
+
+            # One traceback per handler is enough to tell a broken fake from a slow cog
+            if name not in self._logged_errors:
+                self._logged_errors.add(name)
+                log.warning(f"{name} raised an exception while handling {event_name}", exc_info=True)
+        finally:
+            stats.latencies.append(time.perf_counter() - dispatched_at)
+            self._in_flight -= 1
+
+            if not self._in_flight:
+                self._idle.set()
+
+    async def setup(self, members: List[Dict[str, Any]]):
+        """
+        Creates the guild with the given members, loads the extensions and lets the cogs get ready.
+
+        Whatever the cogs do on startup isn't included in the results.
+        """
+
+        self.state.user = ClientUser(state=self.state, data=BOT_USER)
+
+        bot_member = member_payload(BOT_USER, [Roles.admin])
+        self.guild = Guild(data=guild_payload([bot_member, *members]), state=self.state)
+        self.state._add_guild(self.guild)
+
+        for extension in self.extensions:
+            self.bot.load_extension(extension)
+
+        self.bot._ready.set()
+        self.bot.dispatch("ready")
+        self.bot.dispatch("guild_available", self.guild)
+        await self.drain()
+
+        self.reset()
+
+    def reset(self):
+        self.handlers.clear()
+        self.discord.requests.clear()
+        self.site.requests.clear()
+
+    async def drain(self, timeout: float = DRAIN_TIMEOUT) -> bool:
+        """
+        Waits until every event handler has finished. Returns `False` if some are still running.
+        """
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+    def _ensure_member(self, user: Dict[str, Any]):
+        if self.guild.get_member(int(user["id"])) is None:
+            member = Member(data=member_payload(user, [Roles.verified]), guild=self.guild, state=self.state)
+            self.guild._add_member(member)
+
+    def _message_id(self, recorded_id: str) -> str:
+        """
+        Swaps a recorded message ID for one created now, since the cogs use IDs to tell when a message was sent.
+        """
+
+        message_id = self._message_ids.get(recorded_id)
+
+        if message_id is None:
+            message_id = self._message_ids[recorded_id] = snowflake()
+
+        return message_id
+
+    def _prepare(self, event: ReplayEvent) -> Dict[str, Any]:
+        """
+        Points an event at the fake guild, so recorded traffic from any guild can be replayed.
+        """
+
+        data = dict(event.d)
+        data["guild_id"] = str(self.guild.id)
+
+        if "channel_id" in data and self.guild.get_channel(int(data["channel_id"])) is None:
+            data["channel_id"] = str(self.chat_channels[int(data["channel_id"]) % len(self.chat_channels)])
+
+        if event.op in ("MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE"):
+            data["id"] = self._message_id(data["id"])
+        elif event.op == "MESSAGE_DELETE_BULK":
+            data["ids"] = [self._message_id(message_id) for message_id in data["ids"]]
+        elif event.op == "MESSAGE_REACTION_ADD":
+            data["message_id"] = self._message_id(data["message_id"])
+            self._ensure_member({"id": data["user_id"], "username": "user", "discriminator": "0000", "avatar": None})
+
+        if event.op == "MESSAGE_CREATE" or event.op == "GUILD_MEMBER_UPDATE":
+            user = data["author"] if event.op == "MESSAGE_CREATE" else data["user"]
+            self._ensure_member(user)
+
+        return data
+
+    async def replay(self, events: List[ReplayEvent], rate: Optional[float] = None) -> ReplayReport:
+        """
+        Dispatches the events through discord.py's gateway parsers, and waits for the handlers to finish.
+
+        :param events: the events to replay, in order
+        :param rate: the number of events per second, or 0 to replay as fast as possible. If it's `None`,
+                     the timing of the events is kept.
+        :return: the measurements of this replay
+        """
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        traced_before = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+        start = self.loop.time()
+        started_at = time.perf_counter()
+        max_behind = 0.0
+
+        for i, event in enumerate(events):
+            if rate is None:
+                due = start + event.t
+            else:
+                due = start + (i / rate if rate else 0.0)
+
+            delay = due - self.loop.time()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_behind = max(max_behind, -delay)
+
+                # Let the handlers run now and then, even when the replay can't keep up
+                if i % 100 == 0:
+                    await asyncio.sleep(0)
+
+            self.state.parsers[event.op](self._prepare(event))
+
+        dispatched_in = time.perf_counter() - started_at
+        drained = await self.drain()
+        duration = time.perf_counter() - started_at
+
+        return ReplayReport(
+            events=len(events),
+            dispatched_in=dispatched_in,
+            duration=duration,
+            max_behind=max_behind,
+            drained=drained,
+            handlers=dict(self.handlers),
+            discord_requests=dict(self.discord.requests),
+            site_requests=dict(self.site.requests),
+            rss_growth=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before,
+            cached_messages=len(self.state._messages or ()),
+            memory_diff=(
+                tracemalloc.take_snapshot().compare_to(traced_before, "lineno")[:10]
+                if traced_before is not None else []
+            )
+        )
+
+    def close(self):
+        for task in asyncio.Task.all_tasks(self.loop):
+            task.cancel()
+
+        self.loop.run_until_complete(asyncio.sleep(0))
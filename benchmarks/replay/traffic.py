@@ -0,0 +1,233 @@
+import json
+import random
+import time
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from benchmarks.fakes import random_content
+from benchmarks.replay.fake_discord import config_ids, member_payload, timestamp, user_payload
+
+from bot.constants import Channels, Guild as GuildConfig, Roles
+
+# The gateway events the harness knows how to replay
+REPLAYED_EVENTS = (
+    "MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE", "MESSAGE_DELETE_BULK", "MESSAGE_REACTION_ADD",
+    "GUILD_MEMBER_ADD", "GUILD_MEMBER_UPDATE", "GUILD_MEMBER_REMOVE",
+)
+
+# How often each kind of event shows up in ordinary chat
+CHAT_MIX = (
+    ("MESSAGE_CREATE", 70),
+    ("MESSAGE_UPDATE", 8),
+    ("MESSAGE_DELETE", 4),
+    ("MESSAGE_REACTION_ADD", 10),
+    ("GUILD_MEMBER_ADD", 3),
+    ("GUILD_MEMBER_UPDATE", 5),
+)
+
+# Message content that makes the cogs do more than glance at a message
+SPECIAL_CONTENT = (
+    "python\ndef greet(name):\nprint(f'Hello {name}')\n\ngreet('world')\n",
+    ">>> import this\n>>> print('hi')\nhi",
+    "join us at discord.gg/python for more",
+    "my bot won't start: bot.run(\"NDY3NzgxMjk0MjI0ODgzNzEy.AAvBdg.Jgm8RmU3v_8VCkM5lt8Yp4lpRzw\")",
+    "https://github.com/python-discord/bot/blob/master/bot/cogs/antispam.py",
+)
+
+RAID_CONTENT = "@everyone JOIN NOW https://discord.gg/freenitro FREE NITRO"
+
+REACTIONS = ("\N{THUMBS UP SIGN}", "\N{WHITE HEAVY CHECK MARK}", "\N{FACE WITH TEARS OF JOY}")
+
+# IDs handed to new members, well away from the ones used by the config
+FIRST_USER_ID = 500_000_000_000_000_000
+
+
+class ReplayEvent(NamedTuple):
+    t: float
+    op: str
+    d: Dict[str, Any]
+
+
+def chat_channels() -> List[int]:
+    """
+    The channels where most of the talking happens, which synthetic messages are spread over.
+    """
+
+    return [
+        channel_id for name, channel_id in config_ids(Channels).items()
+        if name == "python" or name.startswith(("help_", "off_topic"))
+    ]
+
+
+class SyntheticTraffic:
+    """
+    Generates a stream of gateway events for a guild of `members` members, as seen in busy chat.
+
+    With `raid` above zero, that fraction of the events comes from accounts that join the guild and
+    then spam it with mentions and invite links, like a raid would.
+
+    Message IDs in the generated events are just sequence numbers, the harness swaps them for real
+    IDs when they're replayed.
+    """
+
+    def __init__(self, members: int = 1000, *, raid: float = 0.0, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.raid = raid
+        self.channels = chat_channels()
+
+        self.members = [
+            member_payload(user_payload(FIRST_USER_ID + i, f"member{i}"), [Roles.verified])
+            for i in range(members)
+        ]
+        self.raiders: List[Dict[str, Any]] = []
+
+        # The members the guild starts with, before any of them change or new ones join
+        self.initial_members = [dict(member) for member in self.members]
+
+        self._next_user_id = FIRST_USER_ID + members
+        self._next_message_id = 1
+        self._recent_messages = deque(maxlen=500)
+
+    def _new_user(self, name: str) -> Dict[str, Any]:
+        user = user_payload(self._next_user_id, f"{name}{self._next_user_id - FIRST_USER_ID}")
+        self._next_user_id += 1
+        return user
+
+    def _message(self, author: Dict[str, Any], channel_id: int, content: str, mentions=()) -> Dict[str, Any]:
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        self._recent_messages.append((message_id, channel_id, author))
+
+        return {
+            "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(GuildConfig.id),
+            "author": author, "content": content, "timestamp": timestamp(), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": list(mentions), "mention_roles": [],
+            "attachments": [], "embeds": [], "reactions": [], "pinned": False, "type": 0, "nonce": None
+        }
+
+    def _chat_event(self) -> Tuple[str, Dict[str, Any]]:
+        kinds, weights = zip(*CHAT_MIX)
+        kind = self.rng.choices(kinds, weights)[0]
+
+        if kind != "MESSAGE_CREATE" and kind.startswith("MESSAGE") and not self._recent_messages:
+            kind = "MESSAGE_CREATE"
+
+        if kind == "MESSAGE_CREATE":
+            member = self.rng.choice(self.members)
+
+            if self.rng.random() < 0.05:
+                content = self.rng.choice(SPECIAL_CONTENT)
+            else:
+                content = random_content(self.rng, self.rng.randint(3, 40))
+
+            return kind, self._message(member["user"], self.rng.choice(self.channels), content)
+
+        if kind == "MESSAGE_UPDATE":
+            message_id, channel_id, author = self.rng.choice(self._recent_messages)
+            return kind, {
+                "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(GuildConfig.id),
+                "author": author, "content": random_content(self.rng, self.rng.randint(3, 40)),
+                "edited_timestamp": timestamp(), "embeds": []
+            }
+
+        if kind == "MESSAGE_DELETE":
+            message_id, channel_id, _ = self.rng.choice(self._recent_messages)
+            return kind, {"id": str(message_id), "channel_id": str(channel_id), "guild_id": str(GuildConfig.id)}
+
+        if kind == "MESSAGE_REACTION_ADD":
+            message_id, channel_id, _ = self.rng.choice(self._recent_messages)
+            return kind, {
+                "user_id": self.rng.choice(self.members)["user"]["id"], "channel_id": str(channel_id),
+                "message_id": str(message_id), "guild_id": str(GuildConfig.id),
+                "emoji": {"id": None, "name": self.rng.choice(REACTIONS)}
+            }
+
+        if kind == "GUILD_MEMBER_ADD":
+            member = member_payload(self._new_user("newcomer"), [])
+            self.members.append(member)
+            return kind, {**member, "guild_id": str(GuildConfig.id)}
+
+        member = self.rng.choice(self.members)
+        member["roles"] = [str(Roles.verified)] if self.rng.random() < 0.5 else []
+        member["nick"] = self.rng.choice((None, f"nick{self.rng.randint(0, 999)}"))
+        return kind, {
+            "guild_id": str(GuildConfig.id), "user": member["user"], "roles": member["roles"], "nick": member["nick"]
+        }
+
+    def _raid_event(self) -> Tuple[str, Dict[str, Any]]:
+        # Every raider joins first, and then spams the same message over and over
+        if not self.raiders or self.rng.random() < 0.1:
+            member = member_payload(self._new_user("raider"), [])
+            self.raiders.append(member)
+            return "GUILD_MEMBER_ADD", {**member, "guild_id": str(GuildConfig.id)}
+
+        raider = self.rng.choice(self.raiders)
+        mentions = [member["user"] for member in self.rng.sample(self.members, min(len(self.members), 6))]
+        return "MESSAGE_CREATE", self._message(raider["user"], self.channels[0], RAID_CONTENT, mentions)
+
+    def generate(self, count: int, rate: float) -> List[ReplayEvent]:
+        """
+        Generates `count` events, spaced evenly at `rate` events per second.
+        """
+
+        events = []
+
+        for i in range(count):
+            if self.rng.random() < self.raid:
+                op, data = self._raid_event()
+            else:
+                op, data = self._chat_event()
+
+            events.append(ReplayEvent(i / rate if rate else 0.0, op, data))
+
+        return events
+
+
+def load_stream(path: str) -> List[ReplayEvent]:
+    """
+    Loads a stream of events from a JSON lines file, skipping the events the harness can't replay.
+    """
+
+    with open(path, encoding="utf-8") as f:
+        events = [ReplayEvent(**json.loads(line)) for line in f if line.strip()]
+
+    return [event for event in events if event.op in REPLAYED_EVENTS]
+
+
+def save_stream(path: str, events: List[ReplayEvent]):
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event._asdict()) + "\n")
+
+
+class GatewayRecorder:
+    """
+    Writes the events a running bot receives from the gateway to a file, so they can be replayed.
+
+    Start it from an eval session with `GatewayRecorder(bot, "stream.jsonl").start()`, and call
+    `stop` once enough traffic has been recorded. The file contains user content, so treat it
+    like any other message log.
+    """
+
+    def __init__(self, bot, path: str):
+        self.bot = bot
+        self.path = path
+
+        self._file = None
+        self._started_at = None
+
+    def start(self):
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._started_at = time.perf_counter()
+        self.bot.add_listener(self.on_socket_response)
+
+    def stop(self):
+        self.bot.remove_listener(self.on_socket_response)
+        self._file.close()
+
+    async def on_socket_response(self, msg: Dict[str, Any]):
+        if msg.get("t") not in REPLAYED_EVENTS:
+            return
+
+        event = ReplayEvent(time.perf_counter() - self._started_at, msg["t"], msg["d"])
+        self._file.write(json.dumps(event._asdict()) + "\n")
@@ -0,0 +1,157 @@
+import json
+import os
+import platform
+import timeit
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# The default baseline file. Timings are specific to the machine they were taken on, so it isn't committed.
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# A benchmark is flagged as a regression when it's this much slower than the baseline
+DEFAULT_TOLERANCE = 0.2
+
+DEFAULT_REPEAT = 5
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+
+
+class Result(NamedTuple):
+    name: str
+    seconds: float
+    baseline: Optional[float]
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline:
+            return None
+
+        return self.seconds / self.baseline
+
+
+BENCHMARKS: Dict[str, Benchmark] = OrderedDict()
+
+
+def register(name: str, setup: Callable[[], Callable[[], Any]]):
+    """
+    Adds a benchmark to the suite.
+
+    :param name: a unique name, used to match the result with its baseline
+    :param setup: a function called once before timing, returning the function which is timed
+    """
+
+    if name in BENCHMARKS:
+        raise ValueError(f"A benchmark named {name} is already registered")
+
+    BENCHMARKS[name] = Benchmark(name, setup)
+
+
+def benchmark(name: str):
+    """
+    Registers the decorated setup function as a benchmark. See `register`.
+    """
+
+    def decorator(setup):
+        register(name, setup)
+        return setup
+
+    return decorator
+
+
+def run_coroutine(coro):
+    """
+    Runs a coroutine which never actually suspends, without the overhead of an event loop.
+
+    The rules and filter checks are coroutines only to fit the cogs' interfaces, so stepping
+    them once is all it takes.
+    """
+
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+
+    coro.close()
+    raise RuntimeError("The benchmarked coroutine tried to suspend, it needs an event loop")
+
+
+def measure(func: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> float:
+    """
+    Times a function, returning the best time of a single call in seconds.
+
+    The number of calls per repetition is picked so each one takes at least 0.2 seconds. The
+    minimum over the repetitions is used since it's the least affected by other processes.
+    """
+
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: Dict[str, float]):
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "saved_at": datetime.utcnow().isoformat()
+        },
+        "results": results
+    }
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=4, sort_keys=True)
+
+
+def run(
+        selected: List[Benchmark], baseline: Dict[str, float], repeat: int = DEFAULT_REPEAT,
+        report: Callable[[Result], None] = None
+) -> List[Result]:
+    """
+    Runs the given benchmarks, and pairs the results up with their baselines.
+
+    :param report: called with every result as soon as it's available
+    """
+
+    results = []
+
+    for bench in selected:
+        result = Result(bench.name, measure(bench.setup(), repeat), baseline.get(bench.name))
+        results.append(result)
+
+        if report is not None:
+            report(result)
+
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e3), ("µs", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.2f}{unit}"
+
+    return f"{seconds * 1e9:.0f}ns"
+
+
+def format_result(result: Result, tolerance: float) -> str:
+    line = f"{result.name:<56} {format_time(result.seconds):>10}"
+
+    if result.ratio is None:
+        return f"{line}  (no baseline)"
+
+    change = (result.ratio - 1) * 100
+    flag = "  REGRESSION" if result.ratio > 1 + tolerance else ""
+
+    return f"{line} {format_time(result.baseline):>10} {change:>+7.1f}%{flag}"
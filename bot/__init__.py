@@ -1,7 +1,10 @@
+import atexit
 import logging
 import os
 import sys
 from logging import Logger, StreamHandler, handlers
+from multiprocessing import current_process
+from queue import Queue
 
 from logmatic import JsonFormatter
 
@@ -17,8 +20,17 @@ def monkeypatch_trace(self, msg, *args, **kwargs):
     a true value, e.g.
 
     logger.trace("Houston, we have an %s", "interesting problem", exc_info=1)
+
+    On hot paths, pass the arguments separately like above rather than using
+    an f-string, or pass a callable returning the message, so nothing is
+    formatted unless TRACE is enabled, e.g.
+
+    logger.trace(lambda: f"Built {len(pages)} pages: {pages}")
     """
     if self.isEnabledFor(logging.TRACE):
+        if callable(msg):
+            msg = msg()
+
         self._log(logging.TRACE, msg, args, **kwargs)
 
 
@@ -31,7 +43,10 @@ logging_handlers = []
 DEBUG_MODE = True if 'local' in os.environ.get("SITE_URL", "local") else False
 
 
-if DEBUG_MODE:
+if current_process().name != "MainProcess":
+    # Worker processes import the bot's modules as well, but mustn't truncate or rotate its log files
+    logging_handlers.append(StreamHandler(stream=sys.stderr))
+elif DEBUG_MODE:
     logging_handlers.append(StreamHandler(stream=sys.stdout))
 
     json_handler = logging.FileHandler(filename="log.json", mode="w")
@@ -54,11 +69,43 @@ else:
     logging_handlers.append(json_handler)
 
 
+class QueueHandler(handlers.QueueHandler):
+    """
+    Hands log records over to the logging thread.
+
+    The message is merged with its arguments straight away, since they may
+    change by the time the logging thread gets to them. Unlike the base class,
+    the exception info is kept, as the records never leave the process, so
+    formatting tracebacks happens on the logging thread as well.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+formatter = logging.Formatter(
+    fmt="%(asctime)s pd.beardfist.com Bot: | %(name)30s | %(levelname)8s | %(message)s",
+    datefmt="%b %d %H:%M:%S"
+)
+
+for handler in logging_handlers:
+    if handler.formatter is None:
+        handler.setFormatter(formatter)
+
+# The actual handlers run on a separate thread, so file and stdout I/O doesn't block the event loop
+log_queue = Queue(-1)
+queue_handler = QueueHandler(log_queue)
+queue_listener = handlers.QueueListener(log_queue, *logging_handlers, respect_handler_level=True)
+queue_listener.start()
+
+# This runs before logging's own shutdown hook, so every queued record is written out first
+atexit.register(queue_listener.stop)
+
 logging.basicConfig(
-    format="%(asctime)s pd.beardfist.com Bot: | %(name)30s | %(levelname)8s | %(message)s",
-    datefmt="%b %d %H:%M:%S",
     level=logging.TRACE if DEBUG_MODE else logging.INFO,
-    handlers=logging_handlers
+    handlers=[queue_handler]
 )
 
 log = logging.getLogger(__name__)
@@ -84,8 +131,7 @@ for key, value in logging.Logger.manager.loggerDict.items():
     for handler in value.handlers.copy():
         value.removeHandler(handler)
 
-    for handler in logging_handlers:
-        value.addHandler(handler)
+    value.addHandler(queue_handler)
 
 
 # Silence irrelevant loggers
@@ -1,16 +1,26 @@
 import logging
+import multiprocessing
 import socket
 
-from aiohttp import AsyncResolver, ClientSession, TCPConnector
+from aiohttp import AsyncResolver, TCPConnector
 from discord import Game
 from discord.ext.commands import Bot, when_mentioned_or
 
-from bot.constants import Bot as BotConfig, DEBUG_MODE
-from bot.utils.service_discovery import wait_for_rmq
+from bot.constants import Bot as BotConfig, DEBUG_MODE, get_config
+from bot.utils.loop_monitor import LoopLagMonitor
+from bot.utils.metrics import InstrumentedClientSession, MetricsRegistry
+from bot.utils.reactions import ReactionRouter
+from bot.utils.roles import RoleCache
+from bot.utils.service_discovery import watch_rmq
+from bot.utils.startup import StartupProfiler
 
 
 log = logging.getLogger(__name__)
 
+# Worker processes, like the snake card renderers, are started from scratch instead of being forked, since
+# a fork could copy a lock held by the logging or loop monitor threads, which would never be released in the worker
+multiprocessing.set_start_method("spawn")
+
 bot = Bot(
     command_prefix=when_mentioned_or(BotConfig.prefix),
     activity=Game(name="Commands: !help"),
@@ -18,66 +28,82 @@ bot = Bot(
     max_messages=10_000
 )
 
+# Global metrics registry, served to Prometheus by the Metrics cog
+bot.metrics = MetricsRegistry()
+
+# Measures event loop lag, and logs the stack of whatever blocks the loop for too long
+bot.loop_monitor = LoopLagMonitor(bot.loop, bot.metrics)
+bot.loop_monitor.start()
+
 # Global aiohttp session for all cogs
 # - Uses asyncio for DNS resolution instead of threads, so we don't spam threads
 # - Uses AF_INET as its socket family to prevent https related problems both locally and in prod.
-bot.http_session = ClientSession(
+# - Records the latency and status of every request in the metrics registry, by the configured URL they fall under
+bot.http_session = InstrumentedClientSession(
     connector=TCPConnector(
         resolver=AsyncResolver(),
         family=socket.AF_INET,
-    )
+    ),
+    metrics=bot.metrics,
+    routes=[url for url in get_config().source["urls"].values() if isinstance(url, str) and "://" in url]
 )
 
-log.info("Waiting for RabbitMQ...")
-has_rmq = wait_for_rmq()
+# Records how long each extension takes to load, and loads the heavy ones once we're connected
+bot.startup_profiler = profiler = StartupProfiler(bot)
 
-if has_rmq:
-    log.info("RabbitMQ found")
-else:
-    log.warning("Timed out while waiting for RabbitMQ")
+# Global reaction router, so reaction-driven widgets are looked up by message ID
+# instead of every widget's `wait_for` check running on every reaction.
+bot.reaction_router = ReactionRouter(bot)
+
+# Global cache of each member's role IDs, so permission checks don't walk their roles every time
+bot.role_cache = RoleCache(bot)
 
 # Internal/debug
-bot.load_extension("bot.cogs.logging")
-bot.load_extension("bot.cogs.security")
-bot.load_extension("bot.cogs.events")
-bot.load_extension("bot.cogs.filtering")
-bot.load_extension("bot.cogs.modlog")
+profiler.load_extension("bot.cogs.logging")
+profiler.load_extension("bot.cogs.metrics")
+profiler.load_extension("bot.cogs.security")
+profiler.load_extension("bot.cogs.events")
+profiler.load_extension("bot.cogs.filtering")
+profiler.load_extension("bot.cogs.modlog")
 
 # Commands, etc
-bot.load_extension("bot.cogs.antispam")
-bot.load_extension("bot.cogs.bigbrother")
-bot.load_extension("bot.cogs.bot")
-bot.load_extension("bot.cogs.clean")
-bot.load_extension("bot.cogs.cogs")
-bot.load_extension("bot.cogs.help")
+profiler.load_extension("bot.cogs.antispam")
+profiler.load_extension("bot.cogs.bigbrother")
+profiler.load_extension("bot.cogs.bot")
+profiler.load_extension("bot.cogs.clean")
+profiler.load_extension("bot.cogs.cogs")
+profiler.load_extension("bot.cogs.config")
+profiler.load_extension("bot.cogs.help")
 
 # Only load this in production
 if not DEBUG_MODE:
-    bot.load_extension("bot.cogs.doc")
-    bot.load_extension("bot.cogs.verification")
+    profiler.defer_extension("bot.cogs.doc")
+    profiler.load_extension("bot.cogs.verification")
 
 # Feature cogs
-bot.load_extension("bot.cogs.alias")
-bot.load_extension("bot.cogs.deployment")
-bot.load_extension("bot.cogs.defcon")
-bot.load_extension("bot.cogs.eval")
-bot.load_extension("bot.cogs.fun")
-bot.load_extension("bot.cogs.superstarify")
-bot.load_extension("bot.cogs.information")
-bot.load_extension("bot.cogs.moderation")
-bot.load_extension("bot.cogs.off_topic_names")
-bot.load_extension("bot.cogs.reddit")
-bot.load_extension("bot.cogs.reminders")
-bot.load_extension("bot.cogs.site")
-bot.load_extension("bot.cogs.snakes")
-bot.load_extension("bot.cogs.snekbox")
-bot.load_extension("bot.cogs.tags")
-bot.load_extension("bot.cogs.token_remover")
-bot.load_extension("bot.cogs.utils")
-bot.load_extension("bot.cogs.wolfram")
-
-if has_rmq:
-    bot.load_extension("bot.cogs.rmq")
+profiler.load_extension("bot.cogs.alias")
+profiler.load_extension("bot.cogs.deployment")
+profiler.load_extension("bot.cogs.defcon")
+profiler.load_extension("bot.cogs.eval")
+profiler.load_extension("bot.cogs.fun")
+profiler.load_extension("bot.cogs.superstarify")
+profiler.load_extension("bot.cogs.information")
+profiler.load_extension("bot.cogs.moderation")
+profiler.load_extension("bot.cogs.off_topic_names")
+profiler.load_extension("bot.cogs.reddit")
+profiler.load_extension("bot.cogs.reminders")
+profiler.load_extension("bot.cogs.site")
+profiler.defer_extension("bot.cogs.snakes")
+profiler.load_extension("bot.cogs.snekbox")
+profiler.load_extension("bot.cogs.tags")
+profiler.load_extension("bot.cogs.token_remover")
+profiler.load_extension("bot.cogs.utils")
+profiler.load_extension("bot.cogs.wolfram")
+
+bot.loop.create_task(profiler.load_deferred_extensions())
+
+# The RMQ cog is loaded by this once RabbitMQ is reachable, so we don't have to wait for it here
+bot.loop.create_task(watch_rmq(bot))
 
 bot.run(BotConfig.token)
 
@@ -11,9 +11,10 @@ from discord.ext.commands import Bot
 from bot import rules
 from bot.cogs.modlog import ModLog
 from bot.constants import (
-    AntiSpam as AntiSpamConfig, Channels,
+    AntiSpamSnapshot, Channels,
     Colours, DEBUG_MODE, Event,
     Guild as GuildConfig, Icons, Roles,
+    get_config
 )
 from bot.utils.time import humanize_delta
 
@@ -38,7 +39,7 @@ WHITELISTED_CHANNELS = (
     Channels.helpers, Channels.message_log,
     Channels.mod_alerts, Channels.modlog, Channels.staff_lounge
 )
-WHITELISTED_ROLES = (Roles.owner, Roles.admin, Roles.moderator, Roles.helpers)
+WHITELISTED_ROLES = frozenset((Roles.owner, Roles.admin, Roles.moderator, Roles.helpers))
 
 
 class AntiSpam:
@@ -51,8 +52,7 @@ class AntiSpam:
         return self.bot.get_cog("ModLog")
 
     async def on_ready(self):
-        role_id = AntiSpamConfig.punishment['role_id']
-        self.muted_role = Object(role_id)
+        self.muted_role = Object(get_config().anti_spam.muted_role_id)
 
     async def on_message(self, message: Message):
         if (
@@ -60,25 +60,19 @@ class AntiSpam:
             or message.guild.id != GuildConfig.id
             or message.author.bot
             or (message.channel.id in WHITELISTED_CHANNELS and not DEBUG_MODE)
-            or (message.author.top_role.id in WHITELISTED_ROLES and not DEBUG_MODE)
+            or (self.bot.role_cache.has_any(message.author, WHITELISTED_ROLES) and not DEBUG_MODE)
         ):
             return
 
-        # Fetch the rule configuration with the highest rule interval.
-        max_interval_config = max(
-            AntiSpamConfig.rules.values(),
-            key=lambda config: config['interval']
-        )
-        max_interval = max_interval_config['interval']
+        config = get_config().anti_spam
 
-        # Store history messages since `interval` seconds ago in a list to prevent unnecessary API calls.
-        earliest_relevant_at = datetime.utcnow() - timedelta(seconds=max_interval)
+        # Store history messages since the highest rule interval in a list to prevent unnecessary API calls.
+        earliest_relevant_at = datetime.utcnow() - timedelta(seconds=config.max_interval)
         relevant_messages = [
             msg async for msg in message.channel.history(after=earliest_relevant_at, reverse=False)
         ]
 
-        for rule_name in AntiSpamConfig.rules:
-            rule_config = AntiSpamConfig.rules[rule_name]
+        for rule_name, rule_config in config.rules:
             rule_function = RULE_FUNCTION_MAPPING[rule_name]
 
             # Create a list of messages that were sent in the interval that the rule cares about.
@@ -103,13 +97,14 @@ class AntiSpam:
                         self.punish(message, member, full_reason, relevant_messages)
                     )
 
-                await self.maybe_delete_messages(message.channel, relevant_messages)
+                await self.maybe_delete_messages(message.channel, relevant_messages, config)
                 break
 
     async def punish(self, msg: Message, member: Member, reason: str, messages: List[Message]):
         # Sanity check to ensure we're not lagging behind
         if self.muted_role not in member.roles:
-            remove_role_after = AntiSpamConfig.punishment['remove_after']
+            config = get_config().anti_spam
+            remove_role_after = config.remove_after
             duration_delta = relativedelta(seconds=remove_role_after)
             human_duration = humanize_delta(duration_delta)
 
@@ -140,7 +135,7 @@ class AntiSpam:
                 text=mod_alert_message,
                 thumbnail=msg.author.avatar_url_as(static_format="png"),
                 channel_id=Channels.mod_alerts,
-                ping_everyone=AntiSpamConfig.ping_everyone
+                ping_everyone=config.ping_everyone
             )
 
             await member.add_roles(self.muted_role, reason=reason)
@@ -165,9 +160,9 @@ class AntiSpam:
                 text=f"Was muted by `AntiSpam` cog for {human_duration}."
             )
 
-    async def maybe_delete_messages(self, channel: TextChannel, messages: List[Message]):
+    async def maybe_delete_messages(self, channel: TextChannel, messages: List[Message], config: AntiSpamSnapshot):
         # Is deletion of offending messages actually enabled?
-        if AntiSpamConfig.clean_offending:
+        if config.clean_offending:
 
             # If we have more than one message, we can use bulk delete.
             if len(messages) > 1:
@@ -182,23 +177,16 @@ class AntiSpam:
                 await messages[0].delete()
 
 
-def validate_config():
-    for name, config in AntiSpamConfig.rules.items():
+def validate_config(config: AntiSpamSnapshot):
+    for name, _ in config.rules:
         if name not in RULE_FUNCTION_MAPPING:
             raise ValueError(
                 f"Unrecognized antispam rule `{name}`. "
                 f"Valid rules are: {', '.join(RULE_FUNCTION_MAPPING)}"
             )
 
-        for required_key in ('interval', 'max'):
-            if required_key not in config:
-                raise ValueError(
-                    f"`{required_key}` is required but was not "
-                    f"set in rule `{name}`'s configuration."
-                )
-
 
 def setup(bot: Bot):
-    validate_config()
+    validate_config(get_config().anti_spam)
     bot.add_cog(AntiSpam(bot))
     log.info("Cog loaded: AntiSpam")
@@ -15,6 +15,7 @@ from bot.utils import messages
 log = logging.getLogger(__name__)
 
 URL_RE = re.compile(r"(https?://[^\s]+)")
+MESSAGE_LIMIT = 2000
 
 
 class BigBrother:
@@ -26,8 +27,9 @@ class BigBrother:
         self.bot = bot
         self.watched_users = {}  # { user_id: log_channel_id }
         self.channel_queues = defaultdict(lambda: defaultdict(deque))  # { user_id: { channel_id: queue(messages) }
-        self.last_log = [None, None, 0]  # [user_id, channel_id, message_count]
+        self.last_log = defaultdict(lambda: [None, None, 0])  # { log_channel_id: [user_id, channel_id, message_count] }
         self.consuming = False
+        self.attachment_semaphore = asyncio.Semaphore(messages.MAX_CONCURRENT_DOWNLOADS)
 
         self.bot.loop.create_task(self.get_watched_users())
 
@@ -94,7 +96,11 @@ class BigBrother:
             self.channel_queues[msg.author.id][msg.channel.id].append(msg)
 
     async def consume_messages(self):
-        """Consumes the message queues to log watched users' messages."""
+        """
+        Consumes the message queues to log watched users' messages.
+
+        Relays to different log channels run concurrently, while each log channel still receives its messages in order.
+        """
 
         if not self.consuming:
             self.consuming = True
@@ -104,16 +110,20 @@ class BigBrother:
         log.trace("Begin consuming messages.")
         channel_queues = self.channel_queues.copy()
         self.channel_queues.clear()
+
+        relays = defaultdict(list)  # { log_channel: [queue(messages)] }
         for user_id, queues in channel_queues.items():
-            for _, queue in queues.items():
-                channel = self.watched_users[user_id]
-                while queue:
-                    msg = queue.popleft()
-                    log.trace(f"Consuming message: {msg.clean_content} ({len(msg.attachments)} attachments)")
+            channel = self.watched_users[user_id]
+            relays[channel].extend(queues.values())
+
+        results = await asyncio.gather(
+            *(self.relay_messages(channel, queues) for channel, queues in relays.items()),
+            return_exceptions=True
+        )
 
-                    self.last_log[2] += 1  # Increment message count.
-                    await self.send_header(msg, channel)
-                    await self.log_message(msg, channel)
+        for channel, result in zip(relays, results):
+            if isinstance(result, Exception):
+                log.error(f"Failed to relay messages to #{channel}", exc_info=result)
 
         if self.channel_queues:
             log.trace("Queue not empty; continue consumption.")
@@ -122,38 +132,98 @@ class BigBrother:
             log.trace("Done consuming messages.")
             self.consuming = False
 
-    async def send_header(self, message: Message, destination: TextChannel):
+    async def relay_messages(self, destination: TextChannel, queues: List[deque]):
         """
-        Sends a log message header to the given channel.
+        Relays the given message queues to a single log channel.
+
+        The content of consecutive messages is grouped into as few sends as possible. A batch is sent early whenever a
+        header is due or a message has attachments, so the log reads in the same order as the original messages.
+
+        :param destination: the channel in which to log the messages
+        :param queues: queues of messages, each containing messages by one user in one channel
+        """
+
+        batch = []
+        batch_length = 0
+
+        async def flush():
+            nonlocal batch_length
+
+            if batch:
+                await destination.send("\n".join(batch))
+                batch.clear()
+                batch_length = 0
+
+        for queue in queues:
+            while queue:
+                msg = queue.popleft()
+                log.trace(f"Consuming message: {msg.clean_content} ({len(msg.attachments)} attachments)")
+
+                last_log = self.last_log[destination.id]
+                last_log[2] += 1  # Increment message count.
+
+                if self.needs_header(msg, destination):
+                    await flush()
+                    await self.send_header(msg, destination)
+
+                content = self.format_content(msg)
+                if content:
+                    # Discord messages are limited to 2,000 characters, including the joining newlines
+                    if batch_length + len(content) + len(batch) > MESSAGE_LIMIT:
+                        await flush()
+
+                    batch.append(content)
+                    batch_length += len(content)
 
-        A header is only sent if the user or channel are different than the previous, or if the configured message
+                if msg.attachments:
+                    await flush()
+                    await messages.send_attachments(
+                        msg, destination,
+                        session=self.bot.http_session,
+                        semaphore=self.attachment_semaphore
+                    )
+
+            await flush()
+
+    def needs_header(self, message: Message, destination: TextChannel) -> bool:
+        """
+        Checks whether a log message header should be sent to the given channel before the given message.
+
+        A header is only needed if the user or channel are different than the previous, or if the configured message
         limit for a single header has been exceeded.
 
-        :param message: the first message in the queue
-        :param destination: the channel in which to send the header
+        :param message: the next message to be logged
+        :param destination: the channel in which the message will be logged
         """
 
-        last_user, last_channel, msg_count = self.last_log
+        last_user, last_channel, msg_count = self.last_log[destination.id]
         limit = BigBrotherConfig.header_message_limit
 
-        # Send header if user/channel are different or if message limit exceeded.
-        if message.author.id != last_user or message.channel.id != last_channel or msg_count > limit:
-            self.last_log = [message.author.id, message.channel.id, 0]
+        return message.author.id != last_user or message.channel.id != last_channel or msg_count > limit
 
-            embed = Embed(description=f"{message.author.mention} in [#{message.channel.name}]({message.jump_url})")
-            embed.set_author(name=message.author.nick or message.author.name, icon_url=message.author.avatar_url)
-            await destination.send(embed=embed)
+    async def send_header(self, message: Message, destination: TextChannel):
+        """
+        Sends a log message header to the given channel.
+
+        :param message: the first message in the queue
+        :param destination: the channel in which to send the header
+        """
+
+        self.last_log[destination.id] = [message.author.id, message.channel.id, 0]
+
+        embed = Embed(description=f"{message.author.mention} in [#{message.channel.name}]({message.jump_url})")
+        embed.set_author(name=message.author.nick or message.author.name, icon_url=message.author.avatar_url)
+        await destination.send(embed=embed)
 
     @staticmethod
-    async def log_message(message: Message, destination: TextChannel):
+    def format_content(message: Message) -> str:
         """
-        Logs a watched user's message in the given channel.
+        Formats a watched user's message for logging.
 
-        Attachments are also sent. All non-image or non-video URLs are put in inline code blocks to prevent preview
-        embeds from being automatically generated.
+        All non-image or non-video URLs are put in inline code blocks to prevent preview embeds from being
+        automatically generated.
 
-        :param message: the message to log
-        :param destination: the channel in which to log the message
+        :param message: the message to format
         """
 
         content = message.clean_content
@@ -164,9 +234,7 @@ class BigBrother:
                 if url not in media_urls:
                     content = content.replace(url, f"`{url}`")
 
-            await destination.send(content)
-
-        await messages.send_attachments(message, destination)
+        return content
 
     @group(name='bigbrother', aliases=('bb',), invoke_without_command=True)
     @with_role(Roles.owner, Roles.admin, Roles.moderator)
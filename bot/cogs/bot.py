@@ -410,11 +410,9 @@ class Bot:
             return
 
         #  If the reaction was clicked by staff (helper or higher), deletes the bot message
-        for role in member.roles:
-            if role.id in (Roles.owner, Roles.admin, Roles.moderator, Roles.helpers):
-                await bot_message.delete()
-                del self.codeblock_message_ids[user_message_id]
-                return
+        if self.bot.role_cache.has_any(member, (Roles.owner, Roles.admin, Roles.moderator, Roles.helpers)):
+            await bot_message.delete()
+            del self.codeblock_message_ids[user_message_id]
 
 
 def setup(bot):
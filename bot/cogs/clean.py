@@ -1,9 +1,13 @@
+import asyncio
 import logging
 import random
 import re
-from typing import Optional
+import time
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
 
-from discord import Colour, Embed, Message, User
+from discord import Colour, Embed, Message, NotFound, TextChannel, User
 from discord.ext.commands import Bot, Context, group
 
 from bot.cogs.modlog import ModLog
@@ -15,6 +19,172 @@ from bot.decorators import with_role
 
 log = logging.getLogger(__name__)
 
+BULK_DELETE_LIMIT = 100  # Maximum number of messages Discord allows in one bulk delete
+BULK_DELETE_MAX_AGE = timedelta(days=14, minutes=-5)  # Bulk deletes reject older messages, keep a safety margin
+
+
+class CleanEngine:
+    """
+    Deletes the messages matching a predicate in a single pass over a channel's history.
+
+    History pages are fetched by a background task which reads up to `read_ahead` messages ahead of
+    the predicate. Matching messages are bulk deleted in batches of 100 as soon as a batch fills, with up to
+    `max_concurrent_bulk` requests in flight; discord.py keeps these within the channel's rate limit.
+    Messages too old for a bulk delete are handed to a separate worker which deletes them one by one.
+    """
+
+    def __init__(
+            self, channel: TextChannel, predicate: Optional[Callable[[Message], bool]], *,
+            before_delete: Callable[[List[Message]], None] = None,
+            is_cancelled: Callable[[], bool] = None,
+            read_ahead: int = 200, max_concurrent_bulk: int = 2
+    ):
+        self.channel = channel
+        self.predicate = predicate
+        self.before_delete = before_delete
+        self.is_cancelled = is_cancelled
+
+        self.scanned = 0
+        self.deleted = 0
+        self.started_at = None
+        self.finished_at = None
+
+        self._read_ahead = asyncio.Semaphore(read_ahead)
+        self._bulk_semaphore = asyncio.Semaphore(max_concurrent_bulk)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of messages deleted per second.
+        """
+
+        elapsed = self.elapsed
+        return self.deleted / elapsed if elapsed else 0.0
+
+    @property
+    def progress(self) -> str:
+        return (
+            f"scanned {self.scanned}, deleted {self.deleted} in {self.elapsed:.2f}s "
+            f"({self.throughput:.1f} messages/s)"
+        )
+
+    async def run(self, limit: int, before: Message = None) -> List[Message]:
+        """
+        Scans up to `limit` messages and deletes the ones matching the predicate.
+
+        :param limit: the maximum number of messages to traverse
+        :param before: only traverse messages sent before this one
+        :return: the matched messages, newest first
+        """
+
+        self.started_at = time.monotonic()
+
+        history = asyncio.Queue()
+        old_messages = asyncio.Queue()
+        matched = []
+        batch = []
+        bulk_deletes = []
+
+        reader = asyncio.ensure_future(self._read_history(history, limit, before))
+        old_worker = asyncio.ensure_future(self._delete_individually(old_messages))
+        cutoff = datetime.utcnow() - BULK_DELETE_MAX_AGE
+
+        try:
+            while True:
+                message = await history.get()
+                if message is None:
+                    break
+
+                self._read_ahead.release()
+
+                # If at any point the cancel command is invoked, we should stop.
+                if self.is_cancelled is not None and self.is_cancelled():
+                    log.debug(f"Clean in #{self.channel} was cancelled, {self.progress}")
+                    break
+
+                self.scanned += 1
+
+                if self.predicate is not None and not self.predicate(message):
+                    continue
+
+                matched.append(message)
+
+                if message.created_at < cutoff:
+                    old_messages.put_nowait(message)
+                    continue
+
+                batch.append(message)
+
+                if len(batch) == BULK_DELETE_LIMIT:
+                    bulk_deletes.append(asyncio.ensure_future(self._bulk_delete(batch)))
+                    batch = []
+
+            if batch:
+                bulk_deletes.append(asyncio.ensure_future(self._bulk_delete(batch)))
+
+            old_messages.put_nowait(None)
+            await asyncio.gather(old_worker, *bulk_deletes)
+        finally:
+            # If a deletion failed, don't leave the others running in the background
+            for task in (reader, old_worker, *bulk_deletes):
+                task.cancel()
+
+            self.finished_at = time.monotonic()
+
+        # Surface errors from fetching the history, now that everything that matched is deleted
+        if reader.done() and not reader.cancelled() and reader.exception():
+            raise reader.exception()
+
+        return matched
+
+    async def _read_history(self, queue: asyncio.Queue, limit: int, before: Optional[Message]):
+        try:
+            async for message in self.channel.history(limit=limit, before=before):
+                await self._read_ahead.acquire()
+                queue.put_nowait(message)
+        finally:
+            # Always unblock the consumer, even if fetching the history failed
+            queue.put_nowait(None)
+
+    async def _bulk_delete(self, messages: List[Message]):
+        async with self._bulk_semaphore:
+            if self.before_delete is not None:
+                self.before_delete(messages)
+
+            try:
+                await self.channel.delete_messages(messages)
+            except NotFound:
+                # Someone else deleted one of the messages, so the whole request was rejected
+                await self._delete_each(messages)
+            else:
+                self.deleted += len(messages)
+
+            log.trace(f"Bulk deleted {len(messages)} messages in #{self.channel}, {self.progress}")
+
+    async def _delete_individually(self, queue: asyncio.Queue):
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+
+            if self.before_delete is not None:
+                self.before_delete([message])
+
+            await self._delete_each([message])
+
+    async def _delete_each(self, messages: List[Message]):
+        for message in messages:
+            with suppress(NotFound):
+                await message.delete()
+                self.deleted += 1
+
 
 class Clean:
     """
@@ -88,14 +258,10 @@ class Clean:
                     content.append(field.value)
 
             # Get rid of empty attributes and turn it into a string
-            content = [attr for attr in content if attr]
-            content = "\n".join(content)
+            content = "\n".join(attr for attr in content if attr)
 
             # Now let's see if there's a regex match
-            if not content:
-                return False
-            else:
-                return bool(re.search(regex.lower(), content.lower()))
+            return bool(content) and bool(pattern.search(content))
 
         # Is this an acceptable amount of messages to clean?
         if amount > CleanMessages.message_limit:
@@ -123,44 +289,41 @@ class Clean:
         elif user:
             predicate = predicate_specific_user  # Delete messages from specific user
         elif regex:
+            # Compile once, rather than for every message
+            try:
+                pattern = re.compile(regex, re.IGNORECASE)
+            except re.error as e:
+                embed = Embed(
+                    color=Colour(Colours.soft_red),
+                    title=random.choice(NEGATIVE_REPLIES),
+                    description=f"Invalid regular expression: `{e}`"
+                )
+                await ctx.send(embed=embed)
+                return
+
             predicate = predicate_regex          # Delete messages that match regex
         else:
             predicate = None                     # Delete all messages
 
-        # Look through the history and retrieve message data
-        messages = []
-        message_ids = []
+        # Always start by deleting the invocation
         self.cleaning = True
-        invocation_deleted = False
-
-        async for message in ctx.channel.history(limit=amount):
-
-            # If at any point the cancel command is invoked, we should stop.
-            if not self.cleaning:
-                return
-
-            # Always start by deleting the invocation
-            if not invocation_deleted:
-                self.mod_log.ignore(Event.message_delete, message.id)
-                await message.delete()
-                invocation_deleted = True
-                continue
-
-            # If the message passes predicate, let's save it.
-            if predicate is None or predicate(message):
-                message_ids.append(message.id)
-                messages.append(message)
-
-        self.cleaning = False
+        self.mod_log.ignore(Event.message_delete, ctx.message.id)
+        await ctx.message.delete()
+
+        # Scan the history and delete matching messages in a single pass.
+        # We ignore the IDs right before deleting them, so we don't get mod-log spam.
+        engine = CleanEngine(
+            ctx.channel, predicate,
+            before_delete=lambda batch: self.mod_log.ignore(Event.message_delete, *(m.id for m in batch)),
+            is_cancelled=lambda: not self.cleaning
+        )
 
-        # We should ignore the ID's we stored, so we don't get mod-log spam.
-        self.mod_log.ignore(Event.message_delete, *message_ids)
+        try:
+            messages = await engine.run(limit=amount, before=ctx.message)
+        finally:
+            self.cleaning = False
 
-        # Use bulk delete to actually do the cleaning. It's far faster.
-        await ctx.channel.purge(
-            limit=amount,
-            check=predicate
-        )
+        log.debug(f"Clean in #{ctx.channel} finished: {engine.progress}")
 
         # Reverse the list to restore chronological order
         if messages:
@@ -177,7 +340,8 @@ class Clean:
 
         # Build the embed and send it
         message = (
-            f"**{len(message_ids)}** messages deleted in <#{ctx.channel.id}> by **{ctx.author.name}**\n\n"
+            f"**{engine.deleted}** messages deleted in <#{ctx.channel.id}> by **{ctx.author.name}** "
+            f"({engine.throughput:.1f} messages/s)\n\n"
             f"A log of the deleted messages can be found [here]({log_url})."
         )
 
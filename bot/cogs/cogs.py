@@ -36,6 +36,16 @@ class Cogs:
         # Allow reverse lookups by reversing the pairs
         self.cogs.update({v: k for k, v in self.cogs.items()})
 
+    def clear_help_cache(self):
+        """
+        Clears the help pages and query index cached by the Help cog, since the available commands have changed.
+        """
+
+        help_cog = self.bot.get_cog("Help")
+
+        if help_cog is not None:
+            help_cog.clear_cache()
+
     @group(name='cogs', aliases=('c',), invoke_without_command=True)
     @with_role(Roles.moderator, Roles.admin, Roles.owner, Roles.devops)
     async def cogs_group(self, ctx: Context):
@@ -90,6 +100,7 @@ class Cogs:
                     log.debug(f"{ctx.author} requested we load the '{cog}' cog. Cog loaded!")
                     embed.description = f"Cog loaded: {cog}"
                     embed.colour = Colour.green()
+                    self.clear_help_cache()
             else:
                 log.warning(f"{ctx.author} requested we load the '{cog}' cog, but the cog was already loaded!")
                 embed.description = f"Cog {cog} is already loaded"
@@ -142,6 +153,7 @@ class Cogs:
                     log.debug(f"{ctx.author} requested we unload the '{cog}' cog. Cog unloaded!")
                     embed.description = f"Cog unloaded: {cog}"
                     embed.colour = Colour.green()
+                    self.clear_help_cache()
             else:
                 log.warning(f"{ctx.author} requested we unload the '{cog}' cog, but the cog wasn't loaded!")
                 embed.description = f"Cog {cog} is not loaded"
@@ -232,6 +244,8 @@ class Cogs:
                 log.debug(f"{ctx.author} requested we reload all cogs. Here are the results: \n"
                           f"{lines}")
 
+                self.clear_help_cache()
+
                 return await LinePaginator.paginate(lines, ctx, embed, empty=False)
 
             elif full_cog in self.bot.extensions:
@@ -247,6 +261,7 @@ class Cogs:
                     log.debug(f"{ctx.author} requested we reload the '{cog}' cog. Cog reloaded!")
                     embed.description = f"Cog reload: {cog}"
                     embed.colour = Colour.green()
+                    self.clear_help_cache()
             else:
                 log.warning(f"{ctx.author} requested we reload the '{cog}' cog, but the cog wasn't loaded!")
                 embed.description = f"Cog {cog} is not loaded"
@@ -0,0 +1,64 @@
+import logging
+
+from discord import Colour, Embed
+from discord.ext.commands import Bot, Context, group
+
+from bot.cogs.antispam import validate_config as validate_anti_spam
+from bot.constants import Roles, compile_config, get_config, use_config
+from bot.decorators import with_role
+
+log = logging.getLogger(__name__)
+
+
+class Config:
+    """
+    Configuration management commands
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    @group(name='config', invoke_without_command=True)
+    @with_role(Roles.admin, Roles.owner, Roles.devops)
+    async def config_group(self, ctx: Context):
+        """Show when the configuration was loaded, or reload it."""
+
+        embed = Embed(colour=Colour.blurple())
+        embed.description = f"Configuration loaded at {get_config().loaded_at:%Y-%m-%d %H:%M:%S} UTC."
+
+        await ctx.send(embed=embed)
+
+    @config_group.command(name='reload', aliases=('r',))
+    @with_role(Roles.admin, Roles.owner, Roles.devops)
+    async def reload_command(self, ctx: Context):
+        """
+        Reload the configuration files, without restarting the bot.
+
+        The new configuration is only used once all of it loaded and compiled, otherwise the current
+        one stays in place. Values the cogs copied out of the configuration when they were loaded,
+        like most channel and role IDs, still need a restart or a reload of the cog.
+        """
+
+        embed = Embed()
+
+        try:
+            snapshot = compile_config()
+            validate_anti_spam(snapshot.anti_spam)
+        except Exception as e:
+            log.exception(f"{ctx.author} requested a configuration reload, but it failed.")
+
+            embed.colour = Colour.red()
+            embed.description = f"Failed to reload the configuration, the current one is still in use.\n\n```{e}```"
+        else:
+            use_config(snapshot)
+            log.info(f"{ctx.author} reloaded the configuration.")
+
+            embed.colour = Colour.green()
+            embed.description = "Configuration reloaded."
+
+        await ctx.send(embed=embed)
+
+
+def setup(bot: Bot):
+    bot.add_cog(Config(bot))
+    log.info("Cog loaded: Config")
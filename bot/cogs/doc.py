@@ -128,6 +128,10 @@ class Doc:
         self.inventories = {}
         self.headers = {"X-API-KEY": Keys.site_api}
 
+        # The cog is deferred until the bot is ready, so on_ready won't fire for it
+        if self.bot.is_ready():
+            self.bot.loop.create_task(self.refresh_inventory())
+
     async def on_ready(self):
         await self.refresh_inventory()
 
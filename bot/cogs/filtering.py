@@ -1,13 +1,13 @@
 import logging
 import re
 
-from discord import Colour, Member, Message
+from discord import Colour, Message
 from discord.ext.commands import Bot
 
 from bot.cogs.modlog import ModLog
 from bot.constants import (
     Channels, Colours, DEBUG_MODE,
-    Filter, Icons, URLs
+    Icons, URLs, get_config
 )
 
 log = logging.getLogger(__name__)
@@ -28,6 +28,12 @@ RETARDED_RE = r"(re+)tar+(d+|t+)(ed)?"
 SELF_DEPRECATION_RE = fr"((i'?m)|(i am)|(it'?s)|(it is)) (.+? )?{RETARDED_RE}"
 RETARDED_QUESTIONS_RE = fr"{RETARDED_RE} questions?"
 
+INVITE_PATTERN = re.compile(INVITE_RE, re.IGNORECASE)
+URL_PATTERN = re.compile(URL_RE, re.IGNORECASE)
+ZALGO_PATTERN = re.compile(ZALGO_RE)
+SELF_DEPRECATION_PATTERN = re.compile(SELF_DEPRECATION_RE, re.IGNORECASE)
+RETARDED_QUESTIONS_PATTERN = re.compile(RETARDED_QUESTIONS_RE, re.IGNORECASE)
+
 
 class Filtering:
     """
@@ -40,27 +46,22 @@ class Filtering:
 
         self.filters = {
             "filter_zalgo": {
-                "enabled": Filter.filter_zalgo,
                 "function": self._has_zalgo,
                 "type": "filter"
             },
             "filter_invites": {
-                "enabled": Filter.filter_invites,
                 "function": self._has_invites,
                 "type": "filter"
             },
             "filter_domains": {
-                "enabled": Filter.filter_domains,
                 "function": self._has_urls,
                 "type": "filter"
             },
             "watch_words": {
-                "enabled": Filter.watch_words,
                 "function": self._has_watchlist_words,
                 "type": "watchlist"
             },
             "watch_tokens": {
-                "enabled": Filter.watch_tokens,
                 "function": self._has_watchlist_tokens,
                 "type": "watchlist"
             },
@@ -84,16 +85,13 @@ class Filtering:
         accordingly.
         """
 
-        # Should we filter this message?
-        role_whitelisted = False
+        config = get_config().filter
 
-        if type(msg.author) is Member:  # Only Member has roles, not User.
-            for role in msg.author.roles:
-                if role.id in Filter.role_whitelist:
-                    role_whitelisted = True
+        # Should we filter this message? Only Member has roles, not User.
+        role_whitelisted = self.bot.role_cache.has_any(msg.author, config.role_whitelist)
 
         filter_message = (
-            msg.channel.id not in Filter.channel_whitelist  # Channel not in whitelist
+            msg.channel.id not in config.channel_whitelist  # Channel not in whitelist
             and not role_whitelisted                        # Role not in whitelist
             and not msg.author.bot                          # Author not a bot
         )
@@ -107,7 +105,7 @@ class Filtering:
             for filter_name, _filter in self.filters.items():
 
                 # Is this specific filter enabled in the config?
-                if _filter["enabled"]:
+                if filter_name in config.enabled:
                     triggered = await _filter["function"](msg.content)
 
                     if triggered:
@@ -129,7 +127,7 @@ class Filtering:
                             text=message,
                             thumbnail=msg.author.avatar_url_as(static_format="png"),
                             channel_id=Channels.mod_alerts,
-                            ping_everyone=Filter.ping_everyone,
+                            ping_everyone=config.ping_everyone,
                         )
 
                         # If this is a filter (not a watchlist), we should delete the message.
@@ -149,18 +147,18 @@ class Filtering:
         and after the expression.
         """
 
-        for expression in Filter.word_watchlist:
-            if re.search(fr"\b{expression}\b", text, re.IGNORECASE):
+        for expression, pattern in get_config().filter.word_watchlist:
+            if pattern.search(text):
 
                 # Special handling for `retarded`
                 if expression == RETARDED_RE:
 
                     # stuff like "I'm just retarded"
-                    if re.search(SELF_DEPRECATION_RE, text, re.IGNORECASE):
+                    if SELF_DEPRECATION_PATTERN.search(text):
                         return False
 
                     # stuff like "sorry for all the retarded questions"
-                    elif re.search(RETARDED_QUESTIONS_RE, text, re.IGNORECASE):
+                    elif RETARDED_QUESTIONS_PATTERN.search(text):
                         return False
 
                 return True
@@ -178,11 +176,11 @@ class Filtering:
         does not have boundaries before and after
         """
 
-        for expression in Filter.token_watchlist:
-            if re.search(fr"{expression}", text, re.IGNORECASE):
+        for pattern in get_config().filter.token_watchlist:
+            if pattern.search(text):
 
                 # Make sure it's not a URL
-                if not re.search(URL_RE, text, re.IGNORECASE):
+                if not URL_PATTERN.search(text):
                     return True
 
         return False
@@ -194,13 +192,13 @@ class Filtering:
         the blacklisted URLs from the config file.
         """
 
-        if not re.search(URL_RE, text, re.IGNORECASE):
+        if not URL_PATTERN.search(text):
             return False
 
         text = text.lower()
 
-        for url in Filter.domain_blacklist:
-            if url.lower() in text:
+        for url in get_config().filter.domain_blacklist:
+            if url in text:
                 return True
 
         return False
@@ -213,7 +211,7 @@ class Filtering:
         Zalgo range is \u0300 – \u036F and \u0489.
         """
 
-        return bool(re.search(ZALGO_RE, text))
+        return bool(ZALGO_PATTERN.search(text))
 
     async def _has_invites(self, text: str) -> bool:
         """
@@ -231,7 +229,7 @@ class Filtering:
         # discord\.gg/gdudes-pony-farm
         text = text.replace("\\", "")
 
-        invites = re.findall(INVITE_RE, text, re.IGNORECASE)
+        invites = INVITE_PATTERN.findall(text)
         for invite in invites:
 
             response = await self.bot.http_session.get(
@@ -240,7 +238,7 @@ class Filtering:
             response = await response.json()
             guild_id = int(response.get("guild", {}).get("id"))
 
-            if guild_id not in Filter.guild_invite_whitelist:
+            if guild_id not in get_config().filter.guild_invite_whitelist:
                 return True
         return False
 
@@ -1,18 +1,20 @@
 import asyncio
 import inspect
 import itertools
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from contextlib import suppress
 
 from discord import Colour, Embed, HTTPException
 from discord.ext import commands
-from fuzzywuzzy import fuzz, process
+from fuzzywuzzy import fuzz
+from fuzzywuzzy.utils import full_process
 
 from bot import constants
 from bot.pagination import (
     DELETE_EMOJI, FIRST_EMOJI, LAST_EMOJI,
     LEFT_EMOJI, LinePaginator, RIGHT_EMOJI,
 )
+from bot.utils.fuzzy import FuzzyIndex
 
 REACTIONS = {
     FIRST_EMOJI: 'first',
@@ -24,6 +26,8 @@ REACTIONS = {
 
 Cog = namedtuple('Cog', ['name', 'description', 'commands'])
 
+PAGE_CACHE_SIZE = 256
+
 
 class HelpQueryNotFound(ValueError):
     """
@@ -64,7 +68,8 @@ class HelpSession:
         Where the help message is to be sent to.
     """
 
-    def __init__(self, ctx, *command, cleanup=False, only_can_run=True, show_hidden=False, max_lines=15):
+    def __init__(self, ctx, *command, cleanup=False, only_can_run=True, show_hidden=False, max_lines=15,
+                 page_cache=None, query_index=None):
         """
         Creates an instance of the HelpSession class.
 
@@ -88,10 +93,17 @@ class HelpSession:
             Sets the max number of lines the paginator will add to a
             single page.
             Defaults to 20.
+        page_cache: Optional[:class:`HelpPageCache`]
+            A cache of pages built by previous sessions, which is
+            used and updated if given.
+        query_index: Optional[:class:`bot.utils.fuzzy.FuzzyIndex`]
+            An index of command and cog names used to suggest close
+            matches for unknown queries. It's rebuilt if it's stale.
         """
 
         self._ctx = ctx
         self._bot = ctx.bot
+        self._query_index = query_index
         self.title = "Command Help"
 
         # set the query details for the session
@@ -110,12 +122,13 @@ class HelpSession:
         self._only_can_run = only_can_run
         self._show_hidden = show_hidden
         self._max_lines = max_lines
+        self._page_cache = page_cache
 
         # init session states
         self._pages = None
         self._current_page = 0
         self.message = None
-        self._timeout_task = None
+        self._timeout_timer = None
         self.reset_timeout()
 
     def _get_query(self, query):
@@ -163,38 +176,49 @@ class HelpSession:
         HelpQueryNotFound
         """
 
-        # combine command and cog names
-        choices = list(self._bot.all_commands) + list(self._bot.cogs)
+        index = self._query_index
+
+        if index is None or index.stale:
+            # combine command and cog names
+            choices = list(self._bot.all_commands) + list(self._bot.cogs)
 
-        result = process.extractBests(query, choices, scorer=fuzz.ratio, score_cutoff=90)
+            if index is None:
+                index = FuzzyIndex(choices, processor=full_process)
+            else:
+                index.rebuild(choices)
+
+        result = index.search(query, scorer=fuzz.ratio, score_cutoff=90)
 
         raise HelpQueryNotFound(f'Query "{query}" not found.', dict(result))
 
-    async def timeout(self, seconds=30):
+    def timeout(self):
         """
-        Waits for a set number of seconds, then stops the help session.
+        Stops the help session once the timeout has passed.
 
-        Parameters
-        ----------
-        seconds: int
-            Number of seconds to wait.
+        This is called by the bot's shared timeout wheel.
         """
 
-        await asyncio.sleep(seconds)
-        await self.stop()
+        self._timeout_timer = None
+        self._bot.loop.create_task(self.stop())
 
-    def reset_timeout(self):
+    def reset_timeout(self, seconds=30):
         """
-        Cancels the original timeout task and sets it again from the start.
+        Cancels the original timeout and sets it again from the start.
+
+        Parameters
+        ----------
+        seconds: int
+            Number of seconds to wait before stopping the session.
         """
 
+        wheel = self._bot.reaction_router.wheel
+
         # cancel original if it exists
-        if self._timeout_task:
-            if not self._timeout_task.cancelled():
-                self._timeout_task.cancel()
+        if self._timeout_timer:
+            wheel.cancel(self._timeout_timer)
 
-        # recreate the timeout task
-        self._timeout_task = self._bot.loop.create_task(self.timeout())
+        # reschedule the timeout
+        self._timeout_timer = wheel.schedule(seconds, self.timeout)
 
     async def on_reaction_add(self, reaction, user):
         """
@@ -208,10 +232,6 @@ class HelpSession:
             The user who added the reaction.
         """
 
-        # ensure it was the relevant session message
-        if reaction.message.id != self.message.id:
-            return
-
         # ensure it was the session author who reacted
         if user.id != self.author.id:
             return
@@ -255,11 +275,13 @@ class HelpSession:
         await self.build_pages()
 
         # setup listeners
-        self._bot.add_listener(self.on_reaction_add)
         self._bot.add_listener(self.on_message_delete)
 
         # Send the help message
         await self.update_page()
+
+        # reactions are routed by message ID, so this has to wait until the message exists
+        self._bot.reaction_router.add_listener(self.message.id, self.on_reaction_add)
         self.add_reactions()
 
     def add_reactions(self):
@@ -342,16 +364,89 @@ class HelpSession:
 
         return f"{cmd.name} {' '.join(results)}"
 
+    def _cache_key(self):
+        """
+        Returns a key identifying everything the built pages depend on.
+
+        Besides the query and session options, this is the author's
+        effective permission set: whether they're a bot, their role IDs,
+        and the channel, since checks such as ``in_channel`` and
+        ``bot_has_permissions`` depend on it.
+
+        Returns
+        -------
+        tuple
+        """
+
+        if isinstance(self.query, commands.Command):
+            query = ('command', self.query.qualified_name)
+        elif isinstance(self.query, Cog):
+            query = ('cog', self.query.name)
+        else:
+            query = ('bot', None)
+
+        roles = self._bot.role_cache.role_ids(self.author)
+
+        return (
+            query, self._only_can_run, self._show_hidden, self._max_lines,
+            self.author.bot, roles, self._ctx.channel.id
+        )
+
+    async def _check_can_run(self, cmds):
+        """
+        Runs ``can_run`` for all the given commands concurrently.
+
+        A check raising an error counts as the command not being runnable.
+
+        Parameters
+        ----------
+        cmds: list[:class:`discord.ext.commands.Command`]
+            The commands to check.
+
+        Returns
+        -------
+        dict
+            The commands as keys, and whether they can be run as values.
+        """
+
+        results = await asyncio.gather(
+            *(command.can_run(self._ctx) for command in cmds),
+            return_exceptions=True
+        )
+
+        return {
+            command: result is True
+            for command, result in zip(cmds, results)
+        }
+
     async def build_pages(self):
         """
         Builds the list of content pages to be paginated through in the
-        help message.
+        help message, or reuses them from the page cache.
 
         Returns
         -------
         list[str]
         """
 
+        if self._page_cache is None:
+            await self._build_pages()
+            return
+
+        key = self._cache_key()
+        pages = self._page_cache.get(key)
+
+        if pages is None:
+            await self._build_pages()
+            self._page_cache.set(key, self._pages)
+        else:
+            self._pages = pages
+
+    async def _build_pages(self):
+        """
+        Builds the list of content pages from scratch.
+        """
+
         # Use LinePaginator to restrict embed line height
         paginator = LinePaginator(prefix='', suffix='', max_lines=self._max_lines)
 
@@ -408,6 +503,13 @@ class HelpSession:
                 cat_sort = sorted(filtered, key=self._category_key)
                 grouped = itertools.groupby(cat_sort, key=self._category_key)
 
+            # see which commands the user can run, all at once
+            grouped = [(category, list(cmds)) for category, cmds in grouped]
+            runnable = await self._check_can_run([
+                command for _, cmds in grouped for command in cmds
+                if self._show_hidden or not command.hidden
+            ])
+
             # process each category
             for category, cmds in grouped:
                 cmds = sorted(cmds, key=lambda c: c.name)
@@ -427,8 +529,7 @@ class HelpSession:
 
                     # see if the user can run the command
                     strikeout = ''
-                    can_run = await command.can_run(self._ctx)
-                    if not can_run:
+                    if not runnable[command]:
                         # skip if we don't show commands they can't run
                         if self._only_can_run:
                             continue
@@ -563,7 +664,13 @@ class HelpSession:
         delete the help message.
         """
 
-        self._bot.remove_listener(self.on_reaction_add)
+        if self._timeout_timer:
+            self._bot.reaction_router.wheel.cancel(self._timeout_timer)
+            self._timeout_timer = None
+
+        if self.message:
+            self._bot.reaction_router.remove_listener(self.message.id, self.on_reaction_add)
+
         self._bot.remove_listener(self.on_message_delete)
 
         # ignore if permission issue, or the message doesn't exist
@@ -637,10 +744,56 @@ class HelpSession:
         await self.message.delete()
 
 
+class HelpPageCache:
+    """
+    A least recently used cache of built help pages.
+
+    The keys are built by ``HelpSession._cache_key``.
+    """
+
+    def __init__(self, max_size=PAGE_CACHE_SIZE):
+        self.max_size = max_size
+        self._pages = OrderedDict()
+
+    def get(self, key):
+        pages = self._pages.get(key)
+
+        if pages is not None:
+            self._pages.move_to_end(key)
+
+        return pages
+
+    def set(self, key, pages):
+        self._pages[key] = pages
+        self._pages.move_to_end(key)
+
+        while len(self._pages) > self.max_size:
+            self._pages.popitem(last=False)
+
+    def clear(self):
+        self._pages.clear()
+
+
 class Help:
     """
     Custom Embed Pagination Help feature
     """
+
+    def __init__(self):
+        self.page_cache = HelpPageCache()
+        self.query_index = FuzzyIndex(processor=full_process)
+        self.query_index.invalidate()
+
+    def clear_cache(self):
+        """
+        Clears the cached help pages and marks the query index as stale.
+
+        This should be called whenever commands or cogs are added or removed.
+        """
+
+        self.page_cache.clear()
+        self.query_index.invalidate()
+
     @commands.command('help')
     async def new_help(self, ctx, *commands):
         """
@@ -648,7 +801,9 @@ class Help:
         """
 
         try:
-            await HelpSession.start(ctx, *commands)
+            await HelpSession.start(
+                ctx, *commands, page_cache=self.page_cache, query_index=self.query_index
+            )
         except HelpQueryNotFound as error:
             embed = Embed()
             embed.colour = Colour.red()
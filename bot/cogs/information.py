@@ -1,9 +1,16 @@
 import logging
 import textwrap
-
-from discord import CategoryChannel, Colour, Embed, Member, TextChannel, VoiceChannel
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Optional
+
+from aiohttp import ClientError
+from discord import CategoryChannel, Colour, Embed, Guild, Member, TextChannel, VoiceChannel
+from discord.abc import GuildChannel
 from discord.ext.commands import Bot, Context, command
 
+from bot.cogs.moderation import InfractionFetchError, Moderation
 from bot.constants import Emojis, Keys, Roles, URLs
 from bot.decorators import with_role
 from bot.utils.time import time_since
@@ -12,6 +19,83 @@ log = logging.getLogger(__name__)
 
 MODERATION_ROLES = Roles.owner, Roles.admin, Roles.moderator
 
+CHANNEL_TYPES = {
+    TextChannel: "text",
+    CategoryChannel: "category",
+    VoiceChannel: "voice",
+}
+
+JOIN_RATE_WINDOW = 60 * 60  # Seconds of member joins to keep track of
+
+
+class GuildCounters:
+    """
+    Presence and channel-type counts for a single guild.
+
+    The counts are built once, and then kept up to date from gateway events,
+    so reading them doesn't need to walk the member or channel lists.
+    """
+
+    def __init__(self):
+        self.statuses = Counter()
+        self.channels = Counter()
+        self.joins = deque()
+
+    def build(self, guild: Guild):
+        """
+        Counts every member status and channel type in the guild, and the members who joined recently.
+
+        This is a single pass without yielding to the event loop, so no gateway event
+        can arrive halfway through and be missed by the counts.
+        """
+
+        self.statuses = Counter(str(member.status) for member in guild.members)
+        self.channels = Counter(CHANNEL_TYPES.get(type(channel)) for channel in guild.channels)
+
+        # Joins are tracked on the monotonic clock, so convert the join dates over to it
+        now, monotonic_now = datetime.utcnow(), time.monotonic()
+        ages = (
+            (now - member.joined_at).total_seconds()
+            for member in guild.members if member.joined_at is not None
+        )
+        self.joins = deque(sorted(monotonic_now - age for age in ages if age < JOIN_RATE_WINDOW))
+
+    def update_status(self, before: Member, after: Member):
+        before_status, after_status = str(before.status), str(after.status)
+
+        if before_status != after_status:
+            self.statuses[before_status] -= 1
+            self.statuses[after_status] += 1
+
+    def add_member(self, member: Member):
+        self.statuses[str(member.status)] += 1
+        self.joins.append(time.monotonic())
+        self._prune_joins()
+
+    def remove_member(self, member: Member):
+        self.statuses[str(member.status)] -= 1
+
+    def add_channel(self, channel: GuildChannel):
+        self.channels[CHANNEL_TYPES.get(type(channel))] += 1
+
+    def remove_channel(self, channel: GuildChannel):
+        self.channels[CHANNEL_TYPES.get(type(channel))] -= 1
+
+    @property
+    def recent_joins(self) -> int:
+        """
+        The number of members that joined within the last `JOIN_RATE_WINDOW` seconds.
+        """
+
+        self._prune_joins()
+        return len(self.joins)
+
+    def _prune_joins(self):
+        cutoff = time.monotonic() - JOIN_RATE_WINDOW
+
+        while self.joins and self.joins[0] < cutoff:
+            self.joins.popleft()
+
 
 class Information:
     """
@@ -23,6 +107,64 @@ class Information:
     def __init__(self, bot: Bot):
         self.bot = bot
         self.headers = {"X-API-Key": Keys.site_api}
+        self.counters = {}  # { guild_id: GuildCounters }
+
+        # If the cog is (re)loaded after the bot is ready, on_ready won't fire again
+        if self.bot.is_ready():
+            self.build_counters()
+
+    @property
+    def moderation(self) -> Optional[Moderation]:
+        return self.bot.get_cog("Moderation")
+
+    def build_counters(self):
+        """
+        Builds the presence and channel counters for every guild the bot is in.
+        """
+
+        for guild in self.bot.guilds:
+            self.build_guild_counters(guild)
+
+    def build_guild_counters(self, guild: Guild):
+        counters = GuildCounters()
+        counters.build(guild)
+        self.counters[guild.id] = counters
+
+        log.debug(f"Built presence and channel counters for {guild} ({guild.member_count} members)")
+
+    async def on_ready(self):
+        self.build_counters()
+
+    async def on_guild_available(self, guild: Guild):
+        self.build_guild_counters(guild)
+
+    async def on_guild_remove(self, guild: Guild):
+        self.counters.pop(guild.id, None)
+
+    async def on_member_update(self, before: Member, after: Member):
+        counters = self.counters.get(after.guild.id)
+        if counters is not None:
+            counters.update_status(before, after)
+
+    async def on_member_join(self, member: Member):
+        counters = self.counters.get(member.guild.id)
+        if counters is not None:
+            counters.add_member(member)
+
+    async def on_member_remove(self, member: Member):
+        counters = self.counters.get(member.guild.id)
+        if counters is not None:
+            counters.remove_member(member)
+
+    async def on_guild_channel_create(self, channel: GuildChannel):
+        counters = self.counters.get(channel.guild.id)
+        if counters is not None:
+            counters.add_channel(channel)
+
+    async def on_guild_channel_delete(self, channel: GuildChannel):
+        counters = self.counters.get(channel.guild.id)
+        if counters is not None:
+            counters.remove_channel(channel)
 
     @with_role(*MODERATION_ROLES)
     @command(name="roles")
@@ -63,36 +205,25 @@ class Information:
         features = ", ".join(ctx.guild.features)
         region = ctx.guild.region
 
+        # The counters are normally built on ready, but make sure they exist
+        if ctx.guild.id not in self.counters:
+            self.build_guild_counters(ctx.guild)
+
+        counters = self.counters[ctx.guild.id]
+
         # How many of each type of channel?
         roles = len(ctx.guild.roles)
-        channels = ctx.guild.channels
-        text_channels = 0
-        category_channels = 0
-        voice_channels = 0
-        for channel in channels:
-            if type(channel) == TextChannel:
-                text_channels += 1
-            elif type(channel) == CategoryChannel:
-                category_channels += 1
-            elif type(channel) == VoiceChannel:
-                voice_channels += 1
+        text_channels = counters.channels["text"]
+        category_channels = counters.channels["category"]
+        voice_channels = counters.channels["voice"]
 
         # How many of each user status?
         member_count = ctx.guild.member_count
-        members = ctx.guild.members
-        online = 0
-        dnd = 0
-        idle = 0
-        offline = 0
-        for member in members:
-            if str(member.status) == "online":
-                online += 1
-            elif str(member.status) == "offline":
-                offline += 1
-            elif str(member.status) == "idle":
-                idle += 1
-            elif str(member.status) == "dnd":
-                dnd += 1
+        online = counters.statuses["online"]
+        dnd = counters.statuses["dnd"]
+        idle = counters.statuses["idle"]
+        offline = counters.statuses["offline"]
+        recent_joins = counters.recent_joins
 
         embed = Embed(
             colour=Colour.blurple(),
@@ -104,6 +235,7 @@ class Information:
 
                 **Counts**
                 Members: {member_count}
+                Joined in the last hour: {recent_joins}
                 Roles: {roles}
                 Text: {text_channels}
                 Voice: {voice_channels}
@@ -149,24 +281,35 @@ class Information:
             role.mention for role in user.roles if role.name != "@everyone"
         )
 
-        # Infractions
-        api_response = await self.bot.http_session.get(
-            url=URLs.site_infractions_user.format(user_id=user.id),
-            params={"hidden": hidden},
-            headers=self.headers
-        )
-
-        infractions = await api_response.json()
-
-        infr_total = 0
-        infr_active = 0
-
-        # At least it's readable.
-        for infr in infractions:
-            if infr["active"]:
-                infr_active += 1
-
-            infr_total += 1
+        # Infractions, from the moderation cog's cache if it's loaded
+        moderation = self.moderation
+
+        if moderation is not None:
+            try:
+                summary = await moderation.infraction_cache.summary(user.id, hidden=hidden == "True")
+            except (ClientError, InfractionFetchError):
+                log.exception(f"Failed to fetch the infractions of {user} ({user.id}) for their user info.")
+                infr_total = infr_active = "unavailable"
+            else:
+                infr_total, infr_active = summary.total, summary.active
+        else:
+            api_response = await self.bot.http_session.get(
+                url=URLs.site_infractions_user.format(user_id=user.id),
+                params={"hidden": hidden},
+                headers=self.headers
+            )
+
+            infractions = await api_response.json()
+
+            infr_total = 0
+            infr_active = 0
+
+            # At least it's readable.
+            for infr in infractions:
+                if infr["active"]:
+                    infr_active += 1
+
+                infr_total += 1
 
         # Let's build the embed now
         embed = Embed(
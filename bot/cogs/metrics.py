@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import time
+from functools import wraps
+from typing import Tuple
+
+from discord import Colour, Embed, HTTPException
+from discord.ext.commands import Bot, CommandError, Context, command
+
+from bot.constants import Metrics as MetricsConfig, Roles
+from bot.decorators import with_role
+from bot.pagination import LinePaginator
+from bot.utils.metrics import Counter, Histogram, MetricsRegistry, MetricsServer
+
+log = logging.getLogger(__name__)
+
+STAFF_ROLES = (Roles.owner, Roles.admin, Roles.moderator, Roles.helpers)
+
+# The number of rows listed per section by the metrics command
+SUMMARY_ROWS = 10
+
+
+def _ms(seconds: float) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+class Metrics:
+    """
+    Records command, event handler and API metrics, and serves them to Prometheus.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.registry: MetricsRegistry = bot.metrics
+
+        self.commands_total = self.registry.counter(
+            "bot_commands_total", "Command invocations, by their outcome.", ("command", "status")
+        )
+        self.command_duration = self.registry.histogram(
+            "bot_command_duration_seconds", "Time taken by command invocations.", ("command",)
+        )
+        self.event_errors = self.registry.counter(
+            "bot_event_handler_errors_total", "Event handlers which raised an exception.", ("event", "handler")
+        )
+        self.event_duration = self.registry.histogram(
+            "bot_event_handler_duration_seconds", "Time taken by event handlers.", ("event", "handler")
+        )
+        self.discord_requests = self.registry.counter(
+            "bot_discord_api_requests_total", "Requests made to the Discord API.", ("method", "route", "status")
+        )
+        self.discord_duration = self.registry.histogram(
+            "bot_discord_api_request_duration_seconds", "Time taken by Discord API requests, including rate limits.",
+            ("method", "route")
+        )
+
+        # Every event handler, including those of cogs, is run through `_run_event`.
+        # Neither of these are public, so they're only wrapped if discord.py still has them.
+        self._original_run_event = self._patch(bot, "_run_event", self._run_event)
+        self._original_request = self._patch(bot.http, "request", self._discord_request)
+
+        self.server = MetricsServer(self.registry, MetricsConfig.host, MetricsConfig.port)
+        bot.loop.create_task(self.server.start())
+
+    def __unload(self):
+        if self._original_run_event is not None:
+            self.bot._run_event = self._original_run_event
+
+        if self._original_request is not None:
+            self.bot.http.request = self._original_request
+
+        self.server.stop()
+
+    @staticmethod
+    def _patch(target, name: str, replacement):
+        """
+        Replaces a method of the target, and returns the original, or `None` if the target doesn't have it.
+        """
+
+        original = getattr(target, name, None)
+
+        if not callable(original):
+            log.warning(f"{type(target).__name__} has no `{name}` method, so it won't be instrumented")
+            return None
+
+        setattr(target, name, replacement)
+        return original
+
+    async def _run_event(self, coro, event_name: str, *args, **kwargs):
+        handler = getattr(coro, "__qualname__", event_name)
+
+        @wraps(coro)
+        async def timed(*handler_args, **handler_kwargs):
+            start = time.perf_counter()
+
+            try:
+                await coro(*handler_args, **handler_kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.event_errors.inc(event_name, handler)
+                raise
+            finally:
+                self.event_duration.observe(time.perf_counter() - start, event_name, handler)
+
+        # The original takes care of the error handling, so failing handlers are still reported as usual
+        await self._original_run_event(timed, event_name, *args, **kwargs)
+
+    async def _discord_request(self, route, **kwargs):
+        status = "ok"
+        start = time.perf_counter()
+
+        try:
+            return await self._original_request(route, **kwargs)
+        except HTTPException as e:
+            status = str(e.status)
+            raise
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self.discord_duration.observe(time.perf_counter() - start, route.method, route.path)
+            self.discord_requests.inc(route.method, route.path, status)
+
+    async def on_command(self, ctx: Context):
+        ctx.metrics_started_at = time.perf_counter()
+
+    async def on_command_completion(self, ctx: Context):
+        self._record_command(ctx, "ok")
+
+    async def on_command_error(self, ctx: Context, e: CommandError):
+        # Unknown commands are never invoked, so there's nothing to record
+        if ctx.command is None:
+            return
+
+        self._record_command(ctx, type(e).__name__)
+
+    def _record_command(self, ctx: Context, status: str):
+        name = ctx.command.qualified_name
+        self.commands_total.inc(name, status)
+
+        started_at = getattr(ctx, "metrics_started_at", None)
+
+        if started_at is not None:
+            self.command_duration.observe(time.perf_counter() - started_at, name)
+
+    @staticmethod
+    def _error_count(counter: Counter, labels: Tuple[str, ...]) -> float:
+        """
+        Sums the failures recorded by a counter for the given series of a histogram.
+
+        The counter's labels have to start with the histogram's, optionally followed by a status.
+        """
+
+        total = 0
+
+        for key in counter.labels():
+            if key[:len(labels)] != labels:
+                continue
+
+            status = key[len(labels):]
+
+            if not status or status[0] != "ok" and not status[0].startswith(("2", "3")):
+                total += counter.value(*key)
+
+        return total
+
+    def _slowest(self, histogram: Histogram, errors: Counter):
+        """
+        Yields a summary line for each of the series of a histogram with the highest 95th percentile.
+        """
+
+        series = sorted(histogram.labels(), key=lambda labels: histogram.quantile(0.95, *labels), reverse=True)
+
+        for labels in series[:SUMMARY_ROWS]:
+            yield (
+                f"`{' '.join(labels)}` — {histogram.count(*labels)} calls, "
+                f"{self._error_count(errors, labels):.0f} failed, "
+                f"p50 {_ms(histogram.quantile(0.5, *labels))}, p95 {_ms(histogram.quantile(0.95, *labels))}"
+            )
+
+    def _loop_lines(self):
+        monitor = self.bot.loop_monitor
+        percentiles = monitor.percentiles()
+
+        if not percentiles:
+            return
+
+        yield "**Event loop**"
+        yield "Lag " + ", ".join(f"p{q * 100:g} {_ms(lag)}" for q, lag in percentiles.items())
+
+        counter = monitor.slow_callbacks
+
+        for labels in sorted(counter.labels(), key=lambda labels: counter.value(*labels), reverse=True)[:SUMMARY_ROWS]:
+            yield f"`{labels[1]}` blocked the loop {counter.value(*labels):.0f} times"
+
+        yield ""
+
+    def _summary_lines(self):
+        yield from self._loop_lines()
+
+        sections = (
+            ("Commands", "bot_command_duration_seconds", "bot_commands_total"),
+            ("Event handlers", "bot_event_handler_duration_seconds", "bot_event_handler_errors_total"),
+            ("Discord API", "bot_discord_api_request_duration_seconds", "bot_discord_api_requests_total"),
+            ("Outbound HTTP", "bot_http_request_duration_seconds", "bot_http_requests_total"),
+        )
+
+        for title, histogram_name, counter_name in sections:
+            histogram = self.registry.get(histogram_name)
+
+            if histogram is None or not histogram.labels():
+                continue
+
+            yield f"**{title}**"
+            yield from self._slowest(histogram, self.registry.get(counter_name))
+            yield ""
+
+    @command(name="metrics")
+    @with_role(*STAFF_ROLES)
+    async def metrics_command(self, ctx: Context):
+        """
+        Shows the event loop lag and the slowest commands, event handlers and API endpoints since the bot started.
+
+        The full set of metrics is available to Prometheus from the metrics endpoint.
+        """
+
+        embed = Embed(colour=Colour.blurple())
+        embed.set_author(name="Bot metrics")
+
+        await LinePaginator.paginate(
+            self._summary_lines(), ctx, embed,
+            max_lines=15, empty=False,
+            footer_text=f"Prometheus endpoint: {MetricsConfig.host}:{MetricsConfig.port}/metrics"
+        )
+
+
+def setup(bot):
+    bot.add_cog(Metrics(bot))
+    log.info("Cog loaded: Metrics")
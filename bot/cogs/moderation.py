@@ -1,7 +1,9 @@
 import asyncio
 import logging
 import textwrap
-from typing import Union
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional, Union
 
 from aiohttp import ClientError
 from discord import (
@@ -29,6 +31,16 @@ INFRACTION_ICONS = {
     "Ban": Icons.user_ban
 }
 
+INFRACTION_CACHE_TTL = 5 * 60  # Seconds before a user's cached infractions are fetched again
+
+InfractionSummary = namedtuple('InfractionSummary', ['total', 'active'])
+
+
+class InfractionFetchError(Exception):
+    """
+    Raised when the site doesn't return a user's infractions, with the site's error message if it sent one.
+    """
+
 
 def proxy_user(user_id: str) -> Object:
     try:
@@ -41,6 +53,116 @@ def proxy_user(user_id: str) -> Object:
     return user
 
 
+class InfractionCache:
+    """
+    A per-user cache of infractions fetched from the site.
+
+    Every user's infractions are fetched once (including hidden ones) and reused until they expire, or until
+    the user is invalidated after an infraction was added or changed. Concurrent lookups for the same user
+    share a single request.
+    """
+
+    def __init__(self, bot: Bot, headers: dict, ttl: float = INFRACTION_CACHE_TTL):
+        self.bot = bot
+        self.headers = headers
+        self.ttl = ttl
+
+        self._cache: Dict[int, tuple] = {}  # { user_id: (fetched_at, infractions) }
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    def invalidate(self, user_id: int):
+        """
+        Drops the cached infractions for a user, so the next lookup fetches them from the site.
+        """
+
+        self._cache.pop(user_id, None)
+
+        # A request that was already in flight may not include the change
+        self._pending.pop(user_id, None)
+
+    async def get(self, user_id: int, hidden: bool = True) -> List[dict]:
+        """
+        Returns the infractions for a user, fetching them from the site if they aren't cached.
+
+        :param user_id: the ID of the user to get the infractions of
+        :param hidden: whether to include hidden (shadow) infractions
+        """
+
+        cached = self._cache.get(user_id)
+
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            infractions = cached[1]
+        else:
+            infractions = await self._fetch(user_id)
+
+        if hidden:
+            return infractions
+
+        return [infraction for infraction in infractions if infraction.get("hidden", False) is not True]
+
+    async def summary(self, user_id: int, hidden: bool = True) -> InfractionSummary:
+        """
+        Returns the total and active infraction counts for a user.
+        """
+
+        infractions = await self.get(user_id, hidden=hidden)
+        active = sum(1 for infraction in infractions if infraction["active"])
+
+        return InfractionSummary(total=len(infractions), active=active)
+
+    async def get_current(self, user_id: int, infraction_type: str) -> Optional[dict]:
+        """
+        Returns the active infraction of the given type for a user, or None if there isn't one.
+        """
+
+        for infraction in reversed(await self.get(user_id)):
+            if infraction["active"] and infraction["type"] == infraction_type:
+                return infraction
+
+        return None
+
+    async def _fetch(self, user_id: int) -> List[dict]:
+        future = self._pending.get(user_id)
+
+        if future is None:
+            future = asyncio.ensure_future(self._request(user_id))
+            self._pending[user_id] = future
+
+        try:
+            infractions = await asyncio.shield(future)
+        except Exception:
+            if self._pending.get(user_id) is future:
+                del self._pending[user_id]
+            raise
+
+        # Only cache the result if the user wasn't invalidated while the request was in flight
+        if self._pending.get(user_id) is future:
+            del self._pending[user_id]
+            self._cache[user_id] = (time.monotonic(), infractions)
+
+        return infractions
+
+    async def _request(self, user_id: int) -> List[dict]:
+        response = await self.bot.http_session.get(
+            URLs.site_infractions_user.format(
+                user_id=user_id
+            ),
+            params={"hidden": "True"},
+            headers=self.headers
+        )
+
+        result = await response.json()
+
+        # Errors are raised rather than returned, so they're never cached
+        if response.status != 200 or not isinstance(result, list):
+            if isinstance(result, dict) and "error_message" in result:
+                raise InfractionFetchError(result["error_message"])
+
+            raise InfractionFetchError(f"The site responded with status {response.status}.")
+
+        return result
+
+
 class Moderation(Scheduler):
     """
     Rowboat replacement moderation tools.
@@ -50,6 +172,7 @@ class Moderation(Scheduler):
         self.bot = bot
         self.headers = {"X-API-KEY": Keys.site_api}
         self._muted_role = Object(constants.Roles.muted)
+        self.infraction_cache = InfractionCache(bot, self.headers)
         super().__init__()
 
     @property
@@ -97,6 +220,7 @@ class Moderation(Scheduler):
                     "actor_id": str(ctx.message.author.id)
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -140,6 +264,7 @@ class Moderation(Scheduler):
                     "actor_id": str(ctx.message.author.id)
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -200,6 +325,7 @@ class Moderation(Scheduler):
                     "actor_id": str(ctx.message.author.id)
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -261,6 +387,7 @@ class Moderation(Scheduler):
                     "actor_id": str(ctx.message.author.id)
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -327,6 +454,7 @@ class Moderation(Scheduler):
                     "actor_id": str(ctx.message.author.id)
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -397,6 +525,7 @@ class Moderation(Scheduler):
                     "actor_id": str(ctx.message.author.id)
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -464,6 +593,7 @@ class Moderation(Scheduler):
                     "hidden": True
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -502,6 +632,7 @@ class Moderation(Scheduler):
                     "hidden": True
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -556,6 +687,7 @@ class Moderation(Scheduler):
                     "hidden": True
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -611,6 +743,7 @@ class Moderation(Scheduler):
                     "hidden": True
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -671,6 +804,7 @@ class Moderation(Scheduler):
                     "hidden": True
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -737,6 +871,7 @@ class Moderation(Scheduler):
                     "hidden": True
                 }
             )
+            self.infraction_cache.invalidate(user.id)
         except ClientError:
             log.exception("There was an error adding an infraction.")
             await ctx.send(":x: There was an error adding the infraction.")
@@ -793,19 +928,12 @@ class Moderation(Scheduler):
 
         try:
             # check the current active infraction
-            response = await self.bot.http_session.get(
-                URLs.site_infractions_user_type_current.format(
-                    user_id=user.id,
-                    infraction_type="mute"
-                ),
-                headers=self.headers
-            )
-            response_object = await response.json()
-            if "error_code" in response_object:
-                await ctx.send(f":x: There was an error removing the infraction: {response_object['error_message']}")
+            try:
+                infraction_object = await self.infraction_cache.get_current(user.id, "mute")
+            except InfractionFetchError as e:
+                await ctx.send(f":x: There was an error removing the infraction: {e}")
                 return
 
-            infraction_object = response_object["infraction"]
             if infraction_object is None:
                 # no active infraction
                 await ctx.send(f":x: There is no active mute infraction for user {user.mention}.")
@@ -851,19 +979,12 @@ class Moderation(Scheduler):
 
         try:
             # check the current active infraction
-            response = await self.bot.http_session.get(
-                URLs.site_infractions_user_type_current.format(
-                    user_id=user.id,
-                    infraction_type="ban"
-                ),
-                headers=self.headers
-            )
-            response_object = await response.json()
-            if "error_code" in response_object:
-                await ctx.send(f":x: There was an error removing the infraction: {response_object['error_message']}")
+            try:
+                infraction_object = await self.infraction_cache.get_current(user.id, "ban")
+            except InfractionFetchError as e:
+                await ctx.send(f":x: There was an error removing the infraction: {e}")
                 return
 
-            infraction_object = response_object["infraction"]
             if infraction_object is None:
                 # no active infraction
                 await ctx.send(f":x: There is no active ban infraction for user {user.mention}.")
@@ -946,6 +1067,8 @@ class Moderation(Scheduler):
                 return
 
             infraction_object = response_object["infraction"]
+            self.infraction_cache.invalidate(int(infraction_object["user"]["user_id"]))
+
             # Re-schedule
             self.cancel_task(infraction_id)
             loop = asyncio.get_event_loop()
@@ -1024,6 +1147,7 @@ class Moderation(Scheduler):
                 await ctx.send(f":x: There was an error updating the infraction: {response_object['error_message']}")
                 return
 
+            self.infraction_cache.invalidate(int(response_object["infraction"]["user"]["user_id"]))
             await ctx.send(f":ok_hand: Updated infraction: set reason to \"{reason}\".")
         except Exception:
             log.exception("There was an error updating an infraction.")
@@ -1086,15 +1210,8 @@ class Moderation(Scheduler):
         """
 
         try:
-            response = await self.bot.http_session.get(
-                URLs.site_infractions_user.format(
-                    user_id=user.id
-                ),
-                params={"hidden": "True"},
-                headers=self.headers
-            )
-            infraction_list = await response.json()
-        except ClientError:
+            infraction_list = await self.infraction_cache.get(user.id)
+        except (ClientError, InfractionFetchError):
             log.exception(f"Failed to fetch infractions for user {user} ({user.id}).")
             await ctx.send(":x: An error occurred while fetching infractions.")
             return
@@ -1248,6 +1365,7 @@ class Moderation(Scheduler):
                 "active": False
             }
         )
+        self.infraction_cache.invalidate(user_id)
 
     def _infraction_to_string(self, infraction_object):
         actor_id = int(infraction_object["actor"]["user_id"])
@@ -1,9 +1,12 @@
 import asyncio
 import datetime
+import itertools
+import json
 import logging
-from typing import List, Optional, Union
+import zlib
+from typing import Iterable, Iterator, List, Optional, Union
 
-from aiohttp import ClientResponseError
+from aiohttp import ClientResponseError, streamer
 from dateutil.relativedelta import relativedelta
 from deepdiff import DeepDiff
 from discord import (
@@ -14,7 +17,7 @@ from discord import (
 from discord.abc import GuildChannel
 from discord.ext.commands import Bot
 
-from bot.constants import Channels, Colours, Emojis, Event, Icons, Keys, Roles, URLs
+from bot.constants import Channels, Colours, Emojis, Event, Icons, Keys, ModLog as ModLogConfig, Roles, URLs
 from bot.constants import Guild as GuildConstant
 from bot.utils.time import humanize_delta
 
@@ -27,6 +30,22 @@ CHANNEL_CHANGES_SUPPRESSED = ("_overwrites", "position")
 MEMBER_CHANGES_SUPPRESSED = ("activity", "status")
 ROLE_CHANGES_UNSUPPORTED = ("colour", "permissions")
 
+LOG_PART_SIZE = 1000  # Maximum number of messages uploaded in a single request, with `multipart_uploads`
+
+
+@streamer
+async def _write_log_part(writer, chunks: Iterator[bytes], compress: bool):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None  # Add a gzip header and trailer
+
+    for chunk in chunks:
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+
+        await writer.write(chunk)
+
+    if compressor is not None:
+        await writer.write(compressor.flush())
+
 
 class ModLog:
     """
@@ -41,59 +60,122 @@ class ModLog:
         self._cached_deletes = []
         self._cached_edits = []
 
-    async def upload_log(self, messages: List[Message]) -> Optional[str]:
+    async def upload_log(self, messages: Iterable[Message]) -> Optional[str]:
         """
         Uploads the log data to the database via
         an API endpoint for uploading logs.
 
         Used in several mod log embeds.
 
-        Returns a URL that can be used to view the log.
+        Messages are serialized and streamed into the request body one at a time. With `gzip_uploads` enabled
+        the body is gzip-compressed. With `multipart_uploads` enabled, logs longer than `LOG_PART_SIZE`
+        messages are uploaded in several parts: the first part creates the log, and every following
+        part is sent with the returned `log_id` so the site appends it to the same log.
+
+        Returns a URL that can be used to view the log. If a later part fails to upload,
+        the URL of the incomplete log is returned.
         """
 
-        log_data = []
+        messages = iter(messages)
+        part_size = LOG_PART_SIZE if ModLogConfig.multipart_uploads else None
+        headers = {**self.headers, "Content-Type": "application/json"}
+        log_id = None
 
-        for message in messages:
-            author = f"{message.author.name}#{message.author.discriminator}"
+        if ModLogConfig.gzip_uploads:
+            headers["Content-Encoding"] = "gzip"
 
-            # message.author may return either a User or a Member. Users don't have roles.
-            if type(message.author) is User:
-                role_id = Roles.developer
+        while True:
+            if part_size is None:
+                part = messages
             else:
-                role_id = message.author.top_role.id
-
-            content = message.content
-            embeds = [embed.to_dict() for embed in message.embeds]
-            attachments = ["<Attachment>" for _ in message.attachments]
-
-            log_data.append({
-                "content": content,
-                "author": author,
-                "user_id": str(message.author.id),
-                "role_id": str(role_id),
-                "timestamp": message.created_at.strftime("%D %H:%M"),
-                "attachments": attachments,
-                "embeds": embeds,
-            })
-
-        response = await self.bot.http_session.post(
-            URLs.site_logs_api,
-            headers=self.headers,
-            json={"log_data": log_data}
-        )
+                part = list(itertools.islice(messages, part_size))
 
-        try:
-            data = await response.json()
-            log_id = data["log_id"]
-        except (KeyError, ClientResponseError):
-            log.debug(
-                "API returned an unexpected result:\n"
-                f"{response.text}"
+                # Always upload the first part, even if it's empty, so there's a log to link to
+                if not part and log_id is not None:
+                    break
+
+            response = await self.bot.http_session.post(
+                URLs.site_logs_api,
+                headers=headers,
+                data=self._encode_log_part(part, log_id)
             )
-            return
+
+            try:
+                data = await response.json()
+                log_id = data["log_id"]
+            except (KeyError, ClientResponseError):
+                log.debug(
+                    "API returned an unexpected result:\n"
+                    f"{response.text}"
+                )
+
+                if log_id is None:
+                    return
+
+                log.warning(f"Failed to upload part of log {log_id}, the uploaded log is incomplete.")
+                break
+
+            if part_size is None or len(part) < part_size:
+                break
 
         return f"{URLs.site_logs_view}/{log_id}"
 
+    @staticmethod
+    def _serialize_message(message: Message) -> dict:
+        """
+        Converts a message into an entry of the `log_data` payload.
+        """
+
+        author = f"{message.author.name}#{message.author.discriminator}"
+
+        # message.author may return either a User or a Member. Users don't have roles.
+        if type(message.author) is User:
+            role_id = Roles.developer
+        else:
+            role_id = message.author.top_role.id
+
+        return {
+            "content": message.content,
+            "author": author,
+            "user_id": str(message.author.id),
+            "role_id": str(role_id),
+            "timestamp": message.created_at.strftime("%D %H:%M"),
+            "attachments": ["<Attachment>" for _ in message.attachments],
+            "embeds": [embed.to_dict() for embed in message.embeds],
+        }
+
+    def _serialize_log_part(self, messages: Iterable[Message], log_id: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Serializes part of a log to JSON, one message at a time.
+
+        If `log_id` is given, the part is appended to that existing log.
+        """
+
+        yield b'{"log_data": ['
+
+        for index, message in enumerate(messages):
+            entry = json.dumps(self._serialize_message(message))
+
+            if index:
+                entry = ", " + entry
+
+            yield entry.encode("utf-8")
+
+        yield b"]"
+
+        if log_id is not None:
+            yield f', "log_id": {json.dumps(log_id)}'.encode("utf-8")
+
+        yield b"}"
+
+    def _encode_log_part(self, messages: Iterable[Message], log_id: Optional[str] = None):
+        """
+        Builds the request body of part of a log, which is serialized while it's being sent,
+        gzip-compressed if `gzip_uploads` is enabled.
+        """
+
+        return _write_log_part(self._serialize_log_part(messages, log_id), ModLogConfig.gzip_uploads)
+
     def ignore(self, event: Event, *items: int):
         for item in items:
             if item not in self._ignored[event]:
@@ -3,7 +3,9 @@ import logging
 import random
 import textwrap
 from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
 
+from aiohttp import ClientError
 from discord import Colour, Embed, TextChannel
 from discord.ext.commands import Bot, Context, group
 
@@ -14,6 +16,63 @@ from bot.pagination import LinePaginator
 
 log = logging.getLogger(__name__)
 
+# How much longer a subreddit's polling interval gets every time it hasn't changed
+INTERVAL_GROWTH = 1.25
+
+# The longest we'll wait after Reddit turned down a request
+MAX_BACKOFF = 3600
+
+
+class _SubredditState:
+    """
+    What we know about a subreddit between polls: the validators for conditional requests,
+    the newest post we've seen, and how long to wait before polling it again.
+    """
+
+    __slots__ = ("etag", "last_modified", "last_id", "interval", "backoff")
+
+    def __init__(self, interval: float):
+        self.etag = None
+        self.last_modified = None
+        self.last_id = None
+        self.interval = interval
+        self.backoff = 0.0
+
+    @property
+    def delay(self) -> float:
+        return self.backoff or self.interval
+
+    def modified(self, timestamps: Iterable[float]):
+        """
+        Sets the interval to the average time between the given posts, so a poll finds about one new post.
+        """
+
+        self.backoff = 0.0
+        timestamps = sorted(timestamps)
+
+        if len(timestamps) < 2:
+            self.not_modified()
+            return
+
+        average_gap = (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1)
+        self.interval = min(max(average_gap, RedditConfig.min_request_delay), RedditConfig.max_request_delay)
+
+    def not_modified(self):
+        self.backoff = 0.0
+        self.interval = min(self.interval * INTERVAL_GROWTH, RedditConfig.max_request_delay)
+
+    def back_off(self, retry_after: str = None):
+        """
+        Waits as long as Reddit told us to, or otherwise twice as long as the last time.
+        """
+
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = max(self.backoff, self.interval) * 2
+
+        self.backoff = min(delay, MAX_BACKOFF)
+
 
 class Reddit:
     """
@@ -28,8 +87,8 @@ class Reddit:
 
         self.reddit_channel = None
 
-        self.prev_lengths = {}
-        self.last_ids = {}
+        self.subreddit_states = {}
+        self.request_semaphore = asyncio.Semaphore(RedditConfig.max_concurrent_requests)
 
     async def fetch_posts(self, route: str, *, amount: int = 25, params=None):
         """
@@ -112,69 +171,112 @@ class Reddit:
             embed=embed
         )
 
+    async def fetch_new_posts(self, subreddit: str, state: "_SubredditState") -> Optional[List[dict]]:
+        """
+        Fetches the newest posts of a subreddit, unless they haven't changed since the last time.
+
+        Returns `None` if there's nothing new, or if Reddit asked us to slow down, in which
+        case the subreddit's state is updated to back off.
+        """
+
+        headers = dict(self.HEADERS)
+
+        if state.etag is not None:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified is not None:
+            headers["If-Modified-Since"] = state.last_modified
+
+        async with self.request_semaphore:
+            async with self.bot.http_session.get(url=f"{self.URL}/{subreddit}/new.json", headers=headers) as response:
+                if response.status == 304:
+                    log.trace(f"{subreddit} hasn't changed since it was last polled.")
+                    state.not_modified()
+                    return None
+
+                if response.status != 200:
+                    state.back_off(response.headers.get("Retry-After"))
+                    log.warning(
+                        f"Polling {subreddit} failed with status {response.status}, "
+                        f"trying again in {state.delay:.0f} seconds."
+                    )
+                    return None
+
+                content = await response.json()
+                state.etag = response.headers.get("ETag")
+                state.last_modified = response.headers.get("Last-Modified")
+
+        posts = content["data"]["children"]
+        state.modified(post["data"]["created_utc"] for post in posts)
+
+        return posts
+
     async def poll_new_posts(self):
         """
         Periodically search for new subreddit posts.
+
+        Every subreddit is polled on its own schedule, with at most
+        `max_concurrent_requests` requests to Reddit at the same time.
         """
 
-        while True:
-            await asyncio.sleep(RedditConfig.request_delay)
+        await asyncio.gather(*(self.poll_subreddit(subreddit) for subreddit in RedditConfig.subreddits))
 
-            for subreddit in RedditConfig.subreddits:
-                # Make a HEAD request to the subreddit
-                head_response = await self.bot.http_session.head(
-                    url=f"{self.URL}/{subreddit}/new.rss",
-                    headers=self.HEADERS
-                )
+    async def poll_subreddit(self, subreddit: str):
+        state = self.subreddit_states[subreddit] = _SubredditState(RedditConfig.request_delay)
 
-                content_length = head_response.headers["content-length"]
+        while True:
+            await asyncio.sleep(state.delay)
 
-                # If the content is the same size as before, assume there's no new posts.
-                if content_length == self.prev_lengths.get(subreddit, None):
-                    continue
+            try:
+                posts = await self.fetch_new_posts(subreddit, state)
+            except (ClientError, asyncio.TimeoutError, KeyError, ValueError) as e:
+                state.back_off()
+                log.warning(f"Polling {subreddit} failed, trying again in {state.delay:.0f} seconds: {e!r}")
+                continue
 
-                self.prev_lengths[subreddit] = content_length
+            if not posts:
+                continue
 
-                # Now we can actually fetch the new data
-                posts = await self.fetch_posts(f"{subreddit}/new")
-                new_posts = []
+            new_posts = []
 
-                # Only show new posts if we've checked before.
-                if subreddit in self.last_ids:
-                    for post in posts:
-                        data = post["data"]
+            # Only show new posts if we've checked before.
+            if state.last_id is not None:
+                for post in posts:
+                    data = post["data"]
 
-                        # Convert the ID to an integer for easy comparison.
-                        int_id = int(data["id"], 36)
+                    # Convert the ID to an integer for easy comparison.
+                    int_id = int(data["id"], 36)
 
-                        # If we've already seen this post, finish checking
-                        if int_id <= self.last_ids[subreddit]:
-                            break
+                    # If we've already seen this post, finish checking
+                    if int_id <= state.last_id:
+                        break
 
-                        embed_data = {
-                            "title": textwrap.shorten(data["title"], width=64, placeholder="..."),
-                            "text": textwrap.shorten(data["selftext"], width=128, placeholder="..."),
-                            "url": self.URL + data["permalink"],
-                            "author": data["author"]
-                        }
+                    embed_data = {
+                        "title": textwrap.shorten(data["title"], width=64, placeholder="..."),
+                        "text": textwrap.shorten(data["selftext"], width=128, placeholder="..."),
+                        "url": self.URL + data["permalink"],
+                        "author": data["author"]
+                    }
 
-                        new_posts.append(embed_data)
+                    new_posts.append(embed_data)
 
-                self.last_ids[subreddit] = int(posts[0]["data"]["id"], 36)
+            state.last_id = int(posts[0]["data"]["id"], 36)
 
-                # Send all of the new posts as spicy embeds
-                for data in new_posts:
-                    embed = Embed()
+            # Send all of the new posts as spicy embeds
+            for data in new_posts:
+                embed = Embed()
 
-                    embed.title = data["title"]
-                    embed.url = data["url"]
-                    embed.description = data["text"]
-                    embed.set_footer(text=f"Posted by u/{data['author']} in {subreddit}")
-                    embed.colour = Colour.blurple()
+                embed.title = data["title"]
+                embed.url = data["url"]
+                embed.description = data["text"]
+                embed.set_footer(text=f"Posted by u/{data['author']} in {subreddit}")
+                embed.colour = Colour.blurple()
 
-                    await self.reddit_channel.send(embed=embed)
+                await self.reddit_channel.send(embed=embed)
 
-                log.trace(f"Sent {len(new_posts)} new {subreddit} posts to channel {self.reddit_channel.id}.")
+            log.trace(
+                f"Sent {len(new_posts)} new {subreddit} posts to channel {self.reddit_channel.id}, "
+                f"polling again in {state.delay:.0f} seconds."
+            )
 
     async def poll_top_weekly_posts(self):
         """
@@ -6,12 +6,14 @@ import pprint
 
 import aio_pika
 from aio_pika import Message
+from aio_pika.exceptions import AMQPError
 from dateutil import parser as date_parser
 from discord import Colour, Embed
 from discord.ext.commands import Bot
 from discord.utils import get
 
 from bot.constants import Channels, Guild, RabbitMQ
+from bot.utils.service_discovery import MAX_BACKOFF, MIN_BACKOFF
 
 log = logging.getLogger(__name__)
 
@@ -42,10 +44,35 @@ class RMQ:
     def __init__(self, bot: Bot):
         self.bot = bot
 
-    async def on_ready(self):
-        self.rmq = await aio_pika.connect_robust(
-            host=RabbitMQ.host, port=RabbitMQ.port, login=RabbitMQ.username, password=RabbitMQ.password
-        )
+        # The cog may be loaded before or after the bot is ready, so connect in the background
+        self.consumer = self.bot.loop.create_task(self.connect())
+
+    def __unload(self):
+        self.consumer.cancel()
+
+        if self.rmq is not None:
+            self.bot.loop.create_task(self.rmq.close())
+
+    @property
+    def connected(self) -> bool:
+        return self.channel is not None
+
+    async def connect(self):
+        await self.bot.wait_until_ready()
+
+        # Service discovery only reloads the cog once it's unloaded, so keep trying for as long as it's loaded
+        delay = MIN_BACKOFF
+
+        while self.rmq is None:
+            try:
+                self.rmq = await aio_pika.connect_robust(
+                    host=RabbitMQ.host, port=RabbitMQ.port, login=RabbitMQ.username, password=RabbitMQ.password
+                )
+            except (ConnectionError, OSError, AMQPError):
+                log.exception(f"Failed to connect to RabbitMQ, trying again in {delay}s")
+
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_BACKOFF)
 
         log.info("Connected to RabbitMQ")
 
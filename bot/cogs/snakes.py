@@ -1,26 +1,26 @@
 import asyncio
 import colorsys
 import logging
-import os
 import random
 import re
 import string
-import textwrap
+import time
 import urllib
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from io import BytesIO
 from typing import Any, Dict
 
-import aiohttp
 import async_timeout
 from discord import Colour, Embed, File, Member, Message, Reaction
 from discord.ext.commands import BadArgument, Bot, Context, bot_has_permissions, group
-from PIL import Image, ImageDraw, ImageFont
 
-from bot.constants import ERROR_REPLIES, Keys, URLs
+from bot.constants import ERROR_REPLIES, Keys, Snakes as SnakesConfig, URLs
 from bot.converters import Snake
 from bot.decorators import locked
-from bot.utils.snakes import hatching, perlin, perlinsneks, sal
+from bot.utils.prefetch import PrefetchBuffer
+from bot.utils.snakes import cards, hatching, perlin, perlinsneks, sal
+from bot.utils.snakes.wiki_cache import SnakeInfoCache
 
 
 log = logging.getLogger(__name__)
@@ -92,6 +92,14 @@ MSG_MAX = 100
 # get_snek constants
 URL = "https://en.wikipedia.org/w/api.php?"
 
+# Random items are fetched ahead of time, so the commands using them don't have to wait on the network
+PREFETCH_SIZE = 5
+PREFETCH_CONCURRENCY = 3
+
+# Random snakes with a usable image for the get, guess and card commands
+SNAKE_POOL_SIZE = 5
+SNAKE_POOL_WORKERS = 2
+
 # snake guess responses
 INCORRECT_GUESS = (
     "Nope, that's not what it is.",
@@ -119,17 +127,8 @@ CORRECT_GUESS = (
     "Are you cheating?"
 )
 
-# snake card consts
-CARD = {
-    "top": Image.open("bot/resources/snake_cards/card_top.png"),
-    "frame": Image.open("bot/resources/snake_cards/card_frame.png"),
-    "bottom": Image.open("bot/resources/snake_cards/card_bottom.png"),
-    "backs": [
-        Image.open(f"bot/resources/snake_cards/backs/{file}")
-        for file in os.listdir("bot/resources/snake_cards/backs")
-    ],
-    "font": ImageFont.truetype("bot/resources/snake_cards/expressway.ttf", 20)
-}
+# snake card consts - cards are rendered in their own processes, so they don't hold up the event loop
+CARD_RENDER_WORKERS = 2
 # endregion
 
 
@@ -151,6 +150,50 @@ class Snakes:
         self.bot = bot
         self.headers = {"X-API-KEY": Keys.site_api}
 
+        self.snake_cache = SnakeInfoCache(bot.loop, SnakesConfig.cache_path)
+        self.card_renderer = None
+        self.card_render_duration = bot.metrics.histogram(
+            "bot_snake_card_render_seconds",
+            "Time taken by each step of rendering snake cards, and by waiting for a worker.",
+            ("step",)
+        )
+
+        # Every prefetch buffer shares this limit on the requests made to refill it
+        self.prefetch_semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        self.prefetch_buffers = []
+
+        self.snake_pool = self._prefetch(
+            self._fetch_random_snek, name="snake pool", size=SNAKE_POOL_SIZE, workers=SNAKE_POOL_WORKERS
+        )
+        self.name_buffer = self._prefetch(self._get_snake_name, name="snake names")
+        self.fact_buffer = self._prefetch(partial(self._get_site_item, URLs.site_facts_api), name="snake facts")
+        self.idiom_buffer = self._prefetch(partial(self._get_site_item, URLs.site_idioms_api), name="snake idioms")
+        self.quiz_buffer = self._prefetch(partial(self._get_site_item, URLs.site_quiz_api), name="snake quiz")
+        self.movie_buffer = self._prefetch(self._get_random_movie, name="snake movies")
+
+    def __unload(self):
+        for buffer in self.prefetch_buffers:
+            buffer.stop()
+
+        self.bot.loop.create_task(self.snake_cache.save())
+
+        if self.card_renderer is not None:
+            self.card_renderer.shutdown(wait=False)
+
+    def _prefetch(self, fetch, *, name: str, size: int = PREFETCH_SIZE, workers: int = 1) -> PrefetchBuffer:
+        """
+        Creates and starts a prefetch buffer, which is stopped when the cog is unloaded.
+        """
+
+        buffer = PrefetchBuffer(
+            self.bot.loop, fetch,
+            size=size, workers=workers, semaphore=self.prefetch_semaphore, name=name
+        )
+        buffer.start()
+
+        self.prefetch_buffers.append(buffer)
+        return buffer
+
     # region: Helper methods
     @staticmethod
     def _beautiful_pastel(hue):
@@ -170,87 +213,32 @@ class Snakes:
 
         return int(hex_rgb, 16)
 
-    @staticmethod
-    def _generate_card(buffer: BytesIO, content: dict) -> BytesIO:
+    async def _generate_card(self, image: bytes, content: dict) -> BytesIO:
         """
-        Generate a card from snake information.
-
-        Written by juan and Someone during the first code jam.
+        Generate a card from snake information, in the card rendering process pool.
         """
 
-        snake = Image.open(buffer)
-
-        # Get the size of the snake icon, configure the height of the image box (yes, it changes)
-        icon_width = 347  # Hardcoded, not much i can do about that
-        icon_height = int((icon_width / snake.width) * snake.height)
-        frame_copies = icon_height // CARD['frame'].height + 1
-        snake.thumbnail((icon_width, icon_height))
-
-        # Get the dimensions of the final image
-        main_height = icon_height + CARD['top'].height + CARD['bottom'].height
-        main_width = CARD['frame'].width
-
-        # Start creating the foreground
-        foreground = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
-        foreground.paste(CARD['top'], (0, 0))
-
-        # Generate the frame borders to the correct height
-        for offset in range(frame_copies):
-            position = (0, CARD['top'].height + offset * CARD['frame'].height)
-            foreground.paste(CARD['frame'], position)
-
-        # Add the image and bottom part of the image
-        foreground.paste(snake, (36, CARD['top'].height))  # Also hardcoded :(
-        foreground.paste(CARD['bottom'], (0, CARD['top'].height + icon_height))
+        # The pool is only started once somebody actually wants a card
+        if self.card_renderer is None:
+            self.card_renderer = ProcessPoolExecutor(max_workers=CARD_RENDER_WORKERS)
 
-        # Setup the background
-        back = random.choice(CARD['backs'])
-        back_copies = main_height // back.height + 1
-        full_image = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+        back = random.randrange(len(cards.back_files()))
+        submitted = time.perf_counter()
 
-        # Generate the tiled background
-        for offset in range(back_copies):
-            full_image.paste(back, (16, 16 + offset * back.height))
-
-        # Place the foreground onto the final image
-        full_image.paste(foreground, (0, 0), foreground)
-
-        # Get the first two sentences of the info
-        description = '.'.join(content['info'].split(".")[:2]) + '.'
-
-        # Setup positioning variables
-        margin = 36
-        offset = CARD['top'].height + icon_height + margin
-
-        # Create blank rectangle image which will be behind the text
-        rectangle = Image.new(
-            "RGBA",
-            (main_width, main_height),
-            (0, 0, 0, 0)
+        png, timings = await self.bot.loop.run_in_executor(
+            self.card_renderer, cards.render_card, image, content['info'], back
         )
 
-        # Draw a semi-transparent rectangle on it
-        rect = ImageDraw.Draw(rectangle)
-        rect.rectangle(
-            (margin, offset, main_width - margin, main_height - margin),
-            fill=(63, 63, 63, 128)
-        )
-
-        # Paste it onto the final image
-        full_image.paste(rectangle, (0, 0), mask=rectangle)
+        waited = time.perf_counter() - submitted - timings['total']
 
-        # Draw the text onto the final image
-        draw = ImageDraw.Draw(full_image)
-        for line in textwrap.wrap(description, 36):
-            draw.text([margin + 4, offset], line, font=CARD['font'])
-            offset += CARD['font'].getsize(line)[1]
+        self.card_render_duration.observe(waited, "queue")
+        for step, duration in timings.items():
+            self.card_render_duration.observe(duration, step)
 
-        # Get the image contents as a BufferIO object
-        buffer = BytesIO()
-        full_image.save(buffer, 'PNG')
-        buffer.seek(0)
+        steps = ", ".join(f"{step} {duration * 1000:.1f}ms" for step, duration in timings.items())
+        log.debug(f"Rendered a card for {content['name']!r} after waiting {waited * 1000:.1f}ms: {steps}")
 
-        return buffer
+        return BytesIO(png)
 
     @staticmethod
     def _snakify(message):
@@ -308,114 +296,176 @@ class Snakes:
         return long_message
 
     async def _get_snek(self, name: str) -> Dict[str, Any]:
+        """
+        Gets the data from a wikipedia article about a snake,
+        from the snake info cache if possible.
+
+        :param name: The name of the snake to get information for
+        :return: A dict containing information on a snake
+        """
+
+        snake_info = self.snake_cache.get(name)
+
+        if snake_info is None:
+            snake_info = await self._fetch_snek(name)
+
+            # Don't remember failures, Wikipedia might just be having a bad day
+            if snake_info is not None and not snake_info.get("error"):
+                self.snake_cache.set(name, snake_info)
+
+        return snake_info
+
+    async def _fetch_snek(self, name: str) -> Dict[str, Any]:
         """
         Goes online and fetches all the data from a wikipedia article
         about a snake. Builds a dict that the .get() method can use.
 
         Created by Ava and eivl.
 
-        :param name: The name of the snake to get information for - omit for a random snake
+        :param name: The name of the snake to get information for
         :return: A dict containing information on a snake
         """
 
         snake_info = {}
 
-        async with aiohttp.ClientSession() as session:
-            params = {
-                'format': 'json',
-                'action': 'query',
-                'list': 'search',
-                'srsearch': name,
-                'utf8': '',
-                'srlimit': '1',
-            }
-
-            json = await self._fetch(session, URL, params=params)
-
-            # wikipedia does have a error page
-            try:
-                pageid = json["query"]["search"][0]["pageid"]
-            except KeyError:
-                # Wikipedia error page ID(?)
-                pageid = 41118
-            except IndexError:
-                return None
-
-            params = {
-                'format': 'json',
-                'action': 'query',
-                'prop': 'extracts|images|info',
-                'exlimit': 'max',
-                'explaintext': '',
-                'inprop': 'url',
-                'pageids': pageid
-            }
+        session = self.bot.http_session
+        params = {
+            'format': 'json',
+            'action': 'query',
+            'list': 'search',
+            'srsearch': name,
+            'utf8': '',
+            'srlimit': '1',
+        }
 
-            json = await self._fetch(session, URL, params=params)
+        json = await self._fetch(session, URL, params=params)
 
-            # constructing dict - handle exceptions later
-            try:
-                snake_info["title"] = json["query"]["pages"][f"{pageid}"]["title"]
-                snake_info["extract"] = json["query"]["pages"][f"{pageid}"]["extract"]
-                snake_info["images"] = json["query"]["pages"][f"{pageid}"]["images"]
-                snake_info["fullurl"] = json["query"]["pages"][f"{pageid}"]["fullurl"]
-                snake_info["pageid"] = json["query"]["pages"][f"{pageid}"]["pageid"]
-            except KeyError:
-                snake_info["error"] = True
-
-            if snake_info["images"]:
-                i_url = 'https://commons.wikimedia.org/wiki/Special:FilePath/'
-                image_list = []
-                map_list = []
-                thumb_list = []
-
-                # Wikipedia has arbitrary images that are not snakes
-                banned = [
-                    'Commons-logo.svg',
-                    'Red%20Pencil%20Icon.png',
-                    'distribution',
-                    'The%20Death%20of%20Cleopatra%20arthur.jpg',
-                    'Head%20of%20holotype',
-                    'locator',
-                    'Woma.png',
-                    '-map.',
-                    '.svg',
-                    'ange.',
-                    'Adder%20(PSF).png'
-                ]
-
-                for image in snake_info["images"]:
-                    # images come in the format of `File:filename.extension`
-                    file, sep, filename = image["title"].partition(':')
-                    filename = filename.replace(" ", "%20")  # Wikipedia returns good data!
-
-                    if not filename.startswith('Map'):
-                        if any(ban in filename for ban in banned):
-                            pass
-                        else:
-                            image_list.append(f"{i_url}{filename}")
-                            thumb_list.append(f"{i_url}{filename}?width=100")
+        # wikipedia does have a error page
+        try:
+            pageid = json["query"]["search"][0]["pageid"]
+        except KeyError:
+            # Wikipedia error page ID(?)
+            pageid = 41118
+        except IndexError:
+            return None
+
+        params = {
+            'format': 'json',
+            'action': 'query',
+            'prop': 'extracts|images|info',
+            'exlimit': 'max',
+            'explaintext': '',
+            'inprop': 'url',
+            'pageids': pageid
+        }
+
+        json = await self._fetch(session, URL, params=params)
+
+        # constructing dict - handle exceptions later
+        try:
+            snake_info["title"] = json["query"]["pages"][f"{pageid}"]["title"]
+            snake_info["extract"] = json["query"]["pages"][f"{pageid}"]["extract"]
+            snake_info["images"] = json["query"]["pages"][f"{pageid}"]["images"]
+            snake_info["fullurl"] = json["query"]["pages"][f"{pageid}"]["fullurl"]
+            snake_info["pageid"] = json["query"]["pages"][f"{pageid}"]["pageid"]
+        except KeyError:
+            snake_info["error"] = True
+
+        if snake_info["images"]:
+            i_url = 'https://commons.wikimedia.org/wiki/Special:FilePath/'
+            image_list = []
+            map_list = []
+            thumb_list = []
+
+            # Wikipedia has arbitrary images that are not snakes
+            banned = [
+                'Commons-logo.svg',
+                'Red%20Pencil%20Icon.png',
+                'distribution',
+                'The%20Death%20of%20Cleopatra%20arthur.jpg',
+                'Head%20of%20holotype',
+                'locator',
+                'Woma.png',
+                '-map.',
+                '.svg',
+                'ange.',
+                'Adder%20(PSF).png'
+            ]
+
+            for image in snake_info["images"]:
+                # images come in the format of `File:filename.extension`
+                file, sep, filename = image["title"].partition(':')
+                filename = filename.replace(" ", "%20")  # Wikipedia returns good data!
+
+                if not filename.startswith('Map'):
+                    if any(ban in filename for ban in banned):
+                        pass
                     else:
-                        map_list.append(f"{i_url}{filename}")
+                        image_list.append(f"{i_url}{filename}")
+                        thumb_list.append(f"{i_url}{filename}?width=100")
+                else:
+                    map_list.append(f"{i_url}{filename}")
 
-            snake_info["image_list"] = image_list
-            snake_info["map_list"] = map_list
-            snake_info["thumb_list"] = thumb_list
-            snake_info["name"] = name
+        snake_info["image_list"] = image_list
+        snake_info["map_list"] = map_list
+        snake_info["thumb_list"] = thumb_list
+        snake_info["name"] = name
 
-            match = self.wiki_brief.match(snake_info['extract'])
-            info = match.group(1) if match else None
+        match = self.wiki_brief.match(snake_info['extract'])
+        info = match.group(1) if match else None
 
-            if info:
-                info = info.replace("\n", "\n\n")  # Give us some proper paragraphs.
+        if info:
+            info = info.replace("\n", "\n\n")  # Give us some proper paragraphs.
 
-            snake_info["info"] = info
+        snake_info["info"] = info
 
         return snake_info
 
+    def _get_snek_image(self, snake_info: Dict[str, Any]) -> str:
+        """
+        Finds the first image of a snake in a format Discord can embed.
+
+        :param snake_info: A dict built by `_get_snek`
+        :return: The URL of the image, or None if there isn't one.
+        """
+
+        return next(
+            (url for url in snake_info.get('image_list', ()) if url.endswith(self.valid_image_extensions)),
+            None
+        )
+
+    def _is_poolable(self, snake_info: Dict[str, Any]) -> bool:
+        """
+        Checks whether a snake can be used by every command that draws from the snake pool.
+        """
+
+        return (
+            snake_info is not None
+            and not snake_info.get('error')
+            and snake_info.get('info')
+            and self._get_snek_image(snake_info) is not None
+        )
+
+    async def _fetch_random_snek(self) -> Dict[str, Any]:
+        """
+        Fetches random snakes until one of them has a usable image.
+
+        This is what fills the snake pool, so use `self.snake_pool.get()` instead.
+
+        :return: A dict containing information on a snake
+        """
+
+        while True:
+            snake_info = await self._get_snek(await Snake.random())
+
+            if self._is_poolable(snake_info):
+                return snake_info
+
     async def _get_snake_name(self) -> Dict[str, str]:
         """
         Gets a random snake name.
+
+        This is what fills the name buffer, so use `self.name_buffer.get()` instead.
         :return: A random snake name, as a string.
         """
 
@@ -424,6 +474,48 @@ class Snakes:
 
         return name_data
 
+    async def _get_site_item(self, url: str) -> Any:
+        """
+        Gets a random item from one of the snake endpoints of the site API.
+        :param url: The URL of the endpoint
+        :return: The decoded JSON response
+        """
+
+        response = await self.bot.http_session.get(url, headers=self.headers)
+        return await response.json()
+
+    async def _get_random_movie(self) -> Dict[str, Any]:
+        """
+        Gets the details of a random snake-related movie from OMDB.
+
+        This is what fills the movie buffer, so use `self.movie_buffer.get()` instead.
+        :return: The OMDB details of the movie
+        """
+
+        url = "http://www.omdbapi.com/"
+        page = random.randint(1, 27)
+
+        response = await self.bot.http_session.get(
+            url,
+            params={
+                "s": "snake",
+                "page": page,
+                "type": "movie",
+                "apikey": Keys.omdb
+            }
+        )
+        data = await response.json()
+        movie = random.choice(data["Search"])["imdbID"]
+
+        response = await self.bot.http_session.get(
+            url,
+            params={
+                "i": movie,
+                "apikey": Keys.omdb
+            }
+        )
+        return await response.json()
+
     async def _validate_answer(self, ctx: Context, message: Message, answer: str, options: list):
         """
         Validate the answer using a reaction event loop
@@ -445,7 +537,7 @@ class Snakes:
 
         # Validate the answer
         try:
-            reaction, user = await ctx.bot.wait_for("reaction_add", timeout=45.0, check=predicate)
+            reaction, user = await ctx.bot.reaction_router.wait_for(message.id, timeout=45.0, check=predicate)
         except asyncio.TimeoutError:
             await ctx.channel.send(f"You took too long. The correct answer was **{options[answer]}**.")
             await message.clear_reactions()
@@ -537,7 +629,7 @@ class Snakes:
         # Begin main game loop
         while not win and antidote_tries < 10:
             try:
-                reaction, user = await ctx.bot.wait_for("reaction_add", timeout=300, check=predicate)
+                reaction, user = await ctx.bot.reaction_router.wait_for(board_id.id, timeout=300, check=predicate)
             except asyncio.TimeoutError:
                 log.debug("Antidote timed out waiting for a reaction")
                 break  # We're done, no reactions for the last 5 minutes
@@ -634,8 +726,7 @@ class Snakes:
             )
 
             # Get a snake idiom from the API
-            response = await self.bot.http_session.get(URLs.site_idioms_api, headers=self.headers)
-            text = await response.json()
+            text = await self.idiom_buffer.get()
 
             # Build and send the snek
             factory = perlin.PerlinNoiseFactory(dimension=1, octaves=2)
@@ -668,9 +759,8 @@ class Snakes:
 
         with ctx.typing():
             if name is None:
-                name = await Snake.random()
-
-            if isinstance(name, dict):
+                data = await self.snake_pool.get()
+            elif isinstance(name, dict):
                 data = name
             else:
                 data = await self._get_snek(name)
@@ -700,8 +790,7 @@ class Snakes:
             )
 
             emoji = 'https://emojipedia-us.s3.amazonaws.com/thumbs/60/google/3/snake_1f40d.png'
-            image = next((url for url in data['image_list'] if url.endswith(self.valid_image_extensions)), emoji)
-            embed.set_image(url=image)
+            embed.set_image(url=self._get_snek_image(data) or emoji)
 
             await ctx.send(embed=embed)
 
@@ -716,17 +805,19 @@ class Snakes:
         """
 
         with ctx.typing():
+            data = await self.snake_pool.get()
+            snake = data['name']
+            image = self._get_snek_image(data)
 
-            image = None
+            # Pick three other snakes to choose from
+            snakes = {snake}
 
-            while image is None:
-                snakes = [await Snake.random() for _ in range(4)]
-                snake = random.choice(snakes)
-                answer = "abcd"[snakes.index(snake)]
+            while len(snakes) < 4:
+                snakes.add(await Snake.random())
 
-                data = await self._get_snek(snake)
-
-                image = next((url for url in data['image_list'] if url.endswith(self.valid_image_extensions)), None)
+            snakes = list(snakes)
+            random.shuffle(snakes)
+            answer = "abcd"[snakes.index(snake)]
 
             embed = Embed(
                 title='Which of the following is the snake in the image?',
@@ -780,29 +871,7 @@ class Snakes:
         Modified by gdude.
         """
 
-        url = "http://www.omdbapi.com/"
-        page = random.randint(1, 27)
-
-        response = await self.bot.http_session.get(
-            url,
-            params={
-                "s": "snake",
-                "page": page,
-                "type": "movie",
-                "apikey": Keys.omdb
-            }
-        )
-        data = await response.json()
-        movie = random.choice(data["Search"])["imdbID"]
-
-        response = await self.bot.http_session.get(
-            url,
-            params={
-                "i": movie,
-                "apikey": Keys.omdb
-            }
-        )
-        data = await response.json()
+        data = await self.movie_buffer.get()
 
         embed = Embed(
             title=data["Title"],
@@ -852,8 +921,7 @@ class Snakes:
         """
 
         # Prepare a question.
-        response = await self.bot.http_session.get(URLs.site_quiz_api, headers=self.headers)
-        question = await response.json()
+        question = await self.quiz_buffer.get()
         answer = question["answerkey"]
         options = {key: question["options"][key] for key in ANSWERS_EMOJI.keys()}
 
@@ -891,7 +959,7 @@ class Snakes:
         This was written by Iceman, and modified for inclusion into the bot by lemon.
         """
 
-        snake_name = await self._get_snake_name()
+        snake_name = await self.name_buffer.get()
         snake_name = snake_name['name']
         snake_prefix = ""
 
@@ -1016,9 +1084,7 @@ class Snakes:
 
         # Get the snake data we need
         if not name:
-            name_obj = await self._get_snake_name()
-            name = name_obj['scientific']
-            content = await self._get_snek(name)
+            content = await self.snake_pool.get()
 
         elif isinstance(name, dict):
             content = name
@@ -1029,15 +1095,11 @@ class Snakes:
         # Make the card
         async with ctx.typing():
 
-            stream = BytesIO()
             async with async_timeout.timeout(10):
                 async with self.bot.http_session.get(content['image_list'][0]) as response:
-                    stream.write(await response.read())
-
-            stream.seek(0)
+                    image = await response.read()
 
-            func = partial(self._generate_card, stream, content)
-            final_buffer = await self.bot.loop.run_in_executor(None, func)
+            final_buffer = await self._generate_card(image, content)
 
         # Send it!
         await ctx.send(
@@ -1055,8 +1117,7 @@ class Snakes:
         """
 
         # Get a fact from the API.
-        response = await self.bot.http_session.get(URLs.site_facts_api, headers=self.headers)
-        question = await response.json()
+        question = await self.fact_buffer.get()
 
         # Build and send the embed.
         embed = Embed(
@@ -1132,7 +1193,7 @@ class Snakes:
         if search:
             query = search + ' snake'
         else:
-            snake = await self._get_snake_name()
+            snake = await self.name_buffer.get()
             query = snake['name']
 
         # Build the URL and make the request
@@ -51,7 +51,7 @@ RAW_CODE_REGEX = re.compile(
     r"\s*$",                                # any trailing whitespace until the end of the string
     re.DOTALL                               # "." also matches newlines
 )
-BYPASS_ROLES = (Roles.owner, Roles.admin, Roles.moderator, Roles.helpers)
+BYPASS_ROLES = frozenset((Roles.owner, Roles.admin, Roles.moderator, Roles.helpers))
 WHITELISTED_CHANNELS = (Channels.bot,)
 WHITELISTED_CHANNELS_STRING = ', '.join(f"<#{channel_id}>" for channel_id in WHITELISTED_CHANNELS)
 
@@ -64,7 +64,7 @@ async def channel_is_whitelisted_or_author_can_bypass(ctx: Context):
 
     if ctx.channel.id in WHITELISTED_CHANNELS:
         return True
-    if any(r.id in BYPASS_ROLES for r in ctx.author.roles):
+    if ctx.bot.role_cache.has_any(ctx.author, BYPASS_ROLES):
         return True
     raise MissingPermissions("You are not allowed to do that here.")
 
@@ -100,7 +100,11 @@ class Snekbox:
         if not code:  # None or empty string
             return await ctx.invoke(self.bot.get_command("help"), "eval")
 
-        log.info(f"Received code from {ctx.author.name}#{ctx.author.discriminator} for evaluation:\n{code}")
+        if self.rmq is None or not self.rmq.connected:
+            await ctx.send(f"{ctx.author.mention} Eval is unavailable right now, please try again later.")
+            return
+
+        log.info("Received code from %s for evaluation:\n%s", ctx.author, code)
         self.jobs[ctx.author.id] = datetime.datetime.now()
 
         # Strip whitespace and inline or block code markdown and extract the code and some formatting info
@@ -112,10 +116,10 @@ class Snekbox:
                 info = (f"'{lang}' highlighted" if lang else "plain") + " code block"
             else:
                 info = f"{delim}-enclosed inline code"
-            log.trace(f"Extracted {info} for evaluation:\n{code}")
+            log.trace("Extracted %s for evaluation:\n%s", info, code)
         else:
             code = textwrap.dedent(RAW_CODE_REGEX.fullmatch(code).group("code"))
-            log.trace(f"Eval message contains not or badly formatted code, stripping whitespace only:\n{code}")
+            log.trace("Eval message contains not or badly formatted code, stripping whitespace only:\n%s", code)
 
         code = textwrap.indent(code, "    ")
         code = CODE_TEMPLATE.replace("{CODE}", code)
@@ -50,11 +50,10 @@ class Verification:
             return  # They used the accept command
 
         if ctx.channel.id == Channels.verification:  # We're in the verification channel
-            for role in ctx.author.roles:
-                if role.id == Roles.verified:
-                    log.warning(f"{ctx.author} posted '{ctx.message.content}' "
-                                "in the verification channel, but is already verified.")
-                    return  # They're already verified
+            if Roles.verified in self.bot.role_cache.role_ids(ctx.author):
+                log.warning(f"{ctx.author} posted '{ctx.message.content}' "
+                            "in the verification channel, but is already verified.")
+                return  # They're already verified
 
             log.debug(f"{ctx.author} posted '{ctx.message.content}' in the verification "
                       "channel. We are providing instructions how to verify.")
@@ -102,12 +101,7 @@ class Verification:
         Subscribe to announcement notifications by assigning yourself the role
         """
 
-        has_role = False
-
-        for role in ctx.author.roles:
-            if role.id == Roles.announcements:
-                has_role = True
-                break
+        has_role = Roles.announcements in self.bot.role_cache.role_ids(ctx.author)
 
         if has_role:
             return await ctx.send(
@@ -130,12 +124,7 @@ class Verification:
         Unsubscribe from announcement notifications by removing the role from yourself
         """
 
-        has_role = False
-
-        for role in ctx.author.roles:
-            if role.id == Roles.announcements:
-                has_role = True
-                break
+        has_role = Roles.announcements in self.bot.role_cache.role_ids(ctx.author)
 
         if not has_role:
             return await ctx.send(
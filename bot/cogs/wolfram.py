@@ -1,12 +1,20 @@
+import asyncio
+import base64
+import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from io import BytesIO
-from typing import List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
 from urllib import parse
 
 import discord
 from discord import Embed
 from discord.ext import commands
-from discord.ext.commands import BucketType, Context, check, group
+from discord.ext.commands import BucketType, Context, group
 
 from bot.constants import Colours, Roles, Wolfram
 from bot.pagination import ImagePaginator
@@ -21,6 +29,9 @@ WOLF_IMAGE = "https://www.symbols.com/gi.php?type=1&id=2886&i=1"
 COOLDOWN_IGNORERS = Roles.moderator, Roles.owner, Roles.admin, Roles.helpers
 MAX_PODS = 20
 
+# How long to wait after the cache changed before saving it, so a burst of queries is saved once
+CACHE_SAVE_DELAY = 60
+
 # Allows for 10 wolfram calls pr user pr day
 usercd = commands.CooldownMapping.from_cooldown(Wolfram.user_limit_day, 60*60*24, BucketType.user)
 
@@ -62,48 +73,235 @@ async def send_embed(
     await ctx.send(embed=embed, file=f)
 
 
-def custom_cooldown(*ignore: List[int]) -> check:
+async def check_cooldown(ctx: Context, ignore: Iterable[int]) -> bool:
     """
     Custom cooldown mapping that applies a specific requests per day to users.
     Staff is ignored by the user cooldown, however the cooldown implements a
     total amount of uses per day for the entire guild. (Configurable in configs)
 
-    :param ignore: List[int] -- list of ids of roles to be ignored by user cooldown
-    :return: check
-    """
-
-    async def predicate(ctx: Context) -> bool:
-        user_bucket = usercd.get_bucket(ctx.message)
+    This isn't a command check, so it's only called when a request to the API
+    is actually made, and answers from the cache don't count towards the limits.
 
-        if ctx.author.top_role.id not in ignore:
-            user_rate = user_bucket.update_rate_limit()
-
-            if user_rate:
-                # Can't use api; cause: member limit
-                message = (
-                    "You've used up your limit for Wolfram|Alpha requests.\n"
-                    f"Cooldown: {int(user_rate)}"
-                )
-                await send_embed(ctx, message)
-                return False
+    :param ctx: Context
+    :param ignore: Iterable[int] -- ids of roles to be ignored by user cooldown
+    :return: bool -- whether the request can be made
+    """
 
-        guild_bucket = guildcd.get_bucket(ctx.message)
-        guild_rate = guild_bucket.update_rate_limit()
+    user_bucket = usercd.get_bucket(ctx.message)
 
-        # Repr has a token attribute to read requests left
-        log.debug(guild_bucket)
+    if not ctx.bot.role_cache.has_any(ctx.author, ignore):
+        user_rate = user_bucket.update_rate_limit()
 
-        if guild_rate:
-            # Can't use api; cause: guild limit
+        if user_rate:
+            # Can't use api; cause: member limit
             message = (
-                "The max limit of requests for the server has been reached for today.\n"
-                f"Cooldown: {int(guild_rate)}"
+                "You've used up your limit for Wolfram|Alpha requests.\n"
+                f"Cooldown: {int(user_rate)}"
             )
             await send_embed(ctx, message)
             return False
 
-        return True
-    return check(predicate)
+    guild_bucket = guildcd.get_bucket(ctx.message)
+    guild_rate = guild_bucket.update_rate_limit()
+
+    # Repr has a token attribute to read requests left
+    log.debug(guild_bucket)
+
+    if guild_rate:
+        # Can't use api; cause: guild limit
+        message = (
+            "The max limit of requests for the server has been reached for today.\n"
+            f"Cooldown: {int(guild_rate)}"
+        )
+        await send_embed(ctx, message)
+        return False
+
+    return True
+
+
+def _size_of(value: Any) -> int:
+    if isinstance(value, bytes):
+        return len(value)
+
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+
+    # Pod pages, a list of (title, image URL) tuples
+    return sum(_size_of(item) for page in value for item in page)
+
+
+class WolframCache:
+    """
+    A least recently used cache of Wolfram|Alpha answers, keyed by the kind
+    of request and the query, ignoring case and repeated whitespace.
+
+    It's bounded by both the number of entries and their total size, and entries
+    expire after `ttl` seconds. Shortly after it changes, the cache is saved to
+    `path`, from which it's loaded again on startup.
+    """
+
+    def __init__(
+            self, loop: asyncio.AbstractEventLoop, path: str = Wolfram.cache_path,
+            max_entries: int = Wolfram.cache_max_entries, max_size: int = Wolfram.cache_max_size,
+            ttl: int = Wolfram.cache_ttl
+    ):
+        self.loop = loop
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+
+        # Maps keys to (expiry timestamp, size, value) tuples
+        self._entries = OrderedDict()
+        self._size = 0
+        self._save_task = None
+
+        # Saves run in the executor, and `close` may save again while one is still writing,
+        # so writes are serialised, and one taken before the last written is dropped
+        self._write_lock = threading.Lock()
+        self._saves = 0
+        self._written = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(kind: str, query: str) -> str:
+        return f"{kind}:{' '.join(query.casefold().split())}"
+
+    def get(self, kind: str, query: str) -> Any:
+        """
+        Returns the cached answer, or `None` if there isn't one.
+        """
+
+        key = self.key(kind, query)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, _, value = entry
+
+        if expires_at <= time.time():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, kind: str, query: str, value: Any):
+        self._add(self.key(kind, query), value, time.time() + self.ttl)
+        self.schedule_save()
+
+    def _add(self, key: str, value: Any, expires_at: float):
+        size = _size_of(value)
+
+        if size > self.max_size:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (expires_at, size, value)
+        self._size += size
+
+        while len(self._entries) > self.max_entries or self._size > self.max_size:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def load(self):
+        """
+        Loads the entries saved by `save`, skipping the ones which expired since.
+        """
+
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            log.warning(f"Couldn't load the Wolfram cache from {self.path}, starting with an empty one.", exc_info=True)
+            return
+
+        now = time.time()
+
+        for key, expires_at, value in entries:
+            if expires_at <= now:
+                continue
+
+            if "bytes" in value:
+                self._add(key, base64.b64decode(value["bytes"]), expires_at)
+            elif key.startswith("pages:"):
+                self._add(key, [tuple(page) for page in value["json"]], expires_at)
+            else:
+                self._add(key, value["json"], expires_at)
+
+        log.debug(f"Loaded {len(self)} entries into the Wolfram cache.")
+
+    def save(self):
+        self._write(*self._snapshot())
+
+    def _snapshot(self) -> Tuple[int, List[Tuple[str, Tuple[float, int, Any]]]]:
+        self._saves += 1
+        return self._saves, list(self._entries.items())
+
+    def _write(self, number: int, items: List[Tuple[str, Tuple[float, int, Any]]]):
+        """
+        Writes the entries to disk, replacing the previous file only once all of them are written.
+        """
+
+        entries = [
+            (key, expires_at, {"bytes": base64.b64encode(value).decode("ascii")}
+                if isinstance(value, bytes) else {"json": value})
+            for key, (expires_at, _, value) in items
+        ]
+
+        with self._write_lock:
+            if number < self._written:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = self.path.with_suffix(".tmp")
+
+            with temporary_path.open("w", encoding="utf-8") as f:
+                json.dump(entries, f)
+
+            os.replace(temporary_path, self.path)
+            self._written = number
+
+    def schedule_save(self):
+        if self._save_task is None or self._save_task.done():
+            self._save_task = self.loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(CACHE_SAVE_DELAY)
+
+        # Encoding the images and writing them out would block the loop for a while,
+        # so only the list of entries is taken here, which the cache can't change afterwards
+        try:
+            await self.loop.run_in_executor(None, self._write, *self._snapshot())
+        except OSError:
+            log.exception(f"Couldn't save the Wolfram cache to {self.path}.")
+
+    def close(self):
+        """
+        Saves any pending changes right away.
+
+        Cancelling the pending save doesn't stop a write already running in the executor,
+        so the writes take turns, and an older one finishing after this one is dropped.
+        """
+
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+
+            try:
+                self.save()
+            except OSError:
+                log.exception(f"Couldn't save the Wolfram cache to {self.path}.")
 
 
 async def get_pod_pages(ctx, bot, query: str) -> Optional[List[Tuple]]:
@@ -157,9 +355,31 @@ class Wolfram:
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.cache = WolframCache(bot.loop)
+        self.cache.load()
+
+    def __unload(self):
+        self.cache.close()
+
+    async def get_pod_pages(self, ctx: Context, query: str) -> Optional[List[Tuple]]:
+        """
+        Returns the pod pages of the query from the cache, or from the API if the cooldown allows it.
+        """
+
+        pages = self.cache.get("pages", query)
+
+        if pages is None:
+            if not await check_cooldown(ctx, COOLDOWN_IGNORERS):
+                return None
+
+            pages = await get_pod_pages(ctx, self.bot, query)
+
+            if pages:
+                self.cache.set("pages", query, pages)
+
+        return pages
 
     @group(name="wolfram", aliases=("wolf", "wa"), invoke_without_command=True)
-    @custom_cooldown(*COOLDOWN_IGNORERS)
     async def wolfram_command(self, ctx: Context, *, query: str) -> None:
         """
         Requests all answers on a single image,
@@ -169,17 +389,27 @@ class Wolfram:
         :param query: str - string request to api
         """
 
-        url_str = parse.urlencode({
-            "i": query,
-            "appid": APPID,
-        })
-        query = QUERY.format(request="simple", data=url_str)
+        status = 200
+        image_bytes = self.cache.get("simple", query)
+
+        if image_bytes is None and not await check_cooldown(ctx, COOLDOWN_IGNORERS):
+            return
 
         # Give feedback that the bot is working.
         async with ctx.channel.typing():
-            async with self.bot.http_session.get(query) as response:
-                status = response.status
-                image_bytes = await response.read()
+            if image_bytes is None:
+                url_str = parse.urlencode({
+                    "i": query,
+                    "appid": APPID,
+                })
+                request_url = QUERY.format(request="simple", data=url_str)
+
+                async with self.bot.http_session.get(request_url) as response:
+                    status = response.status
+                    image_bytes = await response.read()
+
+                if status == 200:
+                    self.cache.set("simple", query, image_bytes)
 
             f = discord.File(BytesIO(image_bytes), filename="image.png")
             image_url = "attachment://image.png"
@@ -201,7 +431,6 @@ class Wolfram:
             await send_embed(ctx, message, color, footer=footer, img_url=image_url, f=f)
 
     @wolfram_command.command(name="page", aliases=("pa", "p"))
-    @custom_cooldown(*COOLDOWN_IGNORERS)
     async def wolfram_page_command(self, ctx: Context, *, query: str) -> None:
         """
         Requests a drawn image of given query
@@ -211,7 +440,7 @@ class Wolfram:
         :param query: str - string request to api
         """
 
-        pages = await get_pod_pages(ctx, self.bot, query)
+        pages = await self.get_pod_pages(ctx, query)
 
         if not pages:
             return
@@ -225,7 +454,6 @@ class Wolfram:
         await ImagePaginator.paginate(pages, ctx, embed)
 
     @wolfram_command.command(name="cut", aliases=("c",))
-    @custom_cooldown(*COOLDOWN_IGNORERS)
     async def wolfram_cut_command(self, ctx, *, query: str) -> None:
         """
         Requests a drawn image of given query
@@ -235,7 +463,7 @@ class Wolfram:
         :param query: str - string request to api
         """
 
-        pages = await get_pod_pages(ctx, self.bot, query)
+        pages = await self.get_pod_pages(ctx, query)
 
         if not pages:
             return
@@ -248,7 +476,6 @@ class Wolfram:
         await send_embed(ctx, page[0], colour=Colours.soft_orange, img_url=page[1])
 
     @wolfram_command.command(name="short", aliases=("sh", "s"))
-    @custom_cooldown(*COOLDOWN_IGNORERS)
     async def wolfram_short_command(self, ctx: Context, *, query: str) -> None:
         """
             Requests an answer to a simple question
@@ -258,17 +485,27 @@ class Wolfram:
             :param query: str - string request to api
         """
 
-        url_str = parse.urlencode({
-            "i": query,
-            "appid": APPID,
-        })
-        query = QUERY.format(request="result", data=url_str)
+        status = 200
+        response_text = self.cache.get("short", query)
+
+        if response_text is None and not await check_cooldown(ctx, COOLDOWN_IGNORERS):
+            return
 
         # Give feedback that the bot is working.
         async with ctx.channel.typing():
-            async with self.bot.http_session.get(query) as response:
-                status = response.status
-                response_text = await response.text()
+            if response_text is None:
+                url_str = parse.urlencode({
+                    "i": query,
+                    "appid": APPID,
+                })
+                request_url = QUERY.format(request="result", data=url_str)
+
+                async with self.bot.http_session.get(request_url) as response:
+                    status = response.status
+                    response_text = await response.text()
+
+                if status == 200:
+                    self.cache.set("short", query, response_text)
 
             if status == 501:
                 message = "Failed to get response"
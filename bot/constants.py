@@ -12,10 +12,13 @@ their default values from `config-default.yml`.
 
 import logging
 import os
+import re
 from collections.abc import Mapping
+from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Pattern, Tuple
 
 import yaml
 
@@ -74,10 +77,6 @@ yaml.SafeLoader.add_constructor("!JOIN", _join_var_constructor)
 yaml.SafeLoader.add_constructor("!REQUIRED_ENV", _env_var_constructor)
 
 
-with open("config-default.yml", encoding="UTF-8") as f:
-    _CONFIG_YAML = yaml.safe_load(f)
-
-
 def _recursive_update(original, new):
     """
     Helper method which implements a recursive `dict.update`
@@ -97,20 +96,13 @@ def _recursive_update(original, new):
             original[key] = new[key]
 
 
-if Path("config.yml").exists():
-    log.info("Found `config.yml` file, loading constants from it.")
-    with open("config.yml", encoding="UTF-8") as f:
-        user_config = yaml.safe_load(f)
-    _recursive_update(_CONFIG_YAML, user_config)
-
-
-def check_required_keys(keys):
+def check_required_keys(config, keys):
     """
     Verifies that keys that are set to be required are present in the
     loaded configuration.
     """
     for key_path in keys:
-        lookup = _CONFIG_YAML
+        lookup = config
         try:
             for key in key_path.split('.'):
                 lookup = lookup[key]
@@ -124,12 +116,32 @@ def check_required_keys(keys):
             raise
 
 
-try:
-    required_keys = _CONFIG_YAML['config']['required_keys']
-except KeyError:
-    pass
-else:
-    check_required_keys(required_keys)
+def load_config():
+    """
+    Loads `config-default.yml`, updated with `config.yml` if it
+    exists, and verifies that the required keys are set.
+    """
+
+    with open("config-default.yml", encoding="UTF-8") as f:
+        config = yaml.safe_load(f)
+
+    if Path("config.yml").exists():
+        log.info("Found `config.yml` file, loading constants from it.")
+        with open("config.yml", encoding="UTF-8") as f:
+            user_config = yaml.safe_load(f)
+        _recursive_update(config, user_config)
+
+    try:
+        required_keys = config['config']['required_keys']
+    except KeyError:
+        pass
+    else:
+        check_required_keys(config, required_keys)
+
+    return config
+
+
+_CONFIG_YAML = load_config()
 
 
 class YAMLGetter(type):
@@ -428,6 +440,9 @@ class Reddit(metaclass=YAMLGetter):
     section = "reddit"
 
     request_delay: int
+    min_request_delay: int
+    max_request_delay: int
+    max_concurrent_requests: int
     subreddits: list
 
 
@@ -438,6 +453,17 @@ class Wolfram(metaclass=YAMLGetter):
     guild_limit_day: int
     key: str
 
+    cache_path: str
+    cache_max_entries: int
+    cache_max_size: int
+    cache_ttl: int
+
+
+class Snakes(metaclass=YAMLGetter):
+    section = "snakes"
+
+    cache_path: str
+
 
 class AntiSpam(metaclass=YAMLGetter):
     section = 'anti_spam'
@@ -456,6 +482,148 @@ class BigBrother(metaclass=YAMLGetter):
     header_message_limit: int
 
 
+class ModLog(metaclass=YAMLGetter):
+    section = 'mod_log'
+
+    gzip_uploads: bool
+    multipart_uploads: bool
+
+
+class Metrics(metaclass=YAMLGetter):
+    section = 'metrics'
+
+    host: str
+    port: int
+
+
+# Compiled configuration
+class FilterSnapshot(NamedTuple):
+    """
+    The `filter` section, with lookups turned into sets and the watchlists compiled.
+    """
+
+    enabled: FrozenSet[str]
+    ping_everyone: bool
+    guild_invite_whitelist: FrozenSet[int]
+    domain_blacklist: Tuple[str, ...]
+    word_watchlist: Tuple[Tuple[str, Pattern], ...]
+    token_watchlist: Tuple[Pattern, ...]
+    channel_whitelist: FrozenSet[int]
+    role_whitelist: FrozenSet[int]
+
+    @classmethod
+    def compile(cls, section: Dict[str, Any]) -> "FilterSnapshot":
+        return cls(
+            enabled=frozenset(
+                name for name in ("filter_zalgo", "filter_invites", "filter_domains", "watch_words", "watch_tokens")
+                if section[name]
+            ),
+            ping_everyone=section["ping_everyone"],
+            guild_invite_whitelist=frozenset(section["guild_invite_whitelist"]),
+            domain_blacklist=tuple(domain.lower() for domain in section["domain_blacklist"]),
+            word_watchlist=tuple(
+                (expression, re.compile(fr"\b{expression}\b", re.IGNORECASE))
+                for expression in section["word_watchlist"]
+            ),
+            token_watchlist=tuple(re.compile(expression, re.IGNORECASE) for expression in section["token_watchlist"]),
+            channel_whitelist=frozenset(section["channel_whitelist"]),
+            role_whitelist=frozenset(section["role_whitelist"])
+        )
+
+
+class AntiSpamSnapshot(NamedTuple):
+    """
+    The `anti_spam` section, with the rules in order and the longest rule interval worked out.
+    """
+
+    clean_offending: bool
+    ping_everyone: bool
+    muted_role_id: int
+    remove_after: int
+    rules: Tuple[Tuple[str, Mapping], ...]
+    max_interval: int
+
+    @classmethod
+    def compile(cls, section: Dict[str, Any]) -> "AntiSpamSnapshot":
+        for name, rule in section["rules"].items():
+            for required_key in ('interval', 'max'):
+                if required_key not in rule:
+                    raise ValueError(
+                        f"`{required_key}` is required but was not "
+                        f"set in rule `{name}`'s configuration."
+                    )
+
+        rules = tuple((name, MappingProxyType(dict(rule))) for name, rule in section["rules"].items())
+
+        return cls(
+            clean_offending=section["clean_offending"],
+            ping_everyone=section["ping_everyone"],
+            muted_role_id=section["punishment"]["role_id"],
+            remove_after=section["punishment"]["remove_after"],
+            rules=rules,
+            max_interval=max((rule["interval"] for _, rule in rules), default=0)
+        )
+
+
+class ConfigSnapshot(NamedTuple):
+    """
+    An immutable view of the configuration that is read on every message.
+
+    The `YAMLGetter` classes above look each value up in the loaded YAML when they're accessed,
+    which adds up on hot paths. This is compiled once instead, and is what `get_config` returns
+    until `use_config` swaps in another one, so a handler which holds on to a snapshot never sees
+    half of a reload.
+    """
+
+    filter: FilterSnapshot
+    anti_spam: AntiSpamSnapshot
+    loaded_at: datetime
+    source: Dict[str, Any]
+
+    @classmethod
+    def compile(cls, config: Dict[str, Any]) -> "ConfigSnapshot":
+        return cls(
+            filter=FilterSnapshot.compile(config["filter"]),
+            anti_spam=AntiSpamSnapshot.compile(config["anti_spam"]),
+            loaded_at=datetime.utcnow(),
+            source=config
+        )
+
+
+_SNAPSHOT = ConfigSnapshot.compile(_CONFIG_YAML)
+
+
+def get_config() -> ConfigSnapshot:
+    """
+    Returns the current configuration snapshot.
+    """
+
+    return _SNAPSHOT
+
+
+def compile_config() -> ConfigSnapshot:
+    """
+    Loads the configuration files again and compiles them, without using the result yet.
+
+    Raises if the configuration can't be loaded or is invalid.
+    """
+
+    return ConfigSnapshot.compile(load_config())
+
+
+def use_config(snapshot: ConfigSnapshot):
+    """
+    Swaps in the given snapshot, for both `get_config` and the `YAMLGetter` classes.
+
+    Values that were copied out of the configuration when a module was imported,
+    like most channel and role IDs, still need a restart to change.
+    """
+
+    global _CONFIG_YAML, _SNAPSHOT
+
+    _CONFIG_YAML, _SNAPSHOT = snapshot.source, snapshot
+
+
 # Debug mode
 DEBUG_MODE = True if 'local' in os.environ.get("SITE_URL", "local") else False
 
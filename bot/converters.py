@@ -10,6 +10,7 @@ from fuzzywuzzy import fuzz
 
 from bot.constants import DEBUG_MODE, Keys, URLs
 from bot.utils import disambiguate
+from bot.utils.fuzzy import FuzzyIndex
 
 
 log = logging.getLogger(__name__)
@@ -19,6 +20,10 @@ class Snake(Converter):
     snakes = None
     special_cases = None
 
+    # Maps common names to scientific names, and indexes both for fuzzy matching
+    names = None
+    index = None
+
     async def convert(self, ctx, name):
         await self.build_list()
         name = name.lower()
@@ -26,38 +31,38 @@ class Snake(Converter):
         if name == 'python':
             return 'Python (programming language)'
 
-        def get_potential(iterable, *, threshold=80):
-            nonlocal name
-            potential = []
+        def get_potential(index, *, threshold=80):
+            exact = index.exact(name)
 
-            for item in iterable:
-                original, item = item, item.lower()
+            if exact:
+                return exact[:1]
 
-                if name == item:
-                    return [original]
+            # A name is a potential match if either scorer reaches the threshold
+            potential = {}
 
-                a, b = fuzz.ratio(name, item), fuzz.partial_ratio(name, item)
-                if a >= threshold or b >= threshold:
-                    potential.append(original)
+            for scorer in (fuzz.ratio, fuzz.partial_ratio):
+                for match, score in index.search(name, scorer=scorer, score_cutoff=threshold, limit=None):
+                    potential[match] = max(score, potential.get(match, 0))
 
-            return potential
+            return sorted(potential, key=potential.get, reverse=True)
 
         # Handle special cases
         if name.lower() in self.special_cases:
             return self.special_cases.get(name.lower(), name.lower())
 
-        names = {snake['name']: snake['scientific'] for snake in self.snakes}
-        all_names = names.keys() | names.values()
-        timeout = len(all_names) * (3 / 4)
+        names = self.names
+        timeout = len(self.index) * (3 / 4)
 
         embed = discord.Embed(title='Found multiple choices. Please choose the correct one.', colour=0x59982F)
         embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.avatar_url)
 
-        name = await disambiguate(ctx, get_potential(all_names), timeout=timeout, embed=embed)
+        name = await disambiguate(ctx, get_potential(self.index), timeout=timeout, embed=embed)
         return names.get(name, name)
 
     @classmethod
     async def build_list(cls):
+        if cls.snakes is not None and cls.special_cases is not None:
+            return
 
         headers = {"X-API-KEY": Keys.site_api}
 
@@ -86,6 +91,9 @@ class Snake(Converter):
             )
             cls.snakes = await response.json()
 
+            cls.names = {snake['name']: snake['scientific'] for snake in cls.snakes}
+            cls.index = FuzzyIndex(cls.names.keys() | cls.names.values(), processor=str.lower)
+
         # Get the special cases
         if cls.special_cases is None:
             response = await http_session.get(
@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Iterable, List, Optional, Tuple
+import math
+import operator
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Tuple, Union
 
 from discord import Embed, Member, Reaction
 from discord.abc import User
@@ -93,23 +95,27 @@ class LinePaginator(Paginator):
             self._count += 1
 
     @classmethod
-    async def paginate(cls, lines: Iterable[str], ctx: Context, embed: Embed,
+    async def paginate(cls, lines: Union[Iterable[str], AsyncIterable[str]], ctx: Context, embed: Embed,
                        prefix: str = "", suffix: str = "", max_lines: Optional[int] = None, max_size: int = 500,
                        empty: bool = True, restrict_to_user: User = None, timeout: int=300,
-                       footer_text: str = None):
+                       footer_text: str = None, lookahead: int = 1):
         """
         Use a paginator and set of reactions to provide pagination over a set of lines. The reactions are used to
         switch page, or to finish with pagination.
         When used, this will send a message using `ctx.send()` and apply a set of reactions to it. These reactions may
         be used to change page, or to remove pagination from the message. Pagination will also be removed automatically
         if no reaction is added for five minutes (300 seconds).
+
+        Pages are rendered lazily: `lines` is only consumed as far as the pages that have been viewed plus
+        `lookahead` extra pages, so it may be a huge iterator or an async iterator such as an API cursor. Until
+        `lines` is exhausted, the page count in the footer is an estimate based on `operator.length_hint`.
         >>> embed = Embed()
         >>> embed.set_author(name="Some Operation", url=url, icon_url=icon)
         >>> await LinePaginator.paginate(
         ...     (line for line in lines),
         ...     ctx, embed
         ... )
-        :param lines: The lines to be paginated
+        :param lines: The lines to be paginated, either as a regular or an asynchronous iterable
         :param ctx: Current context object
         :param embed: A pre-configured embed to be used as a template for each page
         :param prefix: Text to place before each page
@@ -120,6 +126,7 @@ class LinePaginator(Paginator):
         :param restrict_to_user: A user to lock pagination operations to for this message, if supplied
         :param timeout: The amount of time in seconds to disable pagination of no reaction is added
         :param footer_text: Text to prefix the page number in the footer with
+        :param lookahead: The number of pages to render ahead of the page currently being shown
         """
 
         def event_check(reaction_: Reaction, user_: Member):
@@ -148,36 +155,42 @@ class LinePaginator(Paginator):
                 ))
             )
 
-        paginator = cls(prefix=prefix, suffix=suffix, max_size=max_size, max_lines=max_lines)
-        current_page = 0
+        def set_footer():
+            page_count = source.page_count_text()
 
-        for line in lines:
-            try:
-                paginator.add_line(line, empty=empty)
-            except Exception:
-                log.exception(f"Failed to add line to paginator: '{line}'")
-                raise  # Should propagate
+            if footer_text:
+                embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{page_count})")
             else:
-                log.trace(f"Added line to paginator: '{line}'")
+                embed.set_footer(text=f"Page {current_page + 1}/{page_count}")
 
-        log.debug(f"Paginator created with {len(paginator.pages)} pages")
+        async def show_page():
+            await source.fill(current_page)
 
-        embed.description = paginator.pages[current_page]
+            embed.description = ""
+            await message.edit(embed=embed)
+            embed.description = source.pages[current_page]
+            set_footer()
+            await message.edit(embed=embed)
 
-        if len(paginator.pages) <= 1:
+        paginator = cls(prefix=prefix, suffix=suffix, max_size=max_size, max_lines=max_lines)
+        source = _LazyPageSource(paginator, lines, empty=empty, lookahead=lookahead)
+        current_page = 0
+
+        await source.fill(current_page)
+        log.debug(f"Paginator created with {source.page_count_text()} pages")
+
+        embed.description = source.pages[current_page]
+
+        if source.exhausted and len(source.pages) <= 1:
             if footer_text:
                 embed.set_footer(text=footer_text)
-                log.trace(f"Setting embed footer to '{footer_text}'")
+                log.trace("Setting embed footer to '%s'", footer_text)
 
             log.debug("There's less than two pages, so we won't paginate - sending single page on its own")
             return await ctx.send(embed=embed)
         else:
-            if footer_text:
-                embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-            else:
-                embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-
-            log.trace(f"Setting embed footer to '{embed.footer.text}'")
+            set_footer()
+            log.trace("Setting embed footer to '%s'", embed.footer.text)
 
             log.debug("Sending first page to channel...")
             message = await ctx.send(embed=embed)
@@ -186,13 +199,15 @@ class LinePaginator(Paginator):
 
         for emoji in PAGINATION_EMOJI:
             # Add all the applicable emoji to the message
-            log.trace(f"Adding reaction: {repr(emoji)}")
+            log.trace("Adding reaction: %r", emoji)
             await message.add_reaction(emoji)
 
         while True:
             try:
-                reaction, user = await ctx.bot.wait_for("reaction_add", timeout=timeout, check=event_check)
-                log.trace(f"Got reaction: {reaction}")
+                reaction, user = await ctx.bot.reaction_router.wait_for(
+                    message.id, timeout=timeout, check=event_check
+                )
+                log.trace("Got reaction: %s", reaction)
             except asyncio.TimeoutError:
                 log.debug("Timed out waiting for a reaction")
                 break  # We're done, no reactions for the last 5 minutes
@@ -205,31 +220,18 @@ class LinePaginator(Paginator):
                 await message.remove_reaction(reaction.emoji, user)
                 current_page = 0
 
-                log.debug(f"Got first page reaction - changing to page 1/{len(paginator.pages)}")
-
-                embed.description = ""
-                await message.edit(embed=embed)
-                embed.description = paginator.pages[current_page]
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-                await message.edit(embed=embed)
+                log.debug(f"Got first page reaction - changing to page 1/{source.page_count_text()}")
+                await show_page()
 
             if reaction.emoji == LAST_EMOJI:
                 await message.remove_reaction(reaction.emoji, user)
-                current_page = len(paginator.pages) - 1
 
-                log.debug(f"Got last page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
+                # The last page can't be known without consuming everything that's left
+                await source.fill_all()
+                current_page = len(source.pages) - 1
 
-                embed.description = ""
-                await message.edit(embed=embed)
-                embed.description = paginator.pages[current_page]
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-                await message.edit(embed=embed)
+                log.debug(f"Got last page reaction - changing to page {current_page + 1}/{len(source.pages)}")
+                await show_page()
 
             if reaction.emoji == LEFT_EMOJI:
                 await message.remove_reaction(reaction.emoji, user)
@@ -239,42 +241,121 @@ class LinePaginator(Paginator):
                     continue
 
                 current_page -= 1
-                log.debug(f"Got previous page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
-
-                embed.description = ""
-                await message.edit(embed=embed)
-                embed.description = paginator.pages[current_page]
-
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
-
-                await message.edit(embed=embed)
+                log.debug(
+                    f"Got previous page reaction - changing to page {current_page + 1}/{source.page_count_text()}"
+                )
+                await show_page()
 
             if reaction.emoji == RIGHT_EMOJI:
                 await message.remove_reaction(reaction.emoji, user)
 
-                if current_page >= len(paginator.pages) - 1:
+                if current_page >= len(source.pages) - 1:
                     log.debug("Got next page reaction, but we're on the last page - ignoring")
                     continue
 
                 current_page += 1
-                log.debug(f"Got next page reaction - changing to page {current_page + 1}/{len(paginator.pages)}")
+                log.debug(f"Got next page reaction - changing to page {current_page + 1}/{source.page_count_text()}")
+                await show_page()
 
-                embed.description = ""
-                await message.edit(embed=embed)
-                embed.description = paginator.pages[current_page]
+        log.debug("Ending pagination and removing all reactions...")
+        await message.clear_reactions()
 
-                if footer_text:
-                    embed.set_footer(text=f"{footer_text} (Page {current_page + 1}/{len(paginator.pages)})")
-                else:
-                    embed.set_footer(text=f"Page {current_page + 1}/{len(paginator.pages)}")
 
-                await message.edit(embed=embed)
+async def _iterate_lines(lines: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """
+    Iterates over either a regular or an asynchronous iterable of lines.
+    """
+
+    if hasattr(lines, "__aiter__"):
+        async for line in lines:
+            yield line
+    else:
+        for line in lines:
+            yield line
 
-        log.debug("Ending pagination and removing all reactions...")
-        await message.clear_reactions()
+
+class _LazyPageSource:
+    """
+    Feeds lines into a LinePaginator on demand, so only the pages that are needed get rendered.
+
+    Pages that have already been rendered are kept, since the source iterator can't be rewound.
+    """
+
+    def __init__(self, paginator: LinePaginator, lines: Union[Iterable[str], AsyncIterable[str]],
+                 empty: bool = True, lookahead: int = 1):
+        self.paginator = paginator
+        self.empty = empty
+        self.lookahead = max(lookahead, 1)
+        self.exhausted = False
+
+        self._lines = _iterate_lines(lines)
+        self._length_hint = operator.length_hint(lines, 0)
+        self._consumed = 0
+
+    @property
+    def pages(self) -> List[str]:
+        """
+        The pages rendered so far.
+        """
+
+        return self.paginator._pages
+
+    async def _add_next_line(self) -> bool:
+        try:
+            line = await self._lines.__anext__()
+        except StopAsyncIteration:
+            self.exhausted = True
+
+            # Close the last, partially-filled page
+            if len(self.paginator._current_page) > 1:
+                self.paginator.close_page()
+
+            return False
+
+        try:
+            self.paginator.add_line(line, empty=self.empty)
+        except Exception:
+            log.exception(f"Failed to add line to paginator: '{line}'")
+            raise  # Should propagate
+
+        self._consumed += 1
+        return True
+
+    async def fill(self, page: int):
+        """
+        Renders pages until the given page and the lookahead pages after it exist, or the lines run out.
+
+        :param page: the zero-indexed page about to be shown
+        """
+
+        while not self.exhausted and len(self.pages) <= page + self.lookahead:
+            await self._add_next_line()
+
+    async def fill_all(self):
+        """
+        Renders every remaining page.
+        """
+
+        while not self.exhausted:
+            await self._add_next_line()
+
+    def page_count_text(self) -> str:
+        """
+        Returns the total number of pages, or an estimate of it if the lines haven't been exhausted yet.
+
+        The estimate is prefixed with a `~` when the length of the lines is known, and suffixed with a `+` otherwise.
+        """
+
+        rendered = len(self.pages)
+
+        if self.exhausted:
+            return str(rendered)
+
+        if self._length_hint > self._consumed and self._consumed:
+            estimate = math.ceil(self._length_hint * rendered / self._consumed)
+            return f"~{max(estimate, rendered + 1)}"
+
+        return f"{rendered}+"
 
 
 class ImagePaginator(Paginator):
@@ -383,7 +464,9 @@ class ImagePaginator(Paginator):
         while True:
             # Start waiting for reactions
             try:
-                reaction, user = await ctx.bot.wait_for("reaction_add", timeout=timeout, check=check_event)
+                reaction, user = await ctx.bot.reaction_router.wait_for(
+                    message.id, timeout=timeout, check=check_event
+                )
             except asyncio.TimeoutError:
                 log.debug("Timed out waiting for a reaction")
                 break  # We're done, no reactions for the last 5 minutes
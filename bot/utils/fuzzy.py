@@ -0,0 +1,251 @@
+import logging
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fuzzywuzzy import fuzz
+
+log = logging.getLogger(__name__)
+
+Scorer = Callable[[str, str], int]
+
+# The size of the n-grams used to find candidates. Bigrams keep the posting lists short
+# without making the q-gram bound below too weak for the short strings we index.
+GRAM_SIZE = 2
+
+
+def _grams(text: str) -> Counter:
+    return Counter(text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1))
+
+
+def _overlap(a: Counter, b: Counter) -> int:
+    """
+    Returns the size of the multiset intersection of two counters.
+    """
+
+    if len(a) > len(b):
+        a, b = b, a
+
+    return sum(min(count, b[key]) for key, count in a.items() if key in b)
+
+
+def _ratio_bound(overlap: int, query_length: int, length: int) -> float:
+    # Every character counted by fuzz.ratio as matching is shared by both strings
+    return 200 * overlap / (query_length + length)
+
+
+def _partial_ratio_bound(overlap: int, query_length: int, length: int) -> float:
+    # The shorter string is compared against a window of the longer one, which is cut short
+    # at the end of the longer string, but can't be shorter than the characters it matches.
+    overlap = min(overlap, query_length, length)
+    return 200 * overlap / (min(query_length, length) + overlap) if overlap else 0
+
+
+# Upper bounds on a scorer's result, given the character overlap and lengths of the two strings.
+# Scorers without an entry here are supported, but every choice has to be scored.
+UPPER_BOUNDS = {
+    fuzz.ratio: _ratio_bound,
+    fuzz.partial_ratio: _partial_ratio_bound,
+}
+
+
+class _Entry:
+    __slots__ = ("choice", "text", "chars", "grams")
+
+    def __init__(self, choice: str, text: str):
+        self.choice = choice
+        self.text = text
+        self.chars = Counter(text)
+        self.grams = _grams(text)
+
+
+class FuzzyIndex:
+    """
+    A precomputed index for fuzzy matching a query against a fixed set of choices.
+
+    `process.extractBests` runs the scorer against every single choice. The index instead keeps the
+    character and bigram counts of each choice, and uses them to throw away choices which can't possibly
+    reach the score cutoff before the (comparatively slow) scorer ever sees them:
+
+    * Choices sharing too few bigrams with the query are never looked at. A string within an edit distance
+      of `d` of another shares at least `max(len) - 1 - 2d` bigrams with it, and the score cutoff puts an
+      upper limit on `d`.
+    * The remaining candidates are scored in order of the best score their shared characters allow,
+      which means a search with a `limit` can stop as soon as no candidate is able to beat the results.
+
+    The index has to be rebuilt with `rebuild` whenever the choices change. `invalidate` can be used to
+    mark it as stale, so the owner knows to rebuild it before the next search.
+    """
+
+    def __init__(self, choices: Iterable[str] = (), *, processor: Callable[[str], str] = None):
+        self.processor = processor or (lambda text: text)
+        self.stale = False
+
+        self._entries: List[_Entry] = []
+        self._exact: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._by_length: Dict[int, List[int]] = {}
+
+        self.rebuild(choices)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rebuild(self, choices: Iterable[str]):
+        """
+        Replaces every choice in the index.
+
+        :param choices: the strings to match queries against
+        """
+
+        self._entries.clear()
+        self._exact.clear()
+        self._postings.clear()
+        self._by_length.clear()
+
+        for choice in dict.fromkeys(choices):
+            text = self.processor(choice)
+
+            if not text:
+                continue
+
+            entry = _Entry(choice, text)
+            index = len(self._entries)
+            self._entries.append(entry)
+
+            self._exact.setdefault(text, []).append(choice)
+            self._by_length.setdefault(len(text), []).append(index)
+
+            for gram in entry.grams:
+                self._postings.setdefault(gram, set()).add(index)
+
+        self.stale = False
+        log.trace(f"Built a fuzzy index of {len(self._entries)} choices.")
+
+    def invalidate(self):
+        """
+        Marks the index as stale. The choices are kept until `rebuild` is called.
+        """
+
+        self.stale = True
+
+    def exact(self, query: str) -> List[str]:
+        """
+        Returns every choice which is equal to the query once both have been processed.
+
+        :param query: the string to look up
+        :return: the matching choices, in the order they were indexed
+        """
+
+        return list(self._exact.get(self.processor(query), ()))
+
+    def search(
+            self, query: str, *, scorer: Scorer = fuzz.ratio, score_cutoff: int = 0, limit: Optional[int] = 5
+    ) -> List[Tuple[str, int]]:
+        """
+        Finds the choices most similar to the query, like `process.extractBests` does.
+
+        :param query: the string to match
+        :param scorer: the fuzzywuzzy scorer used to compare the processed query and choices
+        :param score_cutoff: the lowest score a choice may have to be returned
+        :param limit: the maximum number of matches to return, or `None` for every match
+        :return: a list of `(choice, score)` tuples, the best match first
+        """
+
+        text = self.processor(query)
+
+        if not text or limit == 0:
+            return []
+
+        bound = UPPER_BOUNDS.get(scorer)
+
+        if bound is None or score_cutoff <= 0:
+            candidates = range(len(self._entries))
+        else:
+            candidates = self._candidates(text, scorer, score_cutoff)
+
+        # Order the candidates by the best score they could possibly reach
+        chars = Counter(text)
+        ranked = []
+
+        for index in candidates:
+            entry = self._entries[index]
+
+            if bound is None:
+                best = 100
+            else:
+                best = bound(_overlap(chars, entry.chars), len(text), len(entry.text))
+
+                # fuzzywuzzy rounds scores to the nearest integer
+                if best + 0.5 < score_cutoff:
+                    continue
+
+            ranked.append((best, index, entry))
+
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        results = []
+
+        for best, index, entry in ranked:
+            if limit is not None and len(results) >= limit and best + 0.5 < results[-1][2]:
+                # None of the remaining candidates can beat the worst result we're keeping
+                break
+
+            score = scorer(text, entry.text)
+
+            if score >= score_cutoff:
+                results.append((index, entry.choice, score))
+                results.sort(key=lambda item: -item[2])
+
+                if limit is not None:
+                    del results[limit:]
+
+        results.sort(key=lambda item: (-item[2], item[0]))
+        return [(choice, score) for _, choice, score in results]
+
+    def _candidates(self, text: str, scorer: Scorer, score_cutoff: int) -> Iterable[int]:
+        """
+        Finds the indexes of the choices that share enough bigrams with the query to reach the cutoff.
+        """
+
+        # Round down for safety, since a score just below the cutoff may still be rounded up to it
+        similarity = (score_cutoff - 0.5) / 100
+        query_length = len(text)
+
+        def required_grams(length: int) -> float:
+            # The number of bigrams two strings must share for the scorer to reach the cutoff,
+            # based on the largest edit distance that the cutoff allows.
+            if scorer is fuzz.ratio:
+                distance = (1 - similarity) * (query_length + length)
+                return max(query_length, length) - (GRAM_SIZE - 1) - GRAM_SIZE * distance
+
+            shortest = min(query_length, length)
+            distance = (1 - similarity) * 2 * shortest
+            return shortest - (GRAM_SIZE - 1) - GRAM_SIZE * distance
+
+        def length_allowed(length: int) -> bool:
+            if scorer is fuzz.ratio:
+                return _ratio_bound(min(query_length, length), query_length, length) + 0.5 >= score_cutoff
+            return True
+
+        # Lengths where the bound above is too weak to rule out anything have to be scanned in full
+        lengths = [length for length in self._by_length if length_allowed(length)]
+        required = {length: required_grams(length) for length in lengths}
+        candidates = set()
+
+        for length in lengths:
+            if required[length] <= 0:
+                candidates.update(self._by_length[length])
+
+        shared = Counter()
+        query_grams = _grams(text)
+
+        for gram, count in query_grams.items():
+            for index in self._postings.get(gram, ()):
+                shared[index] += min(count, self._entries[index].grams[gram])
+
+        for index, count in shared.items():
+            length = len(self._entries[index].text)
+
+            if length in required and count >= required[length]:
+                candidates.add(index)
+
+        return candidates
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from bot.utils.metrics import MetricsRegistry
+
+log = logging.getLogger(__name__)
+
+# How often the loop is asked to wake the sampler up, in seconds
+SAMPLE_INTERVAL = 0.1
+
+# A callback holding the loop for longer than this is reported, with its stack
+SLOW_CALLBACK_THRESHOLD = 0.25
+
+# How often the watchdog thread checks whether the loop is stuck, in seconds
+WATCHDOG_INTERVAL = 0.05
+
+# The percentiles are calculated over this many of the latest samples, about a minute's worth
+RECENT_SAMPLES = 600
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# The buckets of the lag histogram, in seconds. Anything below a few milliseconds is just noise.
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COGS_PACKAGE = "bot.cogs."
+
+
+class BlockingCall(NamedTuple):
+    heartbeat: float
+    cog: str
+    handler: str
+    stack: str
+
+
+def attribute_stack(frame) -> Tuple[str, str]:
+    """
+    Works out which cog and handler a stack of frames, innermost first, is running on behalf of.
+
+    The outermost frame inside a cog module is taken to be the handler, since that's the coroutine the
+    event or command was dispatched to. Frames outside of the cogs, like the library code running the
+    handler, are skipped.
+
+    :return: the cog's class (or module) name and the handler's name, or `"unknown"` for both
+    """
+
+    cog = handler = "unknown"
+
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+
+        if module.startswith(COGS_PACKAGE):
+            owner = frame.f_locals.get("self")
+
+            if owner is not None:
+                cog = type(owner).__name__
+            else:
+                cog = module[len(COGS_PACKAGE):]
+
+            handler = f"{cog}.{frame.f_code.co_name}"
+
+        frame = frame.f_back
+
+    return cog, handler
+
+
+class LoopLagMonitor:
+    """
+    Continuously measures how late the event loop runs its callbacks, and finds out what held it up.
+
+    A sampler on the loop sleeps for `SAMPLE_INTERVAL` over and over, and the time it wakes up after the
+    deadline is the scheduling delay every other callback suffered as well. Meanwhile, a watchdog thread
+    checks whether the sampler has gone quiet for longer than `SLOW_CALLBACK_THRESHOLD`. If it has, it
+    takes the stack of the loop's thread while it's still stuck, so the code responsible can be named.
+    Once the loop is running again, the blocking call is logged with its stack and counted against the
+    cog and handler it was attributed to.
+
+    When the loop is busy with a lot of short callbacks rather than a single long one, the captured stack
+    is simply whichever of them happened to be running.
+
+    The lag is published to the metrics registry as a histogram, and as percentiles over the latest
+    `RECENT_SAMPLES` samples. The monitor is attached to the bot as `bot.loop_monitor`.
+    """
+
+    def __init__(
+            self, loop: asyncio.AbstractEventLoop, registry: MetricsRegistry, *,
+            threshold: float = SLOW_CALLBACK_THRESHOLD
+    ):
+        self.loop = loop
+        self.threshold = threshold
+
+        self.lag = registry.histogram(
+            "bot_event_loop_lag_seconds", "How late the event loop ran a scheduled callback.", buckets=LAG_BUCKETS
+        )
+        self.lag_percentiles = registry.gauge(
+            "bot_event_loop_lag_recent_seconds", f"Percentiles of the latest {RECENT_SAMPLES} loop lag samples.",
+            ("quantile",)
+        )
+        self.slow_callbacks = registry.counter(
+            "bot_event_loop_slow_callbacks_total",
+            f"Callbacks which held the event loop for longer than {threshold}s.", ("cog", "handler")
+        )
+
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+        self.samples = 0
+
+        self._heartbeat = time.perf_counter()
+        self._blocking_call: Optional[BlockingCall] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """
+        Starts the sampler on the loop and the watchdog thread, unless they're running already.
+        """
+
+        if self._task is not None:
+            return
+
+        self._stopped.clear()
+        self._task = self.loop.create_task(self._sample())
+
+        watchdog = threading.Thread(target=self._watch, name="LoopLagWatchdog", daemon=True)
+        watchdog.start()
+
+    def stop(self):
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def percentiles(self) -> Dict[float, float]:
+        """
+        Returns the lag percentiles of the latest samples, in seconds.
+        """
+
+        if not self.recent:
+            return {}
+
+        samples = sorted(self.recent)
+        return {q: samples[min(int(q * len(samples)), len(samples) - 1)] for q in PERCENTILES}
+
+    async def _sample(self):
+        self._loop_thread = threading.get_ident()
+
+        while True:
+            start = time.perf_counter()
+            self._heartbeat = start
+
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+            lag = max(0.0, time.perf_counter() - start - SAMPLE_INTERVAL)
+            self._record(start, lag)
+
+    def _record(self, heartbeat: float, lag: float):
+        self.lag.observe(lag)
+        self.recent.append(lag)
+        self.samples += 1
+
+        # Percentiles are refreshed once per second or so, there's no need to sort on every sample
+        if self.samples % 10 == 0:
+            for q, value in self.percentiles().items():
+                self.lag_percentiles.set(value, q)
+
+        if lag < self.threshold:
+            return
+
+        blocking_call = self._blocking_call
+        self._blocking_call = None
+
+        if blocking_call is None or blocking_call.heartbeat != heartbeat:
+            # The watchdog didn't catch it in the act, which happens when the loop was only just over the threshold
+            self.slow_callbacks.inc("unknown", "unknown")
+            log.warning(f"The event loop was blocked for {lag:.3f}s, but no stack was captured.")
+            return
+
+        self.slow_callbacks.inc(blocking_call.cog, blocking_call.handler)
+        log.warning(
+            "The event loop was blocked for %.3fs by %s. Stack at the time:\n%s",
+            lag, blocking_call.handler, blocking_call.stack
+        )
+
+    def _watch(self):
+        while not self._stopped.wait(WATCHDOG_INTERVAL):
+            heartbeat = self._heartbeat
+
+            if time.perf_counter() - heartbeat < SAMPLE_INTERVAL + self.threshold:
+                continue
+
+            # Only capture each stall once, at the point it crosses the threshold
+            if self._blocking_call is not None and self._blocking_call.heartbeat == heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+
+            if frame is None:
+                continue
+
+            cog, handler = attribute_stack(frame)
+            stack = "".join(traceback.format_stack(frame))
+            self._blocking_call = BlockingCall(heartbeat, cog, handler, stack)
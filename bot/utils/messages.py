@@ -1,13 +1,20 @@
 import asyncio
 import contextlib
-from io import BytesIO
+import logging
+from tempfile import SpooledTemporaryFile
 from typing import Sequence
 
-from discord import Embed, File, Message, TextChannel
+from aiohttp import ClientError, ClientSession
+from discord import Attachment, Embed, File, Message, TextChannel
 from discord.abc import Snowflake
 from discord.errors import HTTPException
 
+log = logging.getLogger(__name__)
+
 MAX_SIZE = 1024 * 1024 * 8  # 8 Mebibytes
+SPOOL_SIZE = 1024 * 1024  # Attachments larger than 1 MiB are spooled to disk while they're relayed
+CHUNK_SIZE = 64 * 1024
+MAX_CONCURRENT_DOWNLOADS = 4
 
 
 async def wait_for_deletion(
@@ -68,43 +75,113 @@ async def wait_for_deletion(
         )
 
     with contextlib.suppress(asyncio.TimeoutError):
-        await bot.wait_for(
-            'reaction_add',
+        await bot.reaction_router.wait_for(
+            message.id,
             check=check,
             timeout=timeout
         )
         await message.delete()
 
 
-async def send_attachments(message: Message, destination: TextChannel):
+async def send_attachments(
+    message: Message,
+    destination: TextChannel,
+    session: ClientSession = None,
+    semaphore: asyncio.Semaphore = None
+):
     """
     Re-uploads each attachment in a message to the given channel.
 
     Each attachment is sent as a separate message to more easily comply with the 8 MiB request size limit.
     If attachments are too large, they are instead grouped into a single embed which links to them.
 
+    Attachments are downloaded concurrently and streamed into spooled temporary files, so at most `SPOOL_SIZE` bytes
+    of each attachment are held in memory. The uploads are still sent in order.
+
     :param message: the message whose attachments to re-upload
     :param destination: the channel in which to re-upload the attachments
+    :param session: an aiohttp session used to stream the downloads, e.g. `bot.http_session`.
+                    If not given, a session is opened just for this call.
+    :param semaphore: bounds the number of concurrent downloads, which may be shared between calls
     """
 
+    if session is None:
+        async with ClientSession() as session:
+            return await send_attachments(message, destination, session, semaphore)
+
     large = []
+    small = []
+
+    # This should avoid most files that are too large, but some may get through hence the try-catch.
+    # Allow 512 bytes of leeway for the rest of the request.
     for attachment in message.attachments:
-        try:
-            # This should avoid most files that are too large, but some may get through hence the try-catch.
-            # Allow 512 bytes of leeway for the rest of the request.
-            if attachment.size <= MAX_SIZE - 512:
-                with BytesIO() as file:
-                    await attachment.save(file)
-                    await destination.send(file=File(file, filename=attachment.filename))
-            else:
-                large.append(attachment)
-        except HTTPException as e:
-            if e.status == 413:
+        if attachment.size <= MAX_SIZE - 512:
+            small.append(attachment)
+        else:
+            large.append(attachment)
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+    downloads = [
+        asyncio.ensure_future(_stream_attachment(attachment, session, semaphore))
+        for attachment in small
+    ]
+
+    try:
+        for attachment, download in zip(small, downloads):
+            try:
+                file = await download
+            except (ClientError, asyncio.TimeoutError) as e:
+                log.warning(f"Failed to download attachment {attachment.url}, linking it instead: {e}")
                 large.append(attachment)
-            else:
-                raise
+                continue
+
+            try:
+                with file:
+                    await destination.send(file=File(file, filename=attachment.filename))
+            except HTTPException as e:
+                if e.status == 413:
+                    large.append(attachment)
+                else:
+                    raise
+    finally:
+        # Don't leave downloads running or temporary files open if an upload failed
+        for download in downloads:
+            if not download.done():
+                download.cancel()
+            elif not download.cancelled() and download.exception() is None:
+                download.result().close()
 
     if large:
         embed = Embed(description=f"\n".join(f"[{attachment.filename}]({attachment.url})" for attachment in large))
         embed.set_footer(text="Attachments exceed upload size limit.")
         await destination.send(embed=embed)
+
+
+async def _stream_attachment(
+    attachment: Attachment, session: ClientSession, semaphore: asyncio.Semaphore
+) -> SpooledTemporaryFile:
+    """
+    Streams an attachment into a temporary file, which only rolls over to disk once it exceeds `SPOOL_SIZE`.
+    """
+
+    async with semaphore:
+        file = SpooledTemporaryFile(max_size=SPOOL_SIZE)
+
+        try:
+            async with session.get(attachment.url) as response:
+                response.raise_for_status()
+
+                while True:
+                    chunk = await response.content.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+
+                    file.write(chunk)
+        except BaseException:
+            file.close()
+            raise
+
+        file.seek(0)
+        return file
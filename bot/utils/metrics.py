@@ -0,0 +1,439 @@
+import asyncio
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import ClientSession
+from yarl import URL
+
+log = logging.getLogger(__name__)
+
+# Latency buckets in seconds, roughly covering everything from a cached lookup to a slow API call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Numeric path segments, like IDs, would otherwise create a separate label for every object
+ID_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+# Placeholders in URL templates, like `{user_id}`, which match any single path segment
+PLACEHOLDER_RE = re.compile(r"^\{\w*\}$")
+
+# How long a client of the metrics endpoint gets to send its request
+REQUEST_TIMEOUT = 5
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def normalize_path(path: str) -> str:
+    """
+    Replaces numeric path segments with `:id`, so requests for different objects share an endpoint label.
+    """
+
+    return ID_SEGMENT_RE.sub("/:id", path) or "/"
+
+
+Route = Tuple[str, ...]
+
+
+def compile_routes(urls: Iterable[str]) -> Dict[str, List[Route]]:
+    """
+    Splits URLs, or URL templates with `{placeholder}` segments, into their path segments by host.
+
+    The routes of each host are sorted from the longest to the shortest, so the most specific one matches first.
+    """
+
+    routes: Dict[str, List[Route]] = {}
+
+    for url in urls:
+        parsed = URL(url)
+
+        if not parsed.host:
+            continue
+
+        segments = tuple(
+            ":id" if PLACEHOLDER_RE.match(segment) else segment
+            for segment in parsed.path.strip("/").split("/") if segment
+        )
+        routes.setdefault(parsed.host, []).append(segments)
+
+    for host_routes in routes.values():
+        host_routes.sort(key=len, reverse=True)
+
+    return routes
+
+
+def endpoint_label(url: URL, routes: Dict[str, List[Route]]) -> str:
+    """
+    Labels a request URL by its host and the longest known route it falls under, or by its host alone.
+
+    Only known routes end up in labels, since paths like attachment file names or avatar hashes
+    would otherwise create a new set of series for every request.
+    """
+
+    segments = [segment for segment in url.path.split("/") if segment]
+
+    for route in routes.get(url.host, ()):
+        if len(route) <= len(segments) and all(
+            expected == ":id" or expected == segment for expected, segment in zip(route, segments)
+        ):
+            return f"{url.host}/{'/'.join(route)}"
+
+    return url.host or "other"
+
+
+class Metric(ABC):
+    """
+    The base class of the metric types, keeping a value for every combination of label values.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._values: Dict[Labels, object] = {}
+
+    def _key(self, labels: Tuple) -> Labels:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes the labels {self.labelnames}, got {labels}")
+
+        return tuple(str(label) for label in labels)
+
+    def labels(self) -> List[Labels]:
+        """
+        Returns every combination of label values that has been recorded so far.
+        """
+
+        return list(self._values)
+
+    def render(self) -> List[str]:
+        """
+        Renders the metric in the Prometheus text exposition format.
+        """
+
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}"
+        ]
+        lines.extend(self._render_samples())
+        return lines
+
+    @abstractmethod
+    def _render_samples(self) -> List[str]:
+        """
+        Renders a line for every sample of the metric, without the `HELP` and `TYPE` comments.
+        """
+
+
+class Counter(Metric):
+    """
+    A value that only ever goes up, like the number of times a command was used.
+    """
+
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """
+    A value that can go up and down, like the latest estimate of a percentile.
+    """
+
+    type = "gauge"
+
+    def set(self, value: float, *labels):
+        self._values[self._key(labels)] = value
+
+    def value(self, *labels) -> Optional[float]:
+        return self._values.get(self._key(labels))
+
+    def _render_samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(Metric):
+    """
+    Counts observations, like durations, into buckets so their distribution can be estimated.
+    """
+
+    type = "histogram"
+
+    def __init__(
+            self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+            buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        series = self._values.get(key)
+
+        if series is None:
+            # The counts per bucket, not cumulative, followed by the sum and count of the observations
+            series = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labels) -> int:
+        series = self._values.get(self._key(labels))
+        return series[2] if series else 0
+
+    def sum(self, *labels) -> float:
+        series = self._values.get(self._key(labels))
+        return series[1] if series else 0.0
+
+    def quantile(self, q: float, *labels) -> Optional[float]:
+        """
+        Estimates a quantile of the observations, interpolating within the bucket it falls into.
+
+        This is the same estimate Prometheus' `histogram_quantile` makes, so it's only as precise as the
+        buckets are. Quantiles falling into the last, unbounded bucket are reported as the largest bound.
+
+        :param q: the quantile to estimate, between 0 and 1
+        :param labels: the label values of the series to look at
+        :return: the estimated value, or `None` if nothing was observed
+        """
+
+        series = self._values.get(self._key(labels))
+
+        if not series or not series[2]:
+            return None
+
+        rank = q * series[2]
+        cumulative = 0
+        lower = 0.0
+
+        for bound, count in zip(self.buckets, series[0]):
+            if count and cumulative + count >= rank:
+                if bound == float("inf"):
+                    return lower
+
+                return lower + (bound - lower) * (rank - cumulative) / count
+
+            cumulative += count
+            lower = bound
+
+        return lower
+
+    def _render_samples(self) -> List[str]:
+        lines = []
+
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds all of the bot's metrics, and renders them for Prometheus.
+
+    Metrics are created on first use through `counter`, `gauge` and `histogram`, which return the existing
+    metric when it's requested again, so a cog that's reloaded keeps adding to the same series.
+    The registry is attached to the bot as `bot.metrics`.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def __iter__(self):
+        return iter(self._metrics.values())
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Tuple[str, ...], **kwargs):
+        metric = self._metrics.get(name)
+
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"The metric {name} is already registered with a different type or labels")
+
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+            self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+            buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+
+        lines = []
+
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedClientSession(ClientSession):
+    """
+    An aiohttp session that records the latency and status of every request it makes.
+
+    Requests are labelled by method and by the known route they fall under, see `endpoint_label`.
+    The duration covers the time until the response headers arrive, since the body is read by the
+    caller afterwards.
+    """
+
+    def __init__(self, *args, metrics: MetricsRegistry, routes: Iterable[str] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # `_request` is private to aiohttp, so make some noise if an upgrade stops it from being called
+        if not callable(getattr(ClientSession, "_request", None)):
+            log.warning("aiohttp's ClientSession has no `_request` method, outbound HTTP requests won't be recorded")
+
+        self.routes = compile_routes(routes)
+
+        self.requests_total = metrics.counter(
+            "bot_http_requests_total",
+            "Outbound HTTP requests made through the bot's aiohttp session.",
+            ("method", "endpoint", "status")
+        )
+        self.request_duration = metrics.histogram(
+            "bot_http_request_duration_seconds",
+            "Time until the response headers of an outbound HTTP request arrived.",
+            ("method", "endpoint")
+        )
+
+    async def _request(self, method, url, **kwargs):
+        endpoint = endpoint_label(URL(url), self.routes)
+        status = "error"
+        start = time.perf_counter()
+
+        try:
+            response = await super()._request(method, url, **kwargs)
+            status = str(response.status)
+            return response
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self.request_duration.observe(time.perf_counter() - start, method, endpoint)
+            self.requests_total.inc(method, endpoint, status)
+
+
+class MetricsServer:
+    """
+    A minimal HTTP server that serves the registry at `/metrics` for Prometheus to scrape.
+
+    Only `GET /metrics` is supported, and every response closes the connection, which is all
+    a scraper needs.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int):
+        self.registry = registry
+        self.host = host
+        self.port = port
+
+        self._server = None
+
+    async def start(self):
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError:
+            log.exception(f"Failed to start the metrics endpoint on {self.host}:{self.port}")
+            return
+
+        log.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+
+            # Skip the headers, none of them change the response
+            while True:
+                line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            method, path, *_ = request_line.decode("latin-1").split() + ["", ""]
+
+            if method == "GET" and path.split("?")[0] == "/metrics":
+                self._respond(writer, "200 OK", self.registry.render())
+            else:
+                self._respond(writer, "404 Not Found", "Not found, try /metrics\n")
+
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: str, body: str):
+        payload = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1")
+        )
+        writer.write(payload)
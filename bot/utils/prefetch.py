@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PrefetchBuffer(Generic[T]):
+    """
+    Keeps a number of results of a coroutine function ready ahead of time.
+
+    This is meant for endpoints that return a random item, like the snake facts API, so a command
+    can take an item that was fetched earlier instead of waiting on the network. Background workers
+    refill the buffer whenever an item is taken. If the buffer is empty, `get` falls back to calling
+    the fetch function directly.
+
+    Workers only run between `start` and `stop`. Cogs should start their buffers when they're
+    loaded and stop them in `__unload`.
+    """
+
+    def __init__(
+            self, loop: asyncio.AbstractEventLoop, fetch: Callable[[], Awaitable[T]], *,
+            size: int = 5, workers: int = 1, semaphore: Optional[asyncio.Semaphore] = None,
+            retry_delay: float = 30, name: str = None
+    ):
+        """
+        :param loop: the event loop to run the workers on
+        :param fetch: a coroutine function taking no arguments that returns a single new item
+        :param size: the number of items to keep ready
+        :param workers: the number of items of this buffer that may be fetched at the same time
+        :param semaphore: an optional semaphore shared with other buffers, limiting their combined concurrency
+        :param retry_delay: the number of seconds a worker waits after a failed fetch
+        :param name: a name for the buffer, used in logs
+        """
+
+        self.loop = loop
+        self.fetch = fetch
+        self.workers = workers
+        self.semaphore = semaphore
+        self.retry_delay = retry_delay
+        self.name = name or getattr(fetch, "__name__", repr(fetch))
+
+        self._items = asyncio.Queue(maxsize=size)
+        self._tasks: List[asyncio.Task] = []
+
+    def __len__(self):
+        return self._items.qsize()
+
+    def start(self):
+        """
+        Starts the background workers, unless they're running already.
+        """
+
+        if self._tasks:
+            return
+
+        self._tasks = [self.loop.create_task(self._worker()) for _ in range(self.workers)]
+        log.trace(f"Started {self.workers} prefetch workers for {self.name}.")
+
+    def stop(self):
+        """
+        Cancels the background workers. Items that were already fetched are kept.
+        """
+
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks.clear()
+
+    async def get(self) -> T:
+        """
+        Takes an item from the buffer, or fetches a new one if the buffer is empty.
+
+        Errors raised by the fetch function are only propagated in the latter case.
+        """
+
+        try:
+            return self._items.get_nowait()
+        except asyncio.QueueEmpty:
+            log.debug(f"The prefetch buffer for {self.name} is empty, fetching an item directly.")
+
+        return await self.fetch()
+
+    async def _fetch_one(self) -> T:
+        if self.semaphore is None:
+            return await self.fetch()
+
+        async with self.semaphore:
+            return await self.fetch()
+
+    async def _worker(self):
+        while True:
+            try:
+                item = await self._fetch_one()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"Failed to prefetch an item for {self.name}, retrying in {self.retry_delay}s: {e!r}")
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            # This waits for as long as the buffer is full
+            await self._items.put(item)
+            log.trace(f"Prefetched an item for {self.name}, which now has {len(self)} ready.")
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from discord import Reaction, User
+from discord.ext.commands import Bot
+
+log = logging.getLogger(__name__)
+
+ReactionCallback = Callable[[Reaction, User], Awaitable[None]]
+
+
+class _Timer:
+    """
+    A single entry in a TimeoutWheel. Returned by `TimeoutWheel.schedule` so it can be cancelled.
+    """
+
+    __slots__ = ("deadline", "callback", "slot", "cancelled")
+
+    def __init__(self, deadline: float, callback: Callable[[], None], slot: int):
+        self.deadline = deadline
+        self.callback = callback
+        self.slot = slot
+        self.cancelled = False
+
+
+class TimeoutWheel:
+    """
+    A hashed timing wheel shared by every reaction widget.
+
+    Instead of each widget owning its own `call_later` handle or sleeping task, timers are bucketed into
+    `resolution`-second slots and a single tick callback expires them. Scheduling and cancelling are O(1),
+    and the wheel stops ticking entirely while it's empty.
+
+    Timers may fire up to `resolution` seconds late, but never early.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, resolution: float = 1.0, slots: int = 512):
+        self.loop = loop
+        self.resolution = resolution
+        self._slots: List[Set[_Timer]] = [set() for _ in range(slots)]
+        self._size = 0
+        self._last_tick = self._tick_for(loop.time())
+        self._tick_handle: Optional[asyncio.Handle] = None
+
+    def __len__(self):
+        return self._size
+
+    def _tick_for(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> _Timer:
+        """
+        Calls `callback` once `delay` seconds have passed.
+
+        :param delay: the number of seconds to wait before firing
+        :param callback: a synchronous callable taking no arguments
+        :return: a timer handle which can be passed to `TimeoutWheel.cancel`
+        """
+
+        now = self.loop.time()
+        deadline = now + delay
+
+        if self._tick_handle is None:
+            # The wheel was idle, so start ticking from the current slot
+            self._last_tick = self._tick_for(now)
+            self._tick_handle = self.loop.call_later(self.resolution, self._tick)
+
+        # Round up, so that a timer is never processed before its deadline
+        tick = max(self._tick_for(deadline) + 1, self._last_tick + 1)
+        timer = _Timer(deadline, callback, tick % len(self._slots))
+
+        self._slots[timer.slot].add(timer)
+        self._size += 1
+
+        return timer
+
+    def cancel(self, timer: _Timer):
+        """
+        Cancels a timer if it hasn't fired yet.
+
+        :param timer: the handle returned by `TimeoutWheel.schedule`
+        """
+
+        if timer.cancelled:
+            return
+
+        timer.cancelled = True
+        slot = self._slots[timer.slot]
+
+        if timer in slot:
+            slot.discard(timer)
+            self._size -= 1
+
+    def _tick(self):
+        now = self.loop.time()
+        current_tick = self._tick_for(now)
+
+        # The loop may have been blocked for several ticks, so catch up on every slot we skipped.
+        # There's no point going around the wheel more than once though.
+        elapsed = min(current_tick - self._last_tick, len(self._slots))
+        expired = []
+
+        for tick in range(current_tick - elapsed + 1, current_tick + 1):
+            slot = self._slots[tick % len(self._slots)]
+
+            # Timers more than one revolution away stay in the slot for a later round
+            due = [timer for timer in slot if timer.deadline <= now]
+
+            for timer in due:
+                slot.discard(timer)
+
+            expired.extend(due)
+
+        self._last_tick = current_tick
+        self._size -= len(expired)
+
+        for timer in expired:
+            timer.cancelled = True
+
+            try:
+                timer.callback()
+            except Exception:
+                log.exception("Unhandled exception in timeout wheel callback")
+
+        if self._size:
+            self._tick_handle = self.loop.call_later(self.resolution, self._tick)
+        else:
+            self._tick_handle = None
+
+
+class _Waiter:
+    __slots__ = ("future", "check", "timer")
+
+    def __init__(self, future: asyncio.Future, check: Optional[Callable[[Reaction, User], bool]]):
+        self.future = future
+        self.check = check
+        self.timer: Optional[_Timer] = None
+
+
+class ReactionRouter:
+    """
+    Dispatches `reaction_add` events to the widget that owns the reacted-to message.
+
+    `Bot.wait_for` evaluates the check of every pending waiter on every reaction, which makes
+    each reaction cost O(active widgets). The router keys waiters and listeners by message ID instead,
+    so only the checks registered for that one message are ever evaluated.
+
+    An instance is attached to the bot as `bot.reaction_router` on startup.
+    """
+
+    def __init__(self, bot: Bot, resolution: float = 1.0):
+        self.bot = bot
+        self.wheel = TimeoutWheel(bot.loop, resolution=resolution)
+
+        self._waiters: Dict[int, List[_Waiter]] = {}
+        self._listeners: Dict[int, List[ReactionCallback]] = {}
+
+        bot.add_listener(self.on_reaction_add)
+
+    def wait_for(
+            self, message_id: int, *,
+            check: Callable[[Reaction, User], bool] = None, timeout: float = None
+    ) -> Awaitable:
+        """
+        A drop-in replacement for `bot.wait_for("reaction_add", ...)` scoped to a single message.
+
+        The check no longer needs to compare `reaction.message.id`, although doing so is harmless.
+
+        :param message_id: the ID of the message to wait for a reaction on
+        :param check: a predicate taking the reaction and the user, as with `Bot.wait_for`
+        :param timeout: the number of seconds to wait before raising `asyncio.TimeoutError`
+        :return: a future resolving to a `(reaction, user)` tuple
+        """
+
+        future = self.bot.loop.create_future()
+        waiter = _Waiter(future, check)
+
+        self._waiters.setdefault(message_id, []).append(waiter)
+
+        if timeout is not None:
+            waiter.timer = self.wheel.schedule(timeout, lambda: self._expire(waiter))
+
+        future.add_done_callback(lambda _: self._discard_waiter(message_id, waiter))
+        return future
+
+    def add_listener(self, message_id: int, callback: ReactionCallback):
+        """
+        Registers a coroutine function which is called for every reaction added to the given message.
+
+        Unlike `wait_for`, the listener stays registered until `remove_listener` is called.
+
+        :param message_id: the ID of the message to listen on
+        :param callback: a coroutine function taking the reaction and the user
+        """
+
+        self._listeners.setdefault(message_id, []).append(callback)
+
+    def remove_listener(self, message_id: int, callback: ReactionCallback):
+        """
+        Unregisters a listener added with `add_listener`. Does nothing if it isn't registered.
+
+        :param message_id: the ID of the message the listener was registered on
+        :param callback: the coroutine function to remove
+        """
+
+        listeners = self._listeners.get(message_id)
+
+        if not listeners or callback not in listeners:
+            return
+
+        listeners.remove(callback)
+
+        if not listeners:
+            del self._listeners[message_id]
+
+    def _expire(self, waiter: _Waiter):
+        if not waiter.future.done():
+            waiter.future.set_exception(asyncio.TimeoutError())
+
+    def _discard_waiter(self, message_id: int, waiter: _Waiter):
+        if waiter.timer is not None:
+            self.wheel.cancel(waiter.timer)
+
+        waiters = self._waiters.get(message_id)
+
+        if waiters is None or waiter not in waiters:
+            return
+
+        waiters.remove(waiter)
+
+        if not waiters:
+            del self._waiters[message_id]
+
+    async def _run_listener(self, callback: ReactionCallback, reaction: Reaction, user: User):
+        try:
+            await callback(reaction, user)
+        except Exception:
+            log.exception(f"Unhandled exception in reaction listener {callback!r}")
+
+    async def on_reaction_add(self, reaction: Reaction, user: User):
+        message_id = reaction.message.id
+
+        # Copy, since resolving a future removes the waiter from the list
+        for waiter in list(self._waiters.get(message_id, ())):
+            future = waiter.future
+
+            if future.done():
+                continue
+
+            try:
+                result = waiter.check is None or waiter.check(reaction, user)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                if result:
+                    future.set_result((reaction, user))
+
+        for callback in list(self._listeners.get(message_id, ())):
+            self.bot.loop.create_task(self._run_listener(callback, reaction, user))
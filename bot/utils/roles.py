@@ -0,0 +1,95 @@
+import logging
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+from discord import Guild, Member, Role, User
+from discord.ext.commands import Bot
+
+log = logging.getLogger(__name__)
+
+NO_ROLES: FrozenSet[int] = frozenset()
+
+
+class RoleCache:
+    """
+    Caches the set of role IDs of each member, so permission checks are set operations.
+
+    `Member.roles` builds and sorts a list of `Role` objects on every access, which adds up when
+    every message, reaction and command check walks it. The sets are built the first time a member
+    is checked, and dropped whenever discord.py tells us the member or a role changed. After a
+    reconnect, discord.py rebuilds the members without telling us what changed while the bot was
+    away, so everything is dropped then.
+
+    Users outside of a guild have no roles, and get an empty set.
+    """
+
+    def __init__(self, bot: Bot):
+        self._roles: Dict[Tuple[int, int], FrozenSet[int]] = {}
+
+        bot.add_listener(self.on_ready)
+        bot.add_listener(self.on_guild_available)
+        bot.add_listener(self.on_member_update)
+        bot.add_listener(self.on_member_remove)
+        bot.add_listener(self.on_guild_role_delete)
+        bot.add_listener(self.on_guild_remove)
+
+    def __len__(self):
+        return len(self._roles)
+
+    def role_ids(self, member: User) -> FrozenSet[int]:
+        """
+        Returns the IDs of the member's roles, including the guild's default role.
+        """
+
+        if not isinstance(member, Member):
+            return NO_ROLES
+
+        key = (member.guild.id, member.id)
+        role_ids = self._roles.get(key)
+
+        if role_ids is None:
+            role_ids = self._roles[key] = frozenset(role.id for role in member.roles)
+
+        return role_ids
+
+    def has_any(self, member: User, role_ids: Iterable[int]) -> bool:
+        """
+        Returns whether the member has at least one of the given roles.
+        """
+
+        return not self.role_ids(member).isdisjoint(role_ids)
+
+    def invalidate(self, member: Member):
+        self._roles.pop((member.guild.id, member.id), None)
+
+    def clear(self, guild: Guild = None):
+        """
+        Forgets the cached roles of every member of the given guild, or of every guild.
+        """
+
+        if guild is None:
+            self._roles.clear()
+        else:
+            self._roles = {key: role_ids for key, role_ids in self._roles.items() if key[0] != guild.id}
+
+    # These are registered before any cog is loaded, so they run before the cogs' own
+    # handlers of the same events check the member's roles again.
+    async def on_ready(self):
+        self.clear()
+
+    async def on_guild_available(self, guild: Guild):
+        self.clear(guild)
+
+    async def on_member_update(self, before: Member, after: Member):
+        # Most updates are presence changes, which don't need the roles to be looked up again
+        if before.roles != after.roles:
+            self.invalidate(after)
+
+    async def on_member_remove(self, member: Member):
+        self.invalidate(member)
+
+    async def on_guild_role_delete(self, role: Role):
+        log.debug("Role %s was deleted, clearing the cached roles of %s", role.id, role.guild)
+        self.clear(role.guild)
+
+    async def on_guild_remove(self, guild: Guild):
+        self.clear(guild)
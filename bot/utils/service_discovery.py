@@ -1,22 +1,82 @@
-import datetime
-import socket
-import time
-from contextlib import closing
+import asyncio
+import logging
+
+from discord.ext.commands import Bot
 
 from bot.constants import RabbitMQ
 
-THIRTY_SECONDS = datetime.timedelta(seconds=30)
+log = logging.getLogger(__name__)
+
+RMQ_EXTENSION = "bot.cogs.rmq"
+
+CONNECT_TIMEOUT = 2
+HEALTH_CHECK_INTERVAL = 30
+
+# aio-pika reconnects by itself, so the RMQ cog is only unloaded once the broker stays unreachable
+# for this many checks in a row, `FAILED_HEALTH_CHECK_INTERVAL` seconds apart
+MAX_FAILED_HEALTH_CHECKS = 3
+FAILED_HEALTH_CHECK_INTERVAL = 10
+
+# How long to wait between attempts while a service is unreachable, doubling every time
+MIN_BACKOFF = 0.5
+MAX_BACKOFF = 60
+
+
+async def is_reachable(host: str, port: int, timeout: float = CONNECT_TIMEOUT) -> bool:
+    """
+    Checks whether a TCP connection can be opened to the given host and port.
+    """
+
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    writer.close()
+    return True
+
+
+async def watch_rmq(bot: Bot):
+    """
+    Loads the RMQ cog as soon as RabbitMQ is reachable, and keeps an eye on it afterwards.
+
+    This is meant to run in the background for as long as the bot is running, starting alongside the
+    gateway login. If the broker stays unreachable for `MAX_FAILED_HEALTH_CHECKS` checks in a row, the cog is
+    unloaded so the commands relying on it can say so, and it's loaded again once the broker is back.
+    Unreachable brokers are retried with exponential backoff.
+    """
+
+    delay = MIN_BACKOFF
+    failures = 0
+
+    while not bot.is_closed():
+        if await is_reachable(RabbitMQ.host, RabbitMQ.port):
+            delay = MIN_BACKOFF
+            failures = 0
+
+            if RMQ_EXTENSION not in bot.extensions:
+                log.info("RabbitMQ found, loading the RMQ cog")
+
+                try:
+                    bot.load_extension(RMQ_EXTENSION)
+                except Exception:
+                    log.exception("Failed to load the RMQ cog")
 
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            continue
 
-def wait_for_rmq():
-    start = datetime.datetime.now()
+        failures += 1
 
-    while True:
-        if datetime.datetime.now() - start > THIRTY_SECONDS:
-            return False
+        if RMQ_EXTENSION in bot.extensions:
+            if failures < MAX_FAILED_HEALTH_CHECKS:
+                log.debug(f"RabbitMQ failed {failures} health check(s) in a row, checking again soon")
+                await asyncio.sleep(FAILED_HEALTH_CHECK_INTERVAL)
+                continue
 
-        with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as sock:
-            if sock.connect_ex((RabbitMQ.host, RabbitMQ.port)) == 0:
-                return True
+            log.warning("Lost the connection to RabbitMQ, unloading the RMQ cog until it's back")
+            bot.unload_extension(RMQ_EXTENSION)
+        else:
+            log.debug(f"RabbitMQ is unreachable, trying again in {delay}s")
 
-        time.sleep(0.5)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_BACKOFF)
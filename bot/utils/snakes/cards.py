@@ -0,0 +1,181 @@
+import logging
+import os
+import textwrap
+import time
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+log = logging.getLogger(__name__)
+
+CARD_RESOURCES = os.path.join("bot", "resources", "snake_cards")
+CARD_BACKS = os.path.join(CARD_RESOURCES, "backs")
+
+# Hardcoded, not much i can do about that
+ICON_WIDTH = 347
+ICON_OFFSET = 36
+TEXT_MARGIN = 36
+TEXT_WIDTH = 36
+
+# The number of (height, back) combinations to keep pre-tiled layers for, per worker process
+LAYER_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=None)
+def back_files() -> List[str]:
+    """
+    Returns the file names of the card backs, in the order used by `render_card`'s `back` argument.
+    """
+
+    return sorted(os.listdir(CARD_BACKS))
+
+
+@lru_cache(maxsize=None)
+def load_assets() -> Dict:
+    """
+    Decodes the card images and font. This is done once per process, on first use.
+    """
+
+    def load(path: str) -> Image.Image:
+        image = Image.open(path)
+        image.load()
+        return image
+
+    return {
+        "top": load(os.path.join(CARD_RESOURCES, "card_top.png")),
+        "frame": load(os.path.join(CARD_RESOURCES, "card_frame.png")),
+        "bottom": load(os.path.join(CARD_RESOURCES, "card_bottom.png")),
+        "backs": [load(os.path.join(CARD_BACKS, file)) for file in back_files()],
+        "font": ImageFont.truetype(os.path.join(CARD_RESOURCES, "expressway.ttf"), 20)
+    }
+
+
+@lru_cache(maxsize=LAYER_CACHE_SIZE)
+def _frame_layer(icon_height: int) -> Image.Image:
+    """
+    Builds the card border for an image box of the given height, with a transparent gap for the snake.
+    """
+
+    card = load_assets()
+    main_height = icon_height + card['top'].height + card['bottom'].height
+    main_width = card['frame'].width
+
+    layer = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+    layer.paste(card['top'], (0, 0))
+
+    # Generate the frame borders to the correct height
+    frame_copies = icon_height // card['frame'].height + 1
+
+    for offset in range(frame_copies):
+        position = (0, card['top'].height + offset * card['frame'].height)
+        layer.paste(card['frame'], position)
+
+    layer.paste(card['bottom'], (0, card['top'].height + icon_height))
+    return layer
+
+
+@lru_cache(maxsize=LAYER_CACHE_SIZE)
+def _background_layer(icon_height: int, back: int) -> Image.Image:
+    """
+    Builds the tiled background for a card with an image box of the given height.
+    """
+
+    card = load_assets()
+    main_height = icon_height + card['top'].height + card['bottom'].height
+    main_width = card['frame'].width
+
+    back_image = card['backs'][back]
+    back_copies = main_height // back_image.height + 1
+    layer = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+
+    for offset in range(back_copies):
+        layer.paste(back_image, (16, 16 + offset * back_image.height))
+
+    return layer
+
+
+@lru_cache(maxsize=LAYER_CACHE_SIZE)
+def _text_box_layer(icon_height: int) -> Image.Image:
+    """
+    Builds the semi-transparent rectangle which goes behind the description.
+    """
+
+    card = load_assets()
+    main_height = icon_height + card['top'].height + card['bottom'].height
+    main_width = card['frame'].width
+    offset = card['top'].height + icon_height + TEXT_MARGIN
+
+    layer = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+    ImageDraw.Draw(layer).rectangle(
+        (TEXT_MARGIN, offset, main_width - TEXT_MARGIN, main_height - TEXT_MARGIN),
+        fill=(63, 63, 63, 128)
+    )
+
+    return layer
+
+
+def render_card(image: bytes, info: str, back: int) -> Tuple[bytes, Dict[str, float]]:
+    """
+    Generate a card from snake information.
+
+    This is run in a worker process, so it only takes and returns picklable values.
+
+    Written by juan and Someone during the first code jam.
+
+    :param image: the encoded picture of the snake
+    :param info: the description of the snake, of which the first two sentences are used
+    :param back: the index of the card back to use, into `back_files()`
+    :return: the PNG encoded card, and the number of seconds spent on each step of rendering it
+    """
+
+    timings = {}
+    start = last = time.perf_counter()
+
+    def lap(step: str):
+        nonlocal last
+        now = time.perf_counter()
+        timings[step] = now - last
+        last = now
+
+    card = load_assets()
+    snake = Image.open(BytesIO(image))
+
+    # Get the size of the snake icon, configure the height of the image box (yes, it changes)
+    icon_height = int((ICON_WIDTH / snake.width) * snake.height)
+    snake.thumbnail((ICON_WIDTH, icon_height))
+    lap("decode")
+
+    # These are only built from scratch the first time a worker sees this combination
+    background = _background_layer(icon_height, back)
+    frame = _frame_layer(icon_height)
+    text_box = _text_box_layer(icon_height)
+    lap("layers")
+
+    # Put the snake into the frame, then place both onto the background
+    foreground = frame.copy()
+    foreground.paste(snake, (ICON_OFFSET, card['top'].height))
+
+    full_image = background.copy()
+    full_image.paste(foreground, (0, 0), foreground)
+    full_image.paste(text_box, (0, 0), mask=text_box)
+    lap("composite")
+
+    # Get the first two sentences of the info
+    description = '.'.join(info.split(".")[:2]) + '.'
+    offset = card['top'].height + icon_height + TEXT_MARGIN
+
+    # Draw the text onto the final image
+    draw = ImageDraw.Draw(full_image)
+    for line in textwrap.wrap(description, TEXT_WIDTH):
+        draw.text([TEXT_MARGIN + 4, offset], line, font=card['font'])
+        offset += card['font'].getsize(line)[1]
+    lap("text")
+
+    buffer = BytesIO()
+    full_image.save(buffer, 'PNG')
+    lap("encode")
+
+    timings["total"] = time.perf_counter() - start
+    return buffer.getvalue(), timings
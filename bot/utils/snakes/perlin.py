@@ -121,6 +121,15 @@ class PerlinNoiseFactory(object):
 
         return dots[0] * self.scale_factor
 
+    def plain_noise_batch(self, points):
+        """Get plain noise for a sequence of points.  In 1 dimension the
+        points may be plain numbers rather than 1-tuples.
+        """
+        if self.dimension == 1:
+            points = [point if isinstance(point, tuple) else (point,) for point in points]
+
+        return [self.get_plain_noise(*point) for point in points]
+
     def __call__(self, *point):
         """Get the value of this Perlin noise function at the given point.  The
         number of values given should match the number of dimensions.
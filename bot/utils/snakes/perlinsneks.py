@@ -2,7 +2,7 @@
 import io
 import math
 import random
-from typing import Tuple
+from typing import List, Tuple
 
 from PIL.ImageDraw import Image, ImageDraw
 
@@ -53,21 +53,47 @@ def create_snek_frame(
     :param text_color: the color of the text.
     :return: a PIL image, representing a single frame.
     """
-    start_x = random.randint(image_margins[X], image_dimensions[X] - image_margins[X])
-    start_y = random.randint(image_margins[Y], image_dimensions[Y] - image_margins[Y])
-    points = [(start_x, start_y)]
-
-    for index in range(0, snake_length):
-        angle = perlin_factory.get_plain_noise(
-            ((1 / (snake_length + 1)) * (index + 1)) + perlin_lookup_vertical_shift
-        ) * ANGLE_RANGE
-        current_point = points[index]
-        segment_length = random.randint(segment_length_range[0], segment_length_range[1])
+    start = (
+        random.randint(image_margins[X], image_dimensions[X] - image_margins[X]),
+        random.randint(image_margins[Y], image_dimensions[Y] - image_margins[Y])
+    )
+    segment_lengths = [random.randint(*segment_length_range) for _ in range(snake_length)]
+
+    lookups = _perlin_lookups(snake_length, perlin_lookup_vertical_shift)
+    angles = [noise * ANGLE_RANGE for noise in perlin_factory.plain_noise_batch(lookups)]
+
+    return _draw_snek(
+        _snek_points(start, angles, segment_lengths), image_dimensions, snake_color, bg_color, snake_width,
+        text, text_position, text_color
+    )
+
+
+def _perlin_lookups(snake_length: int, shift: float) -> List[float]:
+    """
+    Returns the points at which the Perlin noise is sampled for each segment.
+    """
+    return [((1 / (snake_length + 1)) * (index + 1)) + shift for index in range(snake_length)]
+
+
+def _snek_points(start: Tuple[int], angles: List[float], segment_lengths: List[int]) -> List[Tuple[float]]:
+    points = [start]
+
+    for angle, segment_length in zip(angles, segment_lengths):
+        current_point = points[-1]
         points.append((
             current_point[X] + segment_length * math.cos(angle),
             current_point[Y] + segment_length * math.sin(angle)
         ))
 
+    return points
+
+
+def _draw_snek(
+        points: List[Tuple[float]], image_dimensions: Tuple[int], snake_color: int, bg_color: int,
+        snake_width: int, text: str, text_position: Tuple[int], text_color: Tuple[int]
+) -> Image:
+    start_x, start_y = points[0]
+
     # normalize bounds
     min_dimensions = [start_x, start_y]
     max_dimensions = [start_x, start_y]
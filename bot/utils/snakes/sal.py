@@ -4,8 +4,11 @@ import logging
 import math
 import os
 import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Tuple
 
-import aiohttp
 from discord import File, Member, Reaction
 from discord.ext.commands import Context
 from PIL import Image
@@ -34,6 +37,81 @@ GAME_SCREEN_EMOJI = [
     CANCEL_EMOJI
 ]
 
+# Avatars are shared between games, and refreshed after a while in case the image behind the URL changed
+AVATAR_CACHE_SIZE = 128
+AVATAR_CACHE_TTL = 60 * 60
+
+Box = Tuple[int, int, int, int]
+
+
+@lru_cache(maxsize=None)
+def board_image() -> Image.Image:
+    """
+    Returns the decoded, empty game board. It's shared between games, so it must not be modified.
+    """
+
+    image = Image.open(os.path.join("bot", "resources", "snakes_and_ladders", "board.jpg"))
+    image.load()
+    return image
+
+
+def _decode_avatar(avatar_bytes: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(avatar_bytes)).resize((BOARD_PLAYER_SIZE, BOARD_PLAYER_SIZE))
+    image.load()
+    return image
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class AvatarCache:
+    """
+    A least recently used cache of decoded and resized player avatars, keyed by avatar URL.
+
+    Entries expire after `ttl` seconds, so an avatar is eventually downloaded again
+    even if it's played with all the time.
+    """
+
+    def __init__(self, max_size: int = AVATAR_CACHE_SIZE, ttl: float = AVATAR_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._avatars = OrderedDict()
+
+    async def get(self, bot, url: str) -> Image.Image:
+        """
+        Returns the avatar behind the URL, downloading it with the bot's HTTP session if needed.
+
+        :param bot: the bot, whose HTTP session and loop are used
+        :param url: the avatar URL of a user
+        """
+
+        entry = self._avatars.get(url)
+
+        if entry is not None:
+            expires_at, image = entry
+
+            if expires_at > time.monotonic():
+                self._avatars.move_to_end(url)
+                return image
+
+            del self._avatars[url]
+
+        async with bot.http_session.get(url) as res:
+            avatar_bytes = await res.read()
+
+        image = await bot.loop.run_in_executor(None, _decode_avatar, avatar_bytes)
+
+        self._avatars[url] = (time.monotonic() + self.ttl, image)
+
+        while len(self._avatars) > self.max_size:
+            self._avatars.popitem(last=False)
+
+        return image
+
+
+avatar_cache = AvatarCache()
+
 
 class SnakeAndLaddersGame:
     def __init__(self, snakes, context: Context):
@@ -48,6 +126,8 @@ class SnakeAndLaddersGame:
         self.round_has_rolled = {}
         self.avatar_images = {}
         self.board = None
+        self.board_image = None
+        self.drawn_avatars: Dict[int, Box] = {}
         self.positions = None
         self.rolls = []
 
@@ -98,8 +178,8 @@ class SnakeAndLaddersGame:
 
         while not self.started:
             try:
-                reaction, user = await self.ctx.bot.wait_for(
-                    "reaction_add",
+                reaction, user = await self.ctx.bot.reaction_router.wait_for(
+                    startup.id,
                     timeout=300,
                     check=startup_event_check
                 )
@@ -129,11 +209,7 @@ class SnakeAndLaddersGame:
         self.players.append(user)
         self.player_tiles[user.id] = 1
         avatar_url = user.avatar_url_as(format='jpeg', size=PLAYER_ICON_IMAGE_SIZE)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(avatar_url) as res:
-                avatar_bytes = await res.read()
-                im = Image.open(io.BytesIO(avatar_bytes)).resize((BOARD_PLAYER_SIZE, BOARD_PLAYER_SIZE))
-                self.avatar_images[user.id] = im
+        self.avatar_images[user.id] = await avatar_cache.get(self.ctx.bot, str(avatar_url))
 
     async def player_join(self, user: Member):
         for p in self.players:
@@ -221,8 +297,8 @@ class SnakeAndLaddersGame:
         self.state = 'roll'
         for user in self.players:
             self.round_has_rolled[user.id] = False
-        board_img = Image.open(os.path.join("bot", "resources", "snakes_and_ladders", "board.jpg"))
         player_row_size = math.ceil(MAX_PLAYERS / 2)
+        avatars = {}
 
         for i, player in enumerate(self.players):
             tile = self.player_tiles[player.id]
@@ -233,11 +309,11 @@ class SnakeAndLaddersGame:
                     (10 * BOARD_TILE_SIZE) - (9 - tile_coordinates[1]) * BOARD_TILE_SIZE - BOARD_PLAYER_SIZE)
             x_offset += BOARD_PLAYER_SIZE * (i % player_row_size)
             y_offset -= BOARD_PLAYER_SIZE * math.floor(i / player_row_size)
-            board_img.paste(self.avatar_images[player.id],
-                            box=(x_offset, y_offset))
-        stream = io.BytesIO()
-        board_img.save(stream, format='JPEG')
-        board_file = File(stream.getvalue(), filename='Board.jpg')
+            avatars[player.id] = (x_offset, y_offset, x_offset + BOARD_PLAYER_SIZE, y_offset + BOARD_PLAYER_SIZE)
+
+        # Drawing and encoding the board is done in a thread, so it doesn't hold up other games
+        board_bytes = await self.ctx.bot.loop.run_in_executor(None, self._draw_board, avatars)
+        board_file = File(board_bytes, filename='Board.jpg')
         player_list = '\n'.join((user.mention + ": Tile " + str(self.player_tiles[user.id])) for user in self.players)
 
         # Store and send new messages
@@ -269,8 +345,8 @@ class SnakeAndLaddersGame:
 
         while True:
             try:
-                reaction, user = await self.ctx.bot.wait_for(
-                    "reaction_add",
+                reaction, user = await self.ctx.bot.reaction_router.wait_for(
+                    self.positions.id,
                     timeout=300,
                     check=game_event_check
                 )
@@ -343,6 +419,41 @@ class SnakeAndLaddersGame:
         await self.channel.send("**Snakes and Ladders**: " + winner.mention + " has won the game! :tada:")
         self._destruct()
 
+    def _draw_board(self, avatars: Dict[int, Box]) -> bytes:
+        """
+        Updates this game's board image to show the avatars at the given boxes, and encodes it.
+
+        Only the parts of the board where avatars moved are redrawn.
+
+        :param avatars: the box to draw each player's avatar in, in drawing order, by player ID
+        :return: the board as JPEG
+        """
+
+        base = board_image()
+
+        if self.board_image is None:
+            self.board_image = base.copy()
+
+        # Wipe the avatars that moved, or whose player left the game
+        dirty = [
+            box for player_id, box in self.drawn_avatars.items()
+            if avatars.get(player_id) != box
+        ]
+
+        for box in dirty:
+            self.board_image.paste(base.crop(box), box=box[:2])
+
+        # Draw the avatars that moved, and any other avatar that was wiped along with them
+        for player_id, box in avatars.items():
+            if self.drawn_avatars.get(player_id) != box or any(_intersects(box, wiped) for wiped in dirty):
+                self.board_image.paste(self.avatar_images[player_id], box=box[:2])
+
+        self.drawn_avatars = avatars
+
+        stream = io.BytesIO()
+        self.board_image.save(stream, format='JPEG')
+        return stream.getvalue()
+
     def _check_winner(self) -> Member:
         if self.state != 'post_round':
             return None
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+# Snake articles hardly ever change, so a week is plenty fresh
+CACHE_TTL = 7 * 24 * 60 * 60
+
+# Writes are batched, so a burst of lookups only hits the disk once
+SAVE_DELAY = 30
+
+
+class SnakeInfoCache:
+    """
+    An on-disk cache of the snake information scraped from Wikipedia by `Snakes._get_snek`.
+
+    Entries are kept in memory, keyed by the lowercased snake name, and written out to a JSON file
+    in the background, so they survive restarts. Entries older than `ttl` seconds are treated as
+    missing and fetched again.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, path: str, ttl: float = CACHE_TTL):
+        self.loop = loop
+        self.path = path
+        self.ttl = ttl
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._save_handle: Optional[asyncio.Handle] = None
+
+        self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            log.exception(f"Failed to read the snake info cache from {self.path}, starting with an empty one.")
+            return
+
+        now = time.time()
+        self._entries = {
+            name: entry for name, entry in entries.items()
+            if now - entry.get("fetched_at", 0) < self.ttl
+        }
+
+        log.debug(f"Loaded {len(self._entries)} cached snakes from {self.path}.")
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached information for a snake, or `None` if it's missing or has expired.
+
+        :param name: the name the snake was looked up with
+        """
+
+        key = name.lower()
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        if time.time() - entry["fetched_at"] >= self.ttl:
+            del self._entries[key]
+            return None
+
+        return entry["data"]
+
+    def set(self, name: str, data: Dict[str, Any]):
+        """
+        Caches the information for a snake and schedules the cache to be saved.
+
+        :param name: the name the snake was looked up with
+        :param data: the dict built by `Snakes._get_snek`
+        """
+
+        self._entries[name.lower()] = {"fetched_at": time.time(), "data": data}
+
+        if self._save_handle is None:
+            self._save_handle = self.loop.call_later(SAVE_DELAY, self._schedule_save)
+
+    def _schedule_save(self):
+        self._save_handle = None
+        self.loop.create_task(self.save())
+
+    async def save(self):
+        """
+        Writes the cache to disk, replacing the previous file atomically.
+        """
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+
+        # Serialise on the loop, since the entries may change while the file is being written
+        payload = json.dumps(self._entries)
+
+        try:
+            await self.loop.run_in_executor(None, self._write, payload)
+        except OSError:
+            log.exception(f"Failed to write the snake info cache to {self.path}.")
+        else:
+            log.trace(f"Saved {len(self._entries)} cached snakes to {self.path}.")
+
+    def _write(self, payload: str):
+        directory = os.path.dirname(self.path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+
+        os.replace(temp_path, self.path)
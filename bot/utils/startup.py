@@ -0,0 +1,125 @@
+import importlib
+import logging
+import sys
+import time
+from typing import List, NamedTuple
+
+from discord.ext.commands import Bot
+
+log = logging.getLogger(__name__)
+
+
+class ExtensionTiming(NamedTuple):
+    name: str
+    import_time: float
+    setup_time: float
+    deferred: bool
+
+
+class StartupProfiler:
+    """
+    Loads extensions on startup, and records how long each one takes to import and set up.
+
+    Extensions can either be loaded straight away, before the bot logs in, or be deferred until
+    the bot is connected and ready. Deferring the extensions with heavy imports or assets means the
+    rest of the bot starts answering commands sooner. Deferred modules are imported in a thread, so
+    the gateway connection stays responsive while they load.
+
+    Once every deferred extension is loaded, a report of where the startup time went is logged.
+    The profiler is attached to the bot as `bot.startup_profiler`.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.started_at = time.perf_counter()
+        self.ready_after = None
+        self.timings: List[ExtensionTiming] = []
+
+        self._deferred: List[str] = []
+
+    def load_extension(self, name: str):
+        """
+        Imports and sets up an extension straight away.
+
+        :param name: the dotted module name of the extension
+        """
+
+        start = time.perf_counter()
+        importlib.import_module(name)
+        imported = time.perf_counter()
+
+        self.bot.load_extension(name)
+        self._record(name, start, imported, deferred=False)
+
+    def defer_extension(self, name: str):
+        """
+        Marks an extension to be loaded by `load_deferred_extensions` once the bot is ready.
+
+        :param name: the dotted module name of the extension
+        """
+
+        self._deferred.append(name)
+
+    async def load_deferred_extensions(self):
+        """
+        Waits until the bot is ready, then loads the deferred extensions and logs the startup report.
+        """
+
+        await self.bot.wait_until_ready()
+        self.ready_after = time.perf_counter() - self.started_at
+
+        for name in self._deferred:
+            start = time.perf_counter()
+
+            try:
+                # Importing is the slow part, and it doesn't have to happen on the event loop
+                if name not in sys.modules:
+                    await self.bot.loop.run_in_executor(None, importlib.import_module, name)
+
+                imported = time.perf_counter()
+                self.bot.load_extension(name)
+            except Exception:
+                log.exception(f"Failed to load the deferred extension {name}")
+                continue
+
+            self._record(name, start, imported, deferred=True)
+
+        # The commands have changed since the help pages were first built
+        help_cog = self.bot.get_cog("Help")
+
+        if help_cog is not None:
+            help_cog.clear_cache()
+
+        log.info(self.report())
+
+    def _record(self, name: str, start: float, imported: float, *, deferred: bool):
+        timing = ExtensionTiming(name, imported - start, time.perf_counter() - imported, deferred)
+        self.timings.append(timing)
+
+        log.trace(
+            f"Loaded {name} in {(timing.import_time + timing.setup_time) * 1000:.1f}ms "
+            f"(import {timing.import_time * 1000:.1f}ms, setup {timing.setup_time * 1000:.1f}ms)"
+        )
+
+    def report(self) -> str:
+        """
+        Builds a table of the extension load times, slowest first.
+        """
+
+        lines = [
+            f"Startup report: ready after {self.ready_after or 0:.2f}s, "
+            f"{len(self.timings)} extensions loaded.",
+            f"{'extension':<32} {'import':>9} {'setup':>9}  phase",
+        ]
+
+        for timing in sorted(self.timings, key=lambda t: t.import_time + t.setup_time, reverse=True):
+            phase = "deferred" if timing.deferred else "startup"
+            lines.append(
+                f"{timing.name:<32} {timing.import_time * 1000:>7.1f}ms {timing.setup_time * 1000:>7.1f}ms  {phase}"
+            )
+
+        startup = sum(t.import_time + t.setup_time for t in self.timings if not t.deferred)
+        deferred = sum(t.import_time + t.setup_time for t in self.timings if t.deferred)
+        lines.append(f"Extensions took {startup:.2f}s before login and {deferred:.2f}s after the bot was ready.")
+
+        return "\n".join(lines)